@@ -1,24 +1,51 @@
 import json
 import time
+import base64
+import logging
+import threading
 from datetime import datetime
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from typing import List, Optional
+from fastapi.responses import FileResponse, JSONResponse
+from typing import Dict, List, Optional, Set, Tuple
 import os
-import uuid
-from sqlalchemy.orm import Session
-from .pipeline import ProcessingPipeline
+import numpy as np
+from sqlalchemy import func, or_, and_, select, literal
+from sqlalchemy.orm import Session, defer, joinedload, selectinload
+from .pipeline import ProcessingPipeline, OntologyWatcher
 from .matcher import ResumeMatcher
+from .batching import EMBEDDING_BATCH_WAIT_MS, EMBEDDING_MAX_BATCH
+from .chunking import EMBEDDING_POOLING, EMBEDDING_CHUNK_TOKENS
 from .models import (
     Resume, JobDescription, MatchResult, UserCreate, UserLogin, UserResponse,
     Token, ResumeResponse, JDResponse, BatchProcessRequest, BatchProcessResponse,
-    BatchMatchRequest, BatchMatchResponse, ProcessingStats, ExportRequest
+    BatchMatchRequest, BatchMatchResponse, ProcessingStats, ExportRequest,
+    ResumeSearchResult, ResumeSearchResponse, JobResponse, JobStatusResponse, JobItemResult, MatchSummary,
+    SkillSearchHit, SkillSearchResponse
 )
-from .database import get_db, create_tables, User, Resume as DBResume, JobDescription as DBJobDescription, Match as DBMatch, ProcessingStats as DBProcessingStats
+from .database import get_db, create_tables, SessionLocal, User, Resume as DBResume, JobDescription as DBJobDescription, Match as DBMatch, ProcessingStats as DBProcessingStats, BatchJob, BatchJobItem, ResumeSkill
 from .auth import auth_handler, authenticate_user, create_user, get_current_active_user, get_current_admin_user
+from .embeddings import store_embedding, load_embedding, deserialize_embedding
+from .vector_index import VectorIndex, VectorIndexRegistry
+from .skill_index import SkillIndex, SkillIndexRegistry, SKILL_PREFILTER_MIN_COVERAGE
+from .skill_store import (
+    SkillQueryError, parse_skill_query, query_skills, skill_ids, normalize_skill, set_document_skills,
+    posting_sizes, estimate_matches, skill_query_condition, SKILL_POSTING_SAMPLE
+)
+from .uploads import save_upload, hash_file, UploadTooLarge
+from .jobs import JobManager, JobContext, JOB_CHUNK_SIZE
+from .reextract import (
+    record_ontology_version, count_stale_documents, reextract_skills, REEXTRACT_CHUNK_SIZE, REEXTRACT_WORKERS
+)
+from .workers import (
+    WorkerPool, WorkerPoolSaturated, init_pipeline_worker, run_pipeline_method,
+    WORKER_POOL_KIND, WORKER_POOL_SIZE, MODEL_POOL_SIZE, WORKER_QUEUE_SIZE
+)
 from pydantic import BaseModel
 
+# Configure logging
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Resume Screening API", version="2.0.0")
 
 # Enable CORS
@@ -31,16 +58,469 @@ app.add_middleware(
 
 # Initialize components
 pipeline = ProcessingPipeline()
-matcher = ResumeMatcher()
+# The model loads in the background after startup (see MODEL_WARMUP) so the server is live at once
+matcher = ResumeMatcher(
+    lazy=True, batch_size=EMBEDDING_MAX_BATCH, batch_wait_ms=EMBEDDING_BATCH_WAIT_MS,
+    pooling=EMBEDDING_POOLING, chunk_tokens=EMBEDDING_CHUNK_TOKENS
+)
+resume_indexes = VectorIndexRegistry()
+skill_indexes = SkillIndexRegistry()
+
+# Bounded pools for CPU-heavy work: parsing (threads or processes) and model inference (threads).
+# Handlers doing blocking work are plain "def" so FastAPI runs them, and their DB access, in its threadpool.
+parse_pool = WorkerPool(
+    "parse", WORKER_POOL_SIZE, WORKER_QUEUE_SIZE, kind=WORKER_POOL_KIND,
+    initializer=init_pipeline_worker if WORKER_POOL_KIND == "process" else None
+)
+model_pool = WorkerPool("model", MODEL_POOL_SIZE, WORKER_QUEUE_SIZE)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")  # Otherwise load on first use
+ONTOLOGY_WATCH_INTERVAL = float(os.getenv("ONTOLOGY_WATCH_INTERVAL", "0"))  # Seconds, 0 disables the watcher
+DEDUPLICATE_UPLOADS = os.getenv("DEDUPLICATE_UPLOADS", "true").lower() in ("1", "true", "yes")
+job_manager = JobManager()
+
+@app.exception_handler(WorkerPoolSaturated)
+async def worker_pool_saturated_handler(request, exc: WorkerPoolSaturated):
+    """Tell clients to back off when the worker pools are full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    job_manager.start()
+    _record_ontology(pipeline)
+    
+    if MODEL_WARMUP:
+        threading.Thread(target=_warm_up_model, name="model-warmup", daemon=True).start()
+    if ONTOLOGY_WATCH_INTERVAL > 0:
+        OntologyWatcher(pipeline, ONTOLOGY_WATCH_INTERVAL, on_reload=_record_ontology).start()
+
+def _warm_up_model() -> None:
+    """Load the embedding model and run one forward pass, off the event loop"""
+    started = time.perf_counter()
+    try:
+        matcher.load()
+        matcher.model.encode(["warm up"])
+        logger.info(f"Embedding model ready after {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        # /ready keeps reporting the error; the next request that needs the model retries the load
+        logger.error(f"Model warmup failed: {e}")
+
+def _record_ontology(current_pipeline: ProcessingPipeline) -> None:
+    """Snapshot the loaded ontology so a later version can be re-extracted incrementally"""
+    db = SessionLocal()
+    try:
+        record_ontology_version(db, current_pipeline.ontology)
+    except Exception as e:
+        logger.error(f"Could not record ontology version: {e}")
+    finally:
+        db.close()
+
+def _parse(method: str, *args, wait: bool = False, **kwargs):
+    """Run a ProcessingPipeline method in the parse pool (background jobs wait for a free slot)"""
+    call = parse_pool.call_wait if wait else parse_pool.call
+    if parse_pool.kind == "process":
+        return call(run_pipeline_method, method, *args, **kwargs)
+    return call(getattr(pipeline, method), *args, **kwargs)
+
+def _new_resume_record(user_id: int, filename: str, file_path: str, resume_data: Resume) -> DBResume:
+    """Build (but do not add) the database row of a processed resume"""
+    return DBResume(
+        user_id=user_id,
+        filename=filename,
+        file_path=file_path,
+        text=resume_data.raw_text,
+        email=resume_data.email,
+        phone=resume_data.phone,
+        skills=json.dumps(resume_data.skills),
+        skills_by_category=json.dumps(resume_data.skills_by_category),
+        experience=float(resume_data.experience),
+        education=resume_data.education
+    )
+
+def _new_jd_record(user_id: int, filename: str, file_path: str, jd_data: JobDescription) -> DBJobDescription:
+    """Build (but do not add) the database row of a processed job description"""
+    return DBJobDescription(
+        user_id=user_id,
+        filename=filename,
+        file_path=file_path,
+        text=jd_data.raw_text,
+        required_skills=json.dumps(jd_data.required_skills),
+        preferred_skills=json.dumps(jd_data.preferred_skills),
+        skills_by_category=json.dumps(jd_data.skills_by_category),
+        title=jd_data.title,
+        company=jd_data.company
+    )
+
+def _update_stats(db: Session, user_id: int, resumes: int = 0, jds: int = 0, matches: int = 0) -> None:
+    """Add processing counts to a user's stats row (the caller commits)"""
+    stats = db.query(DBProcessingStats).filter(DBProcessingStats.user_id == user_id).first()
+    if not stats:
+        stats = DBProcessingStats(user_id=user_id)
+        db.add(stats)
+    
+    # Handle None values in statistics
+    stats.total_resumes_processed = (stats.total_resumes_processed or 0) + resumes
+    stats.total_jds_processed = (stats.total_jds_processed or 0) + jds
+    stats.total_matches_performed = (stats.total_matches_performed or 0) + matches
+    stats.last_processed_at = datetime.utcnow()
+
+def _embed_record(db_record, text: str) -> None:
+    """Compute and attach a document embedding; failures only defer it to match time"""
+    try:
+        vector = matcher.encode_document(text)
+        if vector is not None:
+            store_embedding(db_record, vector, matcher.embedding_signature)
+    except Exception as e:
+        logger.warning(f"Could not embed document, it will be embedded when matched: {e}")
+
+def _get_embedding(db_record):
+    """Load the stored embedding of a record, computing and storing it if missing or stale"""
+    vector = load_embedding(db_record, matcher.embedding_signature)
+    if vector is None:
+        _embed_record(db_record, db_record.text)
+        vector = load_embedding(db_record, matcher.embedding_signature)
+    return vector
+
+def _to_resume_model(db_resume: DBResume, include_raw_text: bool = True) -> Resume:
+    """Convert a database resume into its Pydantic model (the text is only loaded if included)"""
+    return Resume(
+        raw_text=db_resume.text if include_raw_text else None,
+        email=db_resume.email,
+        phone=db_resume.phone,
+        skills=json.loads(db_resume.skills),
+        skills_by_category=json.loads(db_resume.skills_by_category),
+        experience=float(db_resume.experience) if db_resume.experience is not None else 0.0,
+        education=db_resume.education
+    )
+
+def _to_jd_model(db_jd: DBJobDescription, include_raw_text: bool = True) -> JobDescription:
+    """Convert a database job description into its Pydantic model (the text is only loaded if included)"""
+    return JobDescription(
+        raw_text=db_jd.text if include_raw_text else None,
+        required_skills=json.loads(db_jd.required_skills),
+        preferred_skills=json.loads(db_jd.preferred_skills),
+        skills_by_category=json.loads(db_jd.skills_by_category),
+        title=db_jd.title,
+        company=db_jd.company
+    )
+
+def _without_raw_text(document):
+    """Copy of a Resume or JobDescription model without its text"""
+    return document.model_copy(update={"raw_text": None}) if document.raw_text is not None else document
+
+def _match_response(result: MatchResult, include_raw_text: bool) -> MatchResult:
+    """A match result as returned by the API: document texts only when asked for"""
+    if include_raw_text:
+        return result
+    return result.model_copy(update={
+        "resume": _without_raw_text(result.resume),
+        "job_description": _without_raw_text(result.job_description)
+    })
+
+# Columns a deduplicated row copies from its canonical row (the text is shared with it instead)
+_SHARED_COLUMNS = {
+    DBResume: ("email", "phone", "skills", "skills_by_category", "experience", "education"),
+    DBJobDescription: ("required_skills", "preferred_skills", "skills_by_category", "title", "company"),
+}
+
+def _find_canonical(db: Session, model, user_id: int, content_hash: str):
+    """
+    Find the user's first processed document with the same content and ontology version
+    
+    Only the uploading user's own rows are considered: a duplicate shares its
+    canonical row's file and text, which must not cross accounts.
+    """
+    return db.query(model).filter(
+        model.user_id == user_id,
+        model.content_hash == content_hash,
+        model.ontology_version == pipeline.ontology_version,
+        model.duplicate_of_id.is_(None)
+    ).order_by(model.id).first()
+
+def _duplicate_record(canonical, user_id: int, filename: str, file_path: str):
+    """Build a lightweight ownership row that reuses a canonical row's processing results"""
+    model = type(canonical)
+    record = model(
+        user_id=user_id,
+        filename=filename,
+        file_path=file_path,
+        duplicate_of_id=canonical.id,
+        content_hash=canonical.content_hash,
+        ontology_version=canonical.ontology_version,
+        **{column: getattr(canonical, column) for column in _SHARED_COLUMNS[model]}
+    )
+    record.canonical = canonical
+    record.document_text = canonical.document_text
+    if canonical.embedding_model == matcher.embedding_signature:
+        record.embedding = canonical.embedding
+        record.embedding_model = canonical.embedding_model
+        record.embedding_dim = canonical.embedding_dim
+    return record
+
+def _ingest_document(db: Session, user_id: int, kind: str, file_path: str, filename: str,
+                     content_hash: Optional[str] = None, wait: bool = False):
+    """
+    Build the database row for a resume or job description file
+    
+    Files whose content the same user already had processed with the current
+    ontology reuse that result (parsed text, skills and embedding) instead of
+    being parsed again.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the new row
+        kind: "resume" or "jd"
+        file_path: Path of the file on disk
+        filename: Original filename
+        content_hash: SHA-256 of the file, computed if not given
+        wait: Wait for free worker slots instead of failing fast (background jobs)
+        
+    Returns:
+        Tuple of (unsaved row, Resume or JobDescription data)
+    """
+    model = DBResume if kind == "resume" else DBJobDescription
+    to_model = _to_resume_model if kind == "resume" else _to_jd_model
+    call_model = model_pool.call_wait if wait else model_pool.call
+    if content_hash is None:
+        content_hash = hash_file(file_path)
+    
+    canonical = _find_canonical(db, model, user_id, content_hash) if DEDUPLICATE_UPLOADS else None
+    if canonical is not None:
+        if canonical.embedding_model != matcher.embedding_signature:
+            call_model(_get_embedding, canonical)
+        record = _duplicate_record(canonical, user_id, filename, file_path)
+        set_document_skills(db, record)
+        logger.info(f"Reusing processed {kind} {canonical.id} for {filename}")
+        return record, to_model(record)
+    
+    if kind == "resume":
+        data = _parse("process_resume", file_path, wait=wait, content_hash=content_hash)
+        record = _new_resume_record(user_id, filename, file_path, data)
+    else:
+        data = _parse("process_job_description", file_path, wait=wait, content_hash=content_hash)
+        record = _new_jd_record(user_id, filename, file_path, data)
+    record.content_hash = content_hash
+    record.ontology_version = data.ontology_version or pipeline.ontology_version
+    call_model(_embed_record, record, data.raw_text)
+    set_document_skills(db, record)
+    return record, data
+
+def _ensure_embeddings(db_records: list) -> List[Optional[np.ndarray]]:
+    """Load the stored embeddings of records, embedding all missing ones in a single batch"""
+    vectors = [load_embedding(record, matcher.embedding_signature) for record in db_records]
+    missing = [
+        i for i, vector in enumerate(vectors)
+        if vector is None and db_records[i].text and db_records[i].text.strip()
+    ]
+    if missing:
+        encoded = matcher.encode_texts([db_records[i].text for i in missing])
+        for i, vector in zip(missing, encoded):
+            store_embedding(db_records[i], vector, matcher.embedding_signature)
+            vectors[i] = vector
+    return vectors
+
+def _match_records(db_resume: DBResume, db_jd: DBJobDescription, include_raw_text: bool = False) -> MatchResult:
+    """Match a database resume to a database job description using their stored embeddings"""
+    resume_embedding = _get_embedding(db_resume)
+    jd_embedding = _get_embedding(db_jd)
+    # The texts are only needed to compare documents without embeddings
+    include_raw_text = include_raw_text or resume_embedding is None or jd_embedding is None
+    return matcher.match_resume_to_jd(
+        _to_resume_model(db_resume, include_raw_text), _to_jd_model(db_jd, include_raw_text),
+        resume_embedding=resume_embedding,
+        jd_embedding=jd_embedding
+    )
+
+def _cross_match_records(user_id: int, db_resumes: List[DBResume], db_jds: List[DBJobDescription],
+                         include_raw_text: bool = False, pairs: Optional[Set[Tuple[int, int]]] = None):
+    """
+    Cross-match database resumes and job descriptions
+    
+    Every row is decoded and embedded once and all pairs are scored by
+    ``ResumeMatcher.cross_match``. Document texts are only loaded for rows
+    without an embedding or when ``include_raw_text`` is set. With ``pairs``
+    (a set of (resume id, JD id)), only those pairs are scored.
+    
+    Returns:
+        Tuple of (match results, unsaved Match rows, failure messages)
+    """
+    resume_embeddings = _ensure_embeddings(db_resumes)
+    jd_embeddings = _ensure_embeddings(db_jds)
+    mask = None
+    if pairs is not None:
+        mask = np.array([[(db_resume.id, db_jd.id) in pairs for db_jd in db_jds] for db_resume in db_resumes],
+                        dtype=bool).reshape(len(db_resumes), len(db_jds))
+    results = matcher.cross_match(
+        [_to_resume_model(db_resume, include_raw_text or vector is None)
+         for db_resume, vector in zip(db_resumes, resume_embeddings)],
+        [_to_jd_model(db_jd, include_raw_text or vector is None)
+         for db_jd, vector in zip(db_jds, jd_embeddings)],
+        resume_embeddings=resume_embeddings,
+        jd_embeddings=jd_embeddings,
+        pairs=mask
+    )
+    
+    matches, db_matches, failures = [], [], []
+    for db_resume, row in zip(db_resumes, results):
+        for db_jd, match_result in zip(db_jds, row):
+            if pairs is not None and (db_resume.id, db_jd.id) not in pairs:
+                continue
+            if match_result is None:
+                failures.append(f"Match: Resume {db_resume.id} to JD {db_jd.id} - could not be scored")
+                continue
+            matches.append(match_result)
+            db_matches.append(DBMatch(
+                user_id=user_id,
+                resume_id=db_resume.id,
+                job_description_id=db_jd.id,
+                similarity_score=match_result.similarity_score,
+                skill_coverage=match_result.skill_coverage,
+                skill_density=match_result.skill_density,
+                matching_skills=json.dumps(match_result.matching_skills),
+                missing_skills=json.dumps(match_result.missing_skills),
+                explanation=match_result.explanation
+            ))
+    return matches, db_matches, failures
+
+def _build_resume_index(db: Session, user_id: int) -> VectorIndex:
+    """Build a vector index over a user's stored resume embeddings"""
+    rows = db.query(DBResume.id, DBResume.embedding, DBResume.embedding_dim).filter(
+        DBResume.user_id == user_id,
+        DBResume.embedding.isnot(None),
+        DBResume.embedding_model == matcher.embedding_signature
+    ).order_by(DBResume.id).all()
+    
+    dimension = matcher.dimension
+    vectors = np.zeros((len(rows), dimension), dtype=np.float32)
+    for i, row in enumerate(rows):
+        vectors[i] = deserialize_embedding(row.embedding, row.embedding_dim)
+    return VectorIndex([row.id for row in rows], vectors)
+
+def _load_resume_vectors(db: Session, resume_ids: List[int]) -> np.ndarray:
+    """Full-precision stored embeddings of resumes, one row per id, for re-ranking index candidates"""
+    rows = {
+        row.id: row for row in db.query(DBResume.id, DBResume.embedding, DBResume.embedding_dim).filter(
+            DBResume.id.in_(resume_ids)
+        )
+    }
+    vectors = np.zeros((len(resume_ids), matcher.dimension), dtype=np.float32)
+    for i, resume_id in enumerate(resume_ids):
+        row = rows.get(resume_id)
+        if row is not None and row.embedding is not None:
+            vectors[i] = deserialize_embedding(row.embedding, row.embedding_dim)
+    return vectors
+
+def _resume_signature(db: Session, user_id: int) -> tuple:
+    """(count, max id, last update) of a user's resumes; changes whenever their resumes do"""
+    return tuple(db.query(
+        func.count(DBResume.id), func.max(DBResume.id), func.max(DBResume.updated_at)
+    ).filter(DBResume.user_id == user_id).one())
+
+def _get_resume_index(db: Session, user_id: int) -> Tuple[VectorIndex, int]:
+    """
+    Get the user's resume index, rebuilding it when their resumes changed
+    
+    Only resumes that already have an embedding for the current model are
+    indexed; embedding the others here would stall the search on the whole
+    corpus after a model change, so they are left to backfill_embeddings.py.
+    
+    Returns:
+        Tuple of (index, number of resumes left out for lack of an embedding)
+    """
+    signature = _resume_signature(db, user_id)
+    index = resume_indexes.get(
+        (user_id, matcher.embedding_signature), signature,
+        lambda: _build_resume_index(db, user_id)
+    )
+    unindexed = signature[0] - len(index)
+    if unindexed:
+        logger.warning(f"{unindexed} resumes of user {user_id} have no current embedding and are not searchable; "
+                       f"run python backfill_embeddings.py")
+    return index, unindexed
+
+def _build_skill_index(db: Session, user_id: int, signature: tuple, previous: Optional[SkillIndex],
+                       previous_signature: Optional[tuple]) -> SkillIndex:
+    """
+    Build the user's inverted skill index from the resume skill links
+    
+    Only resumes up to the max id of ``signature`` are read, so resumes
+    uploaded after the signature was taken are left to the next refresh.
+    When the resumes covered by the previous index are unchanged (same count
+    and last update), only the links of newer resumes are read and appended.
+    """
+    max_id = signature[1] or 0
+    # Core rows rather than ORM tuples: a full build reads every link of the user
+    links = select(ResumeSkill.resume_id, ResumeSkill.skill_id).join(
+        DBResume, DBResume.id == ResumeSkill.resume_id
+    ).where(DBResume.user_id == user_id, DBResume.id <= max_id)
+    
+    if previous is not None:
+        previous_count, previous_max_id, previous_update = previous_signature
+        unchanged = db.query(func.count(DBResume.id), func.max(DBResume.updated_at)).filter(
+            DBResume.user_id == user_id,
+            DBResume.id <= (previous_max_id or 0)
+        ).one()
+        if tuple(unchanged) == (previous_count, previous_update):
+            return previous.extend(db.execute(links.where(DBResume.id > (previous_max_id or 0))).all())
+    
+    index = SkillIndex.from_pairs(db.execute(links).all())
+    logger.info(f"Built skill index over {len(index)} resumes ({index.nbytes / 1e6:.1f} MB)")
+    return index
+
+def _get_skill_index(db: Session, user_id: int) -> SkillIndex:
+    """Get the user's inverted skill index, refreshing it when their resumes changed"""
+    signature = _resume_signature(db, user_id)
+    return skill_indexes.get(
+        user_id, signature,
+        lambda previous, previous_signature: _build_skill_index(db, user_id, signature, previous, previous_signature)
+    )
+
+def _min_skill_coverage(value: Optional[float]) -> float:
+    """Requested skill coverage prefilter threshold, or the configured default"""
+    return SKILL_PREFILTER_MIN_COVERAGE if value is None else value
+
+def _skill_shortlists(db: Session, user_id: int, db_jds: List[DBJobDescription], min_coverage: float,
+                      resume_ids: Optional[List[int]] = None) -> Dict[int, Optional[Dict[int, float]]]:
+    """
+    Shortlist the resumes covering at least ``min_coverage`` of each job description's skills
+    
+    Coverage is counted on the inverted skill index over normalized skill
+    names, before any embedding is loaded or similarity computed. Job
+    descriptions without skills get no shortlist (None): every resume stays
+    a candidate rather than none.
+    
+    Args:
+        db: Database session
+        user_id: Owner of the resumes
+        db_jds: Job descriptions to shortlist for
+        min_coverage: Minimum share of the required and preferred skills
+        resume_ids: Only shortlist among these resumes
+        
+    Returns:
+        JD id to {resume id: skill coverage}, or None when the JD has no skills
+    """
+    index = _get_skill_index(db, user_id)
+    shortlists = {}
+    for db_jd in db_jds:
+        names = {
+            normalize_skill(name)
+            for name in json.loads(db_jd.required_skills or "[]") + json.loads(db_jd.preferred_skills or "[]")
+        } - {""}
+        if not names:
+            shortlists[db_jd.id] = None
+            continue
+        ids = skill_ids(db, names)
+        shortlists[db_jd.id] = index.shortlist(ids.values(), len(names), min_coverage, resume_ids)
+    return shortlists
 
 # Authentication endpoints
 @app.post("/auth/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     try:
         user = create_user(
@@ -61,7 +541,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/auth/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """Login and get access token"""
     user = authenticate_user(db, user_data.email, user_data.password)
     if not user:
@@ -86,44 +566,35 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
         created_at=current_user.created_at
     )
 
+def _drop_duplicate_upload(db_record, upload_path: str) -> None:
+    """Delete an uploaded file whose content is already stored and point the row at the stored copy"""
+    if db_record.duplicate_of_id is None or db_record.canonical is None:
+        return
+    if os.path.exists(db_record.canonical.file_path):
+        os.remove(upload_path)
+        db_record.file_path = db_record.canonical.file_path
+
 # Resume endpoints
 @app.post("/upload/resume/", response_model=ResumeResponse)
-async def upload_resume(
+def upload_resume(
     file: UploadFile = File(...),
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and process a resume"""
+    """Upload and process a resume (the extracted text is returned with ``include_raw_text=true``)"""
     try:
-        # Create unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"data/uploads/{unique_filename}"
-        
-        # Ensure upload directory exists
-        os.makedirs("data/uploads", exist_ok=True)
-        
-        # Save file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Process resume
-        resume_data = pipeline.process_resume(file_path)
+        # Stream the file to disk, hashing it on the way
+        try:
+            stored = save_upload(file.file, file.filename)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
-        # Save to database
-        db_resume = DBResume(
-            user_id=current_user.id,
-            filename=file.filename,
-            file_path=file_path,
-            raw_text=resume_data.raw_text,
-            email=resume_data.email,
-            phone=resume_data.phone,
-            skills=json.dumps(resume_data.skills),
-            skills_by_category=json.dumps(resume_data.skills_by_category),
-            experience=float(resume_data.experience),
-            education=resume_data.education
+        # Process resume (or reuse an identical, already processed one)
+        db_resume, resume_data = _ingest_document(
+            db, current_user.id, "resume", stored.path, file.filename, stored.content_hash
         )
+        _drop_duplicate_upload(db_resume, stored.path)
         
         db.add(db_resume)
         try:
@@ -146,47 +617,35 @@ async def upload_resume(
         stats.last_processed_at = datetime.utcnow()
         db.commit()
         
-        return ResumeResponse(id=str(db_resume.id), data=resume_data)
+        if not include_raw_text:
+            resume_data = _without_raw_text(resume_data)
+        return ResumeResponse(id=str(db_resume.id), data=resume_data, content_hash=stored.content_hash)
         
+    except (HTTPException, WorkerPoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
 @app.post("/upload/jd/", response_model=JDResponse)
-async def upload_job_description(
+def upload_job_description(
     file: UploadFile = File(...),
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and process a job description"""
+    """Upload and process a job description (the extracted text is returned with ``include_raw_text=true``)"""
     try:
-        # Create unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"data/uploads/{unique_filename}"
-        
-        # Ensure upload directory exists
-        os.makedirs("data/uploads", exist_ok=True)
-        
-        # Save file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Process JD
-        jd_data = pipeline.process_job_description(file_path)
+        # Stream the file to disk, hashing it on the way
+        try:
+            stored = save_upload(file.file, file.filename)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
-        # Save to database
-        db_jd = DBJobDescription(
-            user_id=current_user.id,
-            filename=file.filename,
-            file_path=file_path,
-            raw_text=jd_data.raw_text,
-            required_skills=json.dumps(jd_data.required_skills),
-            preferred_skills=json.dumps(jd_data.preferred_skills),
-            skills_by_category=json.dumps(jd_data.skills_by_category),
-            title=jd_data.title,
-            company=jd_data.company
+        # Process JD (or reuse an identical, already processed one)
+        db_jd, jd_data = _ingest_document(
+            db, current_user.id, "jd", stored.path, file.filename, stored.content_hash
         )
+        _drop_duplicate_upload(db_jd, stored.path)
         
         db.add(db_jd)
         db.commit()
@@ -205,19 +664,24 @@ async def upload_job_description(
         stats.last_processed_at = datetime.utcnow()
         db.commit()
         
-        return JDResponse(id=str(db_jd.id), data=jd_data)
+        if not include_raw_text:
+            jd_data = _without_raw_text(jd_data)
+        return JDResponse(id=str(db_jd.id), data=jd_data, content_hash=stored.content_hash)
         
+    except (HTTPException, WorkerPoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing job description: {str(e)}")
 
 @app.post("/match/", response_model=MatchResult)
-async def match_resume_to_jd(
+def match_resume_to_jd(
     resume_id: str,
     jd_id: str,
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Match a specific resume to a job description"""
+    """Match a specific resume to a job description (document texts are included with ``include_raw_text=true``)"""
     try:
         # Get resume and JD from database
         db_resume = db.query(DBResume).filter(
@@ -235,28 +699,8 @@ async def match_resume_to_jd(
         if not db_jd:  # ← This line and the next were not indented properly
             raise HTTPException(status_code=404, detail="Job description not found")
         
-        # Convert database objects to Pydantic models
-        resume = Resume(
-            raw_text=db_resume.raw_text,
-            email=db_resume.email,
-            phone=db_resume.phone,
-            skills=json.loads(db_resume.skills),
-            skills_by_category=json.loads(db_resume.skills_by_category),
-            experience=float(db_resume.experience) if db_resume.experience is not None else 0.0,
-            education=db_resume.education
-        )
-        
-        jd = JobDescription(
-            raw_text=db_jd.raw_text,
-            required_skills=json.loads(db_jd.required_skills),
-            preferred_skills=json.loads(db_jd.preferred_skills),
-            skills_by_category=json.loads(db_jd.skills_by_category),
-            title=db_jd.title,
-            company=db_jd.company
-        )
-        
-        # Perform matching
-        result = matcher.match_resume_to_jd(resume, jd)  # ← This line was also not indented properly
+        # Perform matching with stored embeddings (computed once if missing)
+        result = model_pool.call(_match_records, db_resume, db_jd, include_raw_text)
         
         # Save match result to database
         db_match = DBMatch(
@@ -287,58 +731,228 @@ async def match_resume_to_jd(
         stats.average_skill_coverage = (current_avg_cov + result.skill_coverage) / 2
         db.commit()
         
-        return result
+        return _match_response(result, include_raw_text)
         
+    except (HTTPException, WorkerPoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error matching: {str(e)}")
 
-@app.get("/resumes/", response_model=List[Resume])
-async def list_resumes(
+# Sort keys of the list endpoints: column and the value sorted in place of NULL (None: never NULL)
+_RESUME_SORTS = {
+    "created_at": (DBResume.created_at, None),
+    "experience": (DBResume.experience, None),
+    "filename": (DBResume.filename, None),
+}
+_JD_SORTS = {
+    "created_at": (DBJobDescription.created_at, None),
+    "title": (DBJobDescription.title, ""),
+    "filename": (DBJobDescription.filename, None),
+}
+_MATCH_SORTS = {
+    "created_at": (DBMatch.created_at, None),
+    "similarity_score": (DBMatch.similarity_score, None),
+    "skill_coverage": (DBMatch.skill_coverage, None),
+    "skill_density": (DBMatch.skill_density, None),
+}
+
+def _encode_cursor(value, row_id: int) -> str:
+    """Opaque cursor pointing after a row: its sort value and ID"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, row_id]).encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, column) -> tuple:
+    """Inverse of ``_encode_cursor``"""
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _keyset_page(query, sorts: dict, sort: str, order: str, id_column, cursor: Optional[str],
+                 limit: int, response: Response) -> list:
+    """
+    Sort a query, continue it after a cursor and return one page
+    
+    Rows are ordered by the sort key with the ID as tie-breaker, so a page
+    starts with an index range scan instead of skipping an offset. When more
+    rows follow, the cursor of the next page is set in ``X-Next-Cursor``.
+    
+    Args:
+        query: Filtered query whose rows expose the sort column and ``id``
+        sorts: Allowed sort keys (see ``_RESUME_SORTS``)
+        sort: Requested sort key
+        order: "asc" or "desc"
+        id_column: Primary key column of the listed table
+        cursor: Cursor of the previous page, if any
+        limit: Page size
+        response: Response receiving the next cursor header
+        
+    Returns:
+        Rows of the page
+    """
+    if sort not in sorts:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(sorts)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    
+    column, null_value = sorts[sort]
+    # The substitute is rendered inline so the key matches its expression index
+    key = func.coalesce(column, literal(null_value, literal_execute=True)) if null_value is not None else column
+    descending = order == "desc"
+    if cursor:
+        value, last_id = _decode_cursor(cursor, column)
+        if descending:
+            query = query.filter(or_(key < value, and_(key == value, id_column < last_id)))
+        else:
+            query = query.filter(or_(key > value, and_(key == value, id_column > last_id)))
+    query = query.order_by(*((key.desc(), id_column.desc()) if descending else (key.asc(), id_column.asc())))
+    
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    if len(rows) > limit:
+        value = getattr(page[-1], column.key)
+        response.headers["X-Next-Cursor"] = _encode_cursor(null_value if value is None else value, page[-1].id)
+    return page
+
+def _skill_conditions(db: Session, model, tree: tuple, required_only: bool = False):
+    """
+    Compile a parsed skill query for a page query and for counting
+    
+    Common skill combinations fill a page fastest by walking the sort index
+    and probing each document; rarer ones by reading their posting lists.
+    With ``required_only``, preferred job description skills do not match.
+    
+    Returns:
+        Tuple of (page condition, count condition, skill IDs)
+    """
+    ids = skill_ids(db, query_skills(tree))
+    sizes = posting_sizes(db, model, ids.values())
+    scan = estimate_matches(tree, ids, sizes) >= SKILL_POSTING_SAMPLE
+    count_condition = skill_query_condition(model, tree, ids, sizes, required_only=required_only)
+    page_condition = skill_query_condition(
+        model, tree, ids, sizes, probe=True, required_only=required_only
+    ) if scan else count_condition
+    return page_condition, count_condition, ids
+
+def _has_skill(column, skill: str):
+    """Condition matching rows whose JSON skill list contains a skill (case-insensitive; used for matches)"""
+    quoted = json.dumps(skill.strip().lower())
+    pattern = quoted.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return func.lower(column).like(f"%{pattern}%", escape="\\")
+
+def _to_resume_response(db_resume: DBResume, include_raw_text: bool = False) -> ResumeResponse:
+    """Convert a database resume into its API response"""
+    return ResumeResponse(
+        id=str(db_resume.id),
+        data=_to_resume_model(db_resume, include_raw_text),
+        content_hash=db_resume.content_hash,
+        filename=db_resume.filename,
+        created_at=db_resume.created_at
+    )
+
+def _to_jd_response(db_jd: DBJobDescription, include_raw_text: bool = False) -> JDResponse:
+    """Convert a database job description into its API response"""
+    return JDResponse(
+        id=str(db_jd.id),
+        data=_to_jd_model(db_jd, include_raw_text),
+        content_hash=db_jd.content_hash,
+        filename=db_jd.filename,
+        created_at=db_jd.created_at
+    )
+
+@app.get("/resumes/", response_model=List[ResumeResponse])
+def list_resumes(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    has_skill: Optional[List[str]] = Query(None),
+    min_experience: Optional[float] = None,
+    max_experience: Optional[float] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """List all resumes for the current user"""
-    db_resumes = db.query(DBResume).filter(DBResume.user_id == current_user.id).all()
-    
-    resumes = []
-    for db_resume in db_resumes:
-        resume = Resume(
-            raw_text=db_resume.raw_text,
-            email=db_resume.email,
-            phone=db_resume.phone,
-            skills=json.loads(db_resume.skills),
-            skills_by_category=json.loads(db_resume.skills_by_category),
-            experience=float(db_resume.experience) if db_resume.experience is not None else 0.0,
-            education=db_resume.education
+    """
+    List the current user's resumes, one page at a time
+    
+    Filters and sorting run in SQL. Pass the ``X-Next-Cursor`` response header
+    as ``cursor`` to get the next page; it is absent on the last page.
+    ``has_skill`` may be repeated (all skills are required). Document texts
+    are only read and returned with ``include_raw_text=true``.
+    """
+    query = db.query(DBResume).options(defer(DBResume.embedding)).filter(DBResume.user_id == current_user.id)
+    if include_raw_text:
+        query = query.options(
+            selectinload(DBResume.document_text),
+            joinedload(DBResume.canonical).defer(DBResume.embedding)
         )
-        resumes.append(resume)
     
-    return resumes
+    if has_skill:
+        tree = ("and", [("skill", normalize_skill(skill)) for skill in has_skill])
+        query = query.filter(_skill_conditions(db, DBResume, tree)[0])
+    if min_experience is not None:
+        query = query.filter(DBResume.experience >= min_experience)
+    if max_experience is not None:
+        query = query.filter(DBResume.experience <= max_experience)
+    if created_after is not None:
+        query = query.filter(DBResume.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(DBResume.created_at < created_before)
+    
+    page = _keyset_page(query, _RESUME_SORTS, sort, order, DBResume.id, cursor, limit, response)
+    return [_to_resume_response(db_resume, include_raw_text) for db_resume in page]
 
-@app.get("/jds/", response_model=List[JobDescription])
-async def list_job_descriptions(
+@app.get("/jds/", response_model=List[JDResponse])
+def list_job_descriptions(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    has_skill: Optional[List[str]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """List all job descriptions for the current user"""
-    db_jds = db.query(DBJobDescription).filter(DBJobDescription.user_id == current_user.id).all()
+    """
+    List the current user's job descriptions, one page at a time
     
-    jds = []
-    for db_jd in db_jds:
-        jd = JobDescription(
-            raw_text=db_jd.raw_text,
-            required_skills=json.loads(db_jd.required_skills),
-            preferred_skills=json.loads(db_jd.preferred_skills),
-            skills_by_category=json.loads(db_jd.skills_by_category),
-            title=db_jd.title,
-            company=db_jd.company
+    Works like ``/resumes/``; ``has_skill`` filters on the required skills (preferred ones do not match).
+    """
+    query = db.query(DBJobDescription).options(
+        defer(DBJobDescription.embedding)
+    ).filter(DBJobDescription.user_id == current_user.id)
+    if include_raw_text:
+        query = query.options(
+            selectinload(DBJobDescription.document_text),
+            joinedload(DBJobDescription.canonical).defer(DBJobDescription.embedding)
         )
-        jds.append(jd)
     
-    return jds
+    if has_skill:
+        tree = ("and", [("skill", normalize_skill(skill)) for skill in has_skill])
+        query = query.filter(_skill_conditions(db, DBJobDescription, tree, required_only=True)[0])
+    if created_after is not None:
+        query = query.filter(DBJobDescription.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(DBJobDescription.created_at < created_before)
+    
+    page = _keyset_page(query, _JD_SORTS, sort, order, DBJobDescription.id, cursor, limit, response)
+    return [_to_jd_response(db_jd, include_raw_text) for db_jd in page]
 
 @app.get("/stats/", response_model=ProcessingStats)
-async def get_processing_stats(
+def get_processing_stats(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -351,7 +965,8 @@ async def get_processing_stats(
             total_jds_processed=0,
             total_matches_performed=0,
             average_similarity_score=0.0,
-            average_skill_coverage=0.0
+            average_skill_coverage=0.0,
+            ontology_version=pipeline.ontology_version
         )
     
     return ProcessingStats(
@@ -360,13 +975,13 @@ async def get_processing_stats(
         total_matches_performed=stats.total_matches_performed,
         average_similarity_score=stats.average_similarity_score,
         average_skill_coverage=stats.average_skill_coverage,
-        last_processed_at=stats.last_processed_at
+        last_processed_at=stats.last_processed_at,
+        ontology_version=pipeline.ontology_version
     )
 
 @app.post("/batch/process", response_model=BatchProcessResponse)
-async def batch_process(
+def batch_process(
     request: BatchProcessRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -380,49 +995,30 @@ async def batch_process(
         # Process resumes
         for resume_file in request.resume_files:
             try:
-                resume_data = pipeline.process_resume(resume_file)
-                
-                # Save to database
-                db_resume = DBResume(
-                    user_id=current_user.id,
-                    filename=os.path.basename(resume_file),
-                    file_path=resume_file,
-                    raw_text=resume_data.raw_text,
-                    email=resume_data.email,
-                    phone=resume_data.phone,
-                    skills=json.dumps(resume_data.skills),
-                    skills_by_category=json.dumps(resume_data.skills_by_category),
-                    experience=float(resume_data.experience),
-                    education=resume_data.education
+                db_resume, _ = _ingest_document(
+                    db, current_user.id, "resume", resume_file, os.path.basename(resume_file)
                 )
                 
                 db.add(db_resume)
                 processed_resumes += 1
                 
+            except WorkerPoolSaturated:
+                raise
             except Exception as e:
                 failed_files.append(f"Resume: {resume_file} - {str(e)}")
         
         # Process job descriptions
         for jd_file in request.jd_files:
             try:
-                jd_data = pipeline.process_job_description(jd_file)
-                
-                # Save to database
-                db_jd = DBJobDescription(
-                    user_id=current_user.id,
-                    filename=os.path.basename(jd_file),
-                    file_path=jd_file,
-                    raw_text=jd_data.raw_text,
-                    required_skills=json.dumps(jd_data.required_skills),
-                    preferred_skills=json.dumps(jd_data.preferred_skills),
-                    skills_by_category=json.dumps(jd_data.skills_by_category),
-                    title=jd_data.title,
-                    company=jd_data.company
+                db_jd, _ = _ingest_document(
+                    db, current_user.id, "jd", jd_file, os.path.basename(jd_file)
                 )
                 
                 db.add(db_jd)
                 processed_jds += 1
                 
+            except WorkerPoolSaturated:
+                raise
             except Exception as e:
                 failed_files.append(f"JD: {jd_file} - {str(e)}")
         
@@ -441,76 +1037,22 @@ async def batch_process(
                     DBJobDescription.user_id == current_user.id
                 ).order_by(DBJobDescription.id.desc()).limit(processed_jds).all()
                 
-                # Perform matching for each resume against each JD
-                for resume in new_resumes:
-                    for jd in new_jds:
-                        try:
-                            # Convert database objects to Pydantic models
-                            resume_data = Resume(
-                                raw_text=resume.raw_text,
-                                email=resume.email,
-                                phone=resume.phone,
-                                skills=json.loads(resume.skills),
-                                skills_by_category=json.loads(resume.skills_by_category),
-                                experience=float(resume.experience) if resume.experience is not None else 0.0,
-                                education=resume.education
-                            )
-                            
-                            jd_data = JobDescription(
-                                raw_text=jd.raw_text,
-                                required_skills=json.loads(jd.required_skills),
-                                preferred_skills=json.loads(jd.preferred_skills),
-                                skills_by_category=json.loads(jd.skills_by_category),
-                                title=jd.title,
-                                company=jd.company
-                            )
-                            
-                            # Perform matching
-                            match_result = matcher.match_resume_to_jd(resume_data, jd_data)
-                            
-                            # Save match to database
-                            db_match = DBMatch(
-                                user_id=current_user.id,
-                                resume_id=resume.id,
-                                job_description_id=jd.id,
-                                similarity_score=match_result.similarity_score,
-                                skill_coverage=match_result.skill_coverage,
-                                skill_density=match_result.skill_density,
-                                matching_skills=json.dumps(match_result.matching_skills),
-                                missing_skills=json.dumps(match_result.missing_skills),
-                                explanation=match_result.explanation
-                            )
-                            
-                            db.add(db_match)
-                            matches_performed += 1
-                            
-                        except Exception as e:
-                            logger.error(f"Error matching resume {resume.id} to JD {jd.id}: {e}")
-                            failed_files.append(f"Match: Resume {resume.id} to JD {jd.id} - {str(e)}")
+                # Score every new resume against every new JD with one similarity matrix
+                _, db_matches, match_failures = model_pool.call(_cross_match_records, current_user.id, new_resumes, new_jds)
+                db.add_all(db_matches)
+                matches_performed = len(db_matches)
+                failed_files.extend(match_failures)
                 
                 db.commit()
                 
+            except WorkerPoolSaturated:
+                raise
             except Exception as e:
                 logger.error(f"Error in batch matching: {e}")
                 failed_files.append(f"Batch matching failed: {str(e)}")
         
         # Update stats
-        stats = db.query(DBProcessingStats).filter(DBProcessingStats.user_id == current_user.id).first()
-        if not stats:
-            stats = DBProcessingStats(user_id=current_user.id)
-            db.add(stats)
-        
-        # Handle None values in statistics
-        if stats.total_resumes_processed is None:
-            stats.total_resumes_processed = 0
-        if stats.total_jds_processed is None:
-            stats.total_jds_processed = 0
-        if stats.total_matches_performed is None:
-            stats.total_matches_performed = 0
-        stats.total_resumes_processed += processed_resumes
-        stats.total_jds_processed += processed_jds
-        stats.total_matches_performed += matches_performed
-        stats.last_processed_at = datetime.utcnow()
+        _update_stats(db, current_user.id, resumes=processed_resumes, jds=processed_jds, matches=matches_performed)
         db.commit()
         
         processing_time = time.time() - start_time
@@ -523,211 +1065,642 @@ async def batch_process(
             processing_time=processing_time
         )
         
+    except WorkerPoolSaturated:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
 
 @app.post("/batch/match", response_model=BatchMatchResponse)
-async def batch_match(
+def batch_match(
     request: BatchMatchRequest,
+    include_raw_text: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Perform batch matching between existing resumes and job descriptions"""
+    """
+    Perform batch matching between existing resumes and job descriptions (texts only with ``include_raw_text=true``)
+    
+    With ``min_skill_coverage`` only the pairs whose resume has that share of
+    the job description's skills, found on the inverted skill index, are
+    loaded and scored.
+    """
     start_time = time.time()
-    matches = []
     
     try:
         # Get resumes and JDs from database
-        resumes = db.query(DBResume).filter(
+        resume_ids = [row.id for row in db.query(DBResume.id).filter(
             DBResume.id.in_(request.resume_ids),
             DBResume.user_id == current_user.id
-        ).all()
+        )]
         
         jds = db.query(DBJobDescription).filter(
             DBJobDescription.id.in_(request.jd_ids),
             DBJobDescription.user_id == current_user.id
         ).all()
         
-        if not resumes:
+        if not resume_ids:
             raise HTTPException(status_code=400, detail="No valid resumes found")
         if not jds:
             raise HTTPException(status_code=400, detail="No valid job descriptions found")
         
-        # Perform matching for each resume against each JD
-        for resume in resumes:
-            for jd in jds:
-                try:
-                    # Convert database objects to Pydantic models
-                    resume_data = Resume(
-                        raw_text=resume.raw_text,
-                        email=resume.email,
-                        phone=resume.phone,
-                        skills=json.loads(resume.skills),
-                        skills_by_category=json.loads(resume.skills_by_category),
-                        experience=float(resume.experience) if resume.experience is not None else 0.0,
-                        education=resume.education
-                    )
-                    
-                    jd_data = JobDescription(
-                        raw_text=jd.raw_text,
-                        required_skills=json.loads(jd.required_skills),
-                        preferred_skills=json.loads(jd.preferred_skills),
-                        skills_by_category=json.loads(jd.skills_by_category),
-                        title=jd.title,
-                        company=jd.company
-                    )
-                    
-                    # Perform matching
-                    match_result = matcher.match_resume_to_jd(resume_data, jd_data)
-                    
-                    # Save match to database
-                    db_match = DBMatch(
-                        user_id=current_user.id,
-                        resume_id=resume.id,
-                        job_description_id=jd.id,
-                        similarity_score=match_result.similarity_score,
-                        skill_coverage=match_result.skill_coverage,
-                        skill_density=match_result.skill_density,
-                        matching_skills=json.dumps(match_result.matching_skills),
-                        missing_skills=json.dumps(match_result.missing_skills),
-                        explanation=match_result.explanation
-                    )
-                    
-                    db.add(db_match)
-                    matches.append(match_result)
-                    
-                except Exception as e:
-                    logger.error(f"Error matching resume {resume.id} to JD {jd.id}: {e}")
+        pairs, skipped_pairs = None, 0
+        min_coverage = _min_skill_coverage(request.min_skill_coverage)
+        if min_coverage > 0:
+            shortlists = _skill_shortlists(db, current_user.id, jds, min_coverage, resume_ids)
+            pairs = {
+                (resume_id, jd_id) for jd_id, shortlist in shortlists.items()
+                for resume_id in (resume_ids if shortlist is None else shortlist)
+            }
+            skipped_pairs = len(resume_ids) * len(jds) - len(pairs)
+            resume_ids = sorted({resume_id for resume_id, _ in pairs})
+        resumes = db.query(DBResume).filter(DBResume.id.in_(resume_ids)).all() if resume_ids else []
         
+        # Decode and embed each document once, then score all pairs with one similarity matrix
+        matches, db_matches, match_failures = model_pool.call(
+            _cross_match_records, current_user.id, resumes, jds, include_raw_text, pairs
+        ) if resumes else ([], [], [])
+        for failure in match_failures:
+            logger.error(failure)
+        db.add_all(db_matches)
         db.commit()
         
         # Update stats
-        stats = db.query(DBProcessingStats).filter(DBProcessingStats.user_id == current_user.id).first()
-        if not stats:
-            stats = DBProcessingStats(user_id=current_user.id)
-            db.add(stats)
-        
-        if stats.total_matches_performed is None:
-            stats.total_matches_performed = 0
-        stats.total_matches_performed += len(matches)
-        stats.last_processed_at = datetime.utcnow()
+        _update_stats(db, current_user.id, matches=len(matches))
         db.commit()
         
         processing_time = time.time() - start_time
         
         return BatchMatchResponse(
-            matches=matches,
+            matches=[_match_response(match, include_raw_text) for match in matches],
             total_matches=len(matches),
+            skipped_pairs=skipped_pairs,
             processing_time=processing_time
         )
         
+    except (HTTPException, WorkerPoolSaturated):
+        raise
     except Exception as e:
         logger.error(f"Error in batch matching: {e}")
         raise HTTPException(status_code=500, detail=f"Batch matching failed: {str(e)}")
 
-@app.get("/resumes/")
-async def get_user_resumes(
+# Batch jobs
+def _run_match_job_chunks(ctx: JobContext, resume_ids: List[int], jd_ids: List[int],
+                          min_coverage: Optional[float] = None) -> int:
+    """
+    Score resumes against job descriptions in chunks, recording every pair as a job item
+    
+    With a skill coverage prefilter (``min_coverage``, default
+    SKILL_PREFILTER_MIN_COVERAGE) only the shortlisted pairs are scored and recorded.
+    
+    Returns:
+        Number of matches stored
+    """
+    db, user_id = ctx.db, ctx.user_id
+    jds = db.query(DBJobDescription).filter(
+        DBJobDescription.id.in_(jd_ids),
+        DBJobDescription.user_id == user_id
+    ).all()
+    found_jd_ids = {db_jd.id for db_jd in jds}
+    for jd_id in jd_ids:
+        if jd_id not in found_jd_ids:
+            ctx.failed(f"jd {jd_id}", "jd", "Job description not found")
+    
+    shortlists = None
+    min_coverage = _min_skill_coverage(min_coverage)
+    if min_coverage > 0 and jds:
+        shortlists = _skill_shortlists(db, user_id, jds, min_coverage, resume_ids)
+    
+    matches_stored = 0
+    for start in range(0, len(resume_ids), JOB_CHUNK_SIZE):
+        chunk_ids = resume_ids[start:start + JOB_CHUNK_SIZE]
+        found_resume_ids = {row.id for row in db.query(DBResume.id).filter(
+            DBResume.id.in_(chunk_ids),
+            DBResume.user_id == user_id
+        )}
+        for resume_id in chunk_ids:
+            if resume_id not in found_resume_ids:
+                ctx.failed(f"resume {resume_id}", "resume", "Resume not found")
+        
+        pairs = None
+        if shortlists is not None:
+            pairs = {
+                (resume_id, jd_id) for jd_id, shortlist in shortlists.items()
+                for resume_id in found_resume_ids if shortlist is None or resume_id in shortlist
+            }
+            found_resume_ids = {resume_id for resume_id, _ in pairs}
+        if not found_resume_ids or not jds:
+            ctx.checkpoint()
+            continue
+        
+        resumes = db.query(DBResume).filter(DBResume.id.in_(found_resume_ids)).all()
+        ctx.add_total(len(pairs) if pairs is not None else len(resumes) * len(jds))
+        matches, db_matches, _ = model_pool.call_wait(_cross_match_records, user_id, resumes, jds, False, pairs)
+        db.add_all(db_matches)
+        db.flush()
+        
+        scored = set()
+        for db_match, match_result in zip(db_matches, matches):
+            scored.add((db_match.resume_id, db_match.job_description_id))
+            ctx.succeeded(
+                f"resume {db_match.resume_id} / jd {db_match.job_description_id}", "match", db_match.id,
+                {
+                    "resume_id": db_match.resume_id,
+                    "jd_id": db_match.job_description_id,
+                    "similarity_score": match_result.similarity_score,
+                    "skill_coverage": match_result.skill_coverage
+                }
+            )
+        for db_resume in resumes:
+            for db_jd in jds:
+                if pairs is not None and (db_resume.id, db_jd.id) not in pairs:
+                    continue
+                if (db_resume.id, db_jd.id) not in scored:
+                    ctx.failed(f"resume {db_resume.id} / jd {db_jd.id}", "match", "Could not be scored")
+        
+        matches_stored += len(db_matches)
+        _update_stats(db, user_id, matches=len(db_matches))
+        ctx.checkpoint()
+    
+    return matches_stored
+
+def _run_batch_process_job(ctx: JobContext, request: dict) -> None:
+    """Job runner: process files one by one, then optionally cross-match the new documents"""
+    db, user_id = ctx.db, ctx.user_id
+    files = [("resume", path) for path in request.get("resume_files", [])]
+    files += [("jd", path) for path in request.get("jd_files", [])]
+    ctx.add_total(len(files))
+    
+    new_ids = {"resume": [], "jd": []}
+    for kind, path in files:
+        try:
+            record, _ = _ingest_document(db, user_id, kind, path, os.path.basename(path), wait=True)
+            db.add(record)
+            db.flush()
+            _update_stats(db, user_id, resumes=int(kind == "resume"), jds=int(kind == "jd"))
+            new_ids[kind].append(record.id)
+            ctx.succeeded(path, kind, record.id)
+        except Exception as e:
+            ctx.failed(path, kind, str(e))
+        ctx.checkpoint()
+    
+    if request.get("perform_matching") and new_ids["resume"] and new_ids["jd"]:
+        _run_match_job_chunks(ctx, new_ids["resume"], new_ids["jd"])
+
+def _run_batch_match_job(ctx: JobContext, request: dict) -> None:
+    """Job runner: cross-match existing resumes and job descriptions"""
+    _run_match_job_chunks(
+        ctx, list(request.get("resume_ids", [])), list(request.get("jd_ids", [])), request.get("min_skill_coverage")
+    )
+
+def _run_reextract_job(ctx: JobContext, request: dict) -> None:
+    """Job runner: bring stored skills up to date with the loaded ontology"""
+    ctx.add_total(count_stale_documents(ctx.db, pipeline.ontology))
+    ctx.checkpoint(force=True)
+    
+    def on_progress(processed: int, failed: int) -> None:
+        ctx.progress(processed, failed)
+        ctx.checkpoint()
+    
+    reextract_skills(
+        ctx.db, pipeline.ontology,
+        chunk_size=request.get("chunk_size") or REEXTRACT_CHUNK_SIZE,
+        max_workers=request.get("max_workers") or REEXTRACT_WORKERS,
+        on_progress=on_progress
+    )
+
+job_manager.register("batch_process", _run_batch_process_job)
+job_manager.register("batch_match", _run_batch_match_job)
+job_manager.register("reextract_skills", _run_reextract_job)
+
+def _to_job_response(job: BatchJob, response_class=JobResponse, **extra):
+    """Convert a job row to its API model"""
+    return response_class(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        total_items=job.total_items or 0,
+        processed_items=job.processed_items or 0,
+        failed_items=job.failed_items or 0,
+        cancel_requested=bool(job.cancel_requested),
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        **extra
+    )
+
+def _get_user_job(db: Session, job_id: str, user_id: int) -> BatchJob:
+    """Load a job of the user or fail with 404"""
+    job = db.query(BatchJob).filter(BatchJob.id == job_id, BatchJob.user_id == user_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/jobs/batch/process", response_model=JobResponse, status_code=202)
+def submit_batch_process_job(
+    request: BatchProcessRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all resumes for the current user"""
-    try:
-        db_resumes = db.query(DBResume).filter(DBResume.user_id == current_user.id).all()
-        resumes = []
-        for db_resume in db_resumes:
-            resume = Resume(
-                raw_text=db_resume.raw_text,
-                email=db_resume.email,
-                phone=db_resume.phone,
-                skills=json.loads(db_resume.skills),
-                skills_by_category=json.loads(db_resume.skills_by_category),
-                experience=float(db_resume.experience) if db_resume.experience is not None else 0.0,
-                education=db_resume.education
-            )
-            resumes.append(ResumeResponse(id=str(db_resume.id), data=resume))
-        return resumes
-    except Exception as e:
-        logger.error(f"Error getting resumes: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get resumes: {str(e)}")
+    """Queue a batch processing job and return its ID immediately"""
+    job = job_manager.submit(db, current_user.id, "batch_process", request.model_dump())
+    return _to_job_response(job)
 
-@app.get("/jds/")
-async def get_user_jds(
+@app.post("/jobs/batch/match", response_model=JobResponse, status_code=202)
+def submit_batch_match_job(
+    request: BatchMatchRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all job descriptions for the current user"""
+    """Queue a batch matching job and return its ID immediately"""
+    job = job_manager.submit(db, current_user.id, "batch_match", request.model_dump())
+    return _to_job_response(job)
+
+@app.post("/admin/ontology/reload")
+def reload_ontology(current_user: User = Depends(get_current_admin_user)):
+    """
+    Reload the skills ontology file and swap it in without restarting
+    
+    Only the serving process reloads; other gunicorn workers follow through
+    their ontology watcher (see gunicorn_conf.py).
+    """
+    previous_version = pipeline.ontology_version
     try:
-        db_jds = db.query(DBJobDescription).filter(DBJobDescription.user_id == current_user.id).all()
-        jds = []
-        for db_jd in db_jds:
-            jd = JobDescription(
-                raw_text=db_jd.raw_text,
-                required_skills=json.loads(db_jd.required_skills),
-                preferred_skills=json.loads(db_jd.preferred_skills),
-                skills_by_category=json.loads(db_jd.skills_by_category),
-                title=db_jd.title,
-                company=db_jd.company
-            )
-            jds.append(JDResponse(id=str(db_jd.id), data=jd))
-        return jds
+        changed = pipeline.reload_ontology()
     except Exception as e:
-        logger.error(f"Error getting job descriptions: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get job descriptions: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Ontology reload failed, keeping version {previous_version}: {str(e)}")
+    
+    if changed:
+        _record_ontology(pipeline)
+    return {
+        "reloaded": changed,
+        "previous_version": previous_version,
+        "ontology_version": pipeline.ontology_version,
+        "categories": len(pipeline.ontology)
+    }
 
-@app.get("/matches/")
-async def get_user_matches(
+@app.post("/admin/reextract-skills", response_model=JobResponse, status_code=202)
+def submit_reextract_job(
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Queue re-extraction of stored skills for documents processed with an older ontology"""
+    job = job_manager.submit(db, current_user.id, "reextract_skills", {"chunk_size": chunk_size, "max_workers": max_workers})
+    return _to_job_response(job)
+
+@app.get("/jobs/", response_model=List[JobResponse])
+def list_jobs(
+    limit: int = 50,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all matches for the current user"""
+    """List the user's most recent batch jobs"""
+    jobs = db.query(BatchJob).filter(
+        BatchJob.user_id == current_user.id
+    ).order_by(BatchJob.created_at.desc()).limit(max(1, min(limit, 500))).all()
+    return [_to_job_response(job) for job in jobs]
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(
+    job_id: str,
+    items_offset: int = 0,
+    items_limit: int = 100,
+    items_status: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get job progress with a page of item results (partial while the job runs)"""
+    job = _get_user_job(db, job_id, current_user.id)
+    
+    query = db.query(BatchJobItem).filter(BatchJobItem.job_id == job.id)
+    if items_status:
+        query = query.filter(BatchJobItem.status == items_status)
+    rows = query.order_by(BatchJobItem.id).offset(max(0, items_offset)).limit(max(0, min(items_limit, 1000))).all()
+    
+    items = [
+        JobItemResult(
+            item=row.item,
+            kind=row.kind,
+            status=row.status,
+            record_id=row.record_id,
+            result=json.loads(row.result) if row.result else None,
+            error=row.error
+        )
+        for row in rows
+    ]
+    return _to_job_response(job, JobStatusResponse, items=items)
+
+@app.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Cancel a pending or running job; items finished so far are kept"""
+    job = _get_user_job(db, job_id, current_user.id)
+    return _to_job_response(job_manager.cancel(db, job))
+
+@app.get("/matches/", response_model=List[MatchSummary])
+def get_user_matches(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    min_similarity: Optional[float] = None,
+    min_coverage: Optional[float] = None,
+    resume_id: Optional[int] = None,
+    jd_id: Optional[int] = None,
+    has_skill: Optional[List[str]] = Query(None),
+    created_after: Optional[datetime] = None,
+    expand: Optional[str] = None,
+    include_raw_text: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the current user's matches (newest first by default), one page at a time
+    
+    Matches come from a single joined query that reads only the match columns
+    and the document names; ``expand=documents`` adds the full resume and job
+    description data, loaded with one query per document table for the page
+    (plus their texts with ``include_raw_text=true``).
+    Filters, sorting and the ``X-Next-Cursor`` paging work like ``/resumes/``
+    (``has_skill`` filters on the matching skills); the number of matches
+    passing the filters is returned in the ``X-Total-Count`` header.
+    """
+    if expand not in (None, "documents"):
+        raise HTTPException(status_code=400, detail="expand must be 'documents'")
+    
+    filters = [DBMatch.user_id == current_user.id]
+    if min_similarity is not None:
+        filters.append(DBMatch.similarity_score >= min_similarity)
+    if min_coverage is not None:
+        filters.append(DBMatch.skill_coverage >= min_coverage)
+    if resume_id is not None:
+        filters.append(DBMatch.resume_id == resume_id)
+    if jd_id is not None:
+        filters.append(DBMatch.job_description_id == jd_id)
+    for skill in has_skill or []:
+        filters.append(_has_skill(DBMatch.matching_skills, skill))
+    if created_after is not None:
+        filters.append(DBMatch.created_at >= created_after)
+    
     try:
-        db_matches = db.query(DBMatch).filter(DBMatch.user_id == current_user.id).all()
-        matches = []
-        for db_match in db_matches:
-            # Get resume and JD data
-            resume = db.query(DBResume).filter(DBResume.id == db_match.resume_id).first()
-            jd = db.query(DBJobDescription).filter(DBJobDescription.id == db_match.job_description_id).first()
-            
-            if resume and jd:
-                resume_data = Resume(
-                    raw_text=resume.raw_text,
-                    email=resume.email,
-                    phone=resume.phone,
-                    skills=json.loads(resume.skills),
-                    skills_by_category=json.loads(resume.skills_by_category),
-                    experience=float(resume.experience) if resume.experience is not None else 0.0,
-                    education=resume.education
-                )
-                
-                jd_data = JobDescription(
-                    raw_text=jd.raw_text,
-                    required_skills=json.loads(jd.required_skills),
-                    preferred_skills=json.loads(jd.preferred_skills),
-                    skills_by_category=json.loads(jd.skills_by_category),
-                    title=jd.title,
-                    company=jd.company
+        query = db.query(
+            DBMatch.id, DBMatch.resume_id, DBMatch.job_description_id,
+            DBMatch.similarity_score, DBMatch.skill_coverage, DBMatch.skill_density,
+            DBMatch.matching_skills, DBMatch.missing_skills, DBMatch.explanation, DBMatch.created_at,
+            DBResume.filename.label("resume_filename"),
+            DBJobDescription.filename.label("jd_filename"),
+            DBJobDescription.title.label("jd_title")
+        ).join(
+            DBResume, DBMatch.resume_id == DBResume.id
+        ).join(
+            DBJobDescription, DBMatch.job_description_id == DBJobDescription.id
+        ).filter(*filters)
+        rows = _keyset_page(query, _MATCH_SORTS, sort, order, DBMatch.id, cursor, limit, response)
+        
+        response.headers["X-Total-Count"] = str(db.query(func.count(DBMatch.id)).filter(*filters).scalar())
+        
+        resumes, jds = {}, {}
+        if expand == "documents" and rows:
+            resume_query = db.query(DBResume).options(defer(DBResume.embedding))
+            jd_query = db.query(DBJobDescription).options(defer(DBJobDescription.embedding))
+            if include_raw_text:
+                resume_query = resume_query.options(
+                    selectinload(DBResume.document_text), joinedload(DBResume.canonical).defer(DBResume.embedding)
                 )
-                
-                match_result = MatchResult(
-                    resume=resume_data,
-                    job_description=jd_data,
-                    similarity_score=db_match.similarity_score,
-                    skill_coverage=db_match.skill_coverage,
-                    skill_density=db_match.skill_density,
-                    matching_skills=json.loads(db_match.matching_skills),
-                    missing_skills=json.loads(db_match.missing_skills),
-                    explanation=db_match.explanation
+                jd_query = jd_query.options(
+                    selectinload(DBJobDescription.document_text),
+                    joinedload(DBJobDescription.canonical).defer(DBJobDescription.embedding)
                 )
-                matches.append(match_result)
-        return matches
+            resumes = {
+                row.id: _to_resume_model(row, include_raw_text)
+                for row in resume_query.filter(DBResume.id.in_({row.resume_id for row in rows}))
+            }
+            jds = {
+                row.id: _to_jd_model(row, include_raw_text)
+                for row in jd_query.filter(DBJobDescription.id.in_({row.job_description_id for row in rows}))
+            }
+        
+        return [
+            MatchSummary(
+                id=row.id,
+                resume_id=row.resume_id,
+                job_description_id=row.job_description_id,
+                resume_filename=row.resume_filename,
+                jd_filename=row.jd_filename,
+                jd_title=row.jd_title,
+                similarity_score=row.similarity_score,
+                skill_coverage=row.skill_coverage,
+                skill_density=row.skill_density,
+                matching_skills=json.loads(row.matching_skills or "[]"),
+                missing_skills=json.loads(row.missing_skills or "[]"),
+                explanation=row.explanation or "",
+                created_at=row.created_at,
+                resume=resumes.get(row.resume_id),
+                job_description=jds.get(row.job_description_id)
+            )
+            for row in rows
+        ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting matches: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get matches: {str(e)}")
 
+@app.get("/search/skills", response_model=SkillSearchResponse)
+def search_skills(
+    response: Response,
+    q: str,
+    kind: str = "resume",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    count: bool = True,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find the current user's resumes (or job descriptions, ``kind=jd``) matching a boolean skill query
+    
+    ``q`` combines skills with AND, OR, NOT and parentheses, for example
+    ``kubernetes AND (go OR rust) AND NOT php``. The query runs in SQL on the
+    normalized skill tables, one index range per skill, without loading any
+    skill lists. Sorting and ``X-Next-Cursor`` paging work like ``/resumes/``;
+    ``count=false`` skips counting all matches (``total`` is then null).
+    """
+    start_time = time.time()
+    if kind not in ("resume", "jd"):
+        raise HTTPException(status_code=400, detail="kind must be 'resume' or 'jd'")
+    try:
+        tree = parse_skill_query(q)
+    except SkillQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    model = DBResume if kind == "resume" else DBJobDescription
+    if kind == "resume":
+        query = db.query(
+            DBResume.id, DBResume.filename, DBResume.created_at, DBResume.experience, DBResume.skills.label("skills")
+        )
+        sorts = _RESUME_SORTS
+    else:
+        query = db.query(
+            DBJobDescription.id, DBJobDescription.filename, DBJobDescription.created_at, DBJobDescription.title,
+            DBJobDescription.required_skills.label("skills")
+        )
+        sorts = _JD_SORTS
+    
+    try:
+        page_condition, count_condition, ids = _skill_conditions(db, model, tree)
+        owned = model.user_id == current_user.id
+        page = _keyset_page(query.filter(owned, page_condition), sorts, sort, order, model.id, cursor, limit, response)
+        total = db.query(func.count(model.id)).filter(owned, count_condition).scalar() if count else None
+        return SkillSearchResponse(
+            query=q,
+            kind=kind,
+            total=total,
+            unknown_skills=[skill for skill in dict.fromkeys(query_skills(tree)) if skill not in ids],
+            results=[
+                SkillSearchHit(
+                    id=row.id,
+                    filename=row.filename,
+                    title=getattr(row, "title", None),
+                    experience=getattr(row, "experience", None),
+                    skills=json.loads(row.skills or "[]"),
+                    created_at=row.created_at
+                )
+                for row in page
+            ],
+            search_time=time.time() - start_time
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in skill search: {e}")
+        raise HTTPException(status_code=500, detail=f"Skill search failed: {str(e)}")
+
+@app.get("/search/resumes", response_model=ResumeSearchResponse)
+def search_resumes(
+    jd_id: int,
+    k: int = 10,
+    min_skill_coverage: Optional[float] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find the k stored resumes that best fit a job description
+    
+    With ``min_skill_coverage`` (default SKILL_PREFILTER_MIN_COVERAGE) the pool
+    is first shortlisted on the inverted skill index and only the shortlist is
+    scored, exactly.
+    """
+    start_time = time.time()
+    
+    if k < 1 or k > 1000:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 1000")
+    min_coverage = _min_skill_coverage(min_skill_coverage)
+    if not 0.0 <= min_coverage <= 1.0:
+        raise HTTPException(status_code=400, detail="min_skill_coverage must be between 0 and 1")
+    
+    db_jd = db.query(DBJobDescription).filter(
+        DBJobDescription.id == jd_id,
+        DBJobDescription.user_id == current_user.id
+    ).first()
+    if not db_jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    try:
+        # Database reads stay on the request thread; only plain models and arrays go to the model pool
+        signature = matcher.embedding_signature
+        jd_embedding = load_embedding(db_jd, signature)
+        if jd_embedding is None and db_jd.text and db_jd.text.strip():
+            jd_embedding = model_pool.call(matcher.encode_document, db_jd.text)
+            if jd_embedding is not None:
+                store_embedding(db_jd, jd_embedding, signature)
+                db.commit()
+        index, unindexed = _get_resume_index(db, current_user.id)
+        shortlist = None
+        if min_coverage > 0:
+            shortlist = _skill_shortlists(db, current_user.id, [db_jd], min_coverage)[db_jd.id]
+        hits = index.search(
+            jd_embedding, k, full_vectors=lambda resume_ids: _load_resume_vectors(db, resume_ids), ids=shortlist
+        ) if jd_embedding is not None else []
+        
+        # Load only the returned resumes and score them exactly like /match/
+        db_resumes = {
+            row.id: row for row in db.query(DBResume).filter(DBResume.id.in_([resume_id for resume_id, _ in hits])).all()
+        }
+        hit_resumes = [db_resumes[resume_id] for resume_id, _ in hits if resume_id in db_resumes]
+        resume_embeddings = [load_embedding(db_resume, signature) for db_resume in hit_resumes]
+        match_rows = model_pool.call(
+            matcher.cross_match,
+            [_to_resume_model(db_resume, include_raw_text=vector is None)
+             for db_resume, vector in zip(hit_resumes, resume_embeddings)],
+            [_to_jd_model(db_jd, include_raw_text=False)],
+            resume_embeddings=resume_embeddings,
+            jd_embeddings=[jd_embedding]
+        ) if hit_resumes else []
+        results = []
+        for db_resume, row in zip(hit_resumes, match_rows):
+            match_result = row[0]
+            if match_result is None:
+                continue
+            results.append(ResumeSearchResult(
+                resume_id=db_resume.id,
+                filename=db_resume.filename,
+                similarity_score=match_result.similarity_score,
+                skill_coverage=match_result.skill_coverage,
+                skill_density=match_result.skill_density,
+                matching_skills=match_result.matching_skills,
+                missing_skills=match_result.missing_skills,
+                explanation=match_result.explanation
+            ))
+        results.sort(key=lambda result: result.similarity_score, reverse=True)
+        
+        return ResumeSearchResponse(
+            jd_id=jd_id,
+            results=results,
+            total_candidates=len(index) if shortlist is None else len(shortlist),
+            approximate=index.approximate and shortlist is None,
+            unindexed=unindexed,
+            search_time=time.time() - start_time
+        )
+        
+    except WorkerPoolSaturated:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching resumes: {e}")
+        raise HTTPException(status_code=500, detail=f"Resume search failed: {str(e)}")
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "version": "2.0.0"}
+    """Liveness check: answers as soon as the server runs, without touching the model"""
+    return {
+        "status": "healthy",
+        "version": "2.0.0",
+        "ontology_version": pipeline.ontology_version,
+        "workers": {"parse": parse_pool.stats(), "model": model_pool.stats()},
+        "embedding_batches": matcher.batcher.stats() if matcher.batcher is not None else None
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until the embedding model is loaded"""
+    if not matcher.is_loaded:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "failed" if matcher.load_error else "loading",
+                "model": matcher.model_name,
+                "error": matcher.load_error
+            }
+        )
+    return {"status": "ready", "model": matcher.model_name}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,147 @@
+"""
+Cross-request micro-batching of embedding requests for Resume Screening AI
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Micro-batching configuration
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))  # 0 disables micro-batching
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))  # Texts per forward pass
+
+_STOP = object()  # Queue sentinel that ends the batching thread
+
+class EmbeddingBatcher:
+    """
+    Collects small encode requests from concurrent callers into one forward pass.
+
+    Callers block in ``encode()`` while a single background thread waits until
+    the oldest queued request is ``max_wait_ms`` old for more requests to
+    arrive (or until ``max_batch`` texts are queued), encodes all their texts
+    together and hands every caller its slice of the result. Requests of
+    ``max_batch`` texts or more are already full batches and bypass the queue.
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch: int = EMBEDDING_MAX_BATCH,
+                 max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS):
+        """
+        Initialize the batcher
+
+        Args:
+            encode_fn: Encodes a list of texts into an array with one row per text
+            max_batch: Maximum number of texts per forward pass
+            max_wait_ms: Longest time a request waits for others to join its batch
+        """
+        self.encode_fn = encode_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._requests = 0
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, sharing a forward pass with concurrent callers
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Array with one embedding row per text
+        """
+        if len(texts) >= self.max_batch:
+            return self.encode_fn(texts)
+
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((list(texts), future, time.monotonic()))
+        return future.result()
+
+    def _ensure_started(self) -> None:
+        """Start the batching thread on first use (after any fork of the server process)"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        """Batching loop: gather requests, encode them together, resolve their futures"""
+        carry = None
+        while True:
+            first = carry if carry is not None else self._queue.get()
+            carry = None
+            if first is _STOP:
+                return
+
+            batch = [first]
+            size = len(first[0])
+            # Requests that queued up during the previous forward pass have already waited
+            deadline = first[2] + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP or size + len(request[0]) > self.max_batch:
+                    # Does not fit (or is the stop signal): it starts the next round
+                    carry = request
+                    break
+                batch.append(request)
+                size += len(request[0])
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[tuple]) -> None:
+        """Run one forward pass for a group of requests"""
+        texts = [text for request_texts, _, _ in batch for text in request_texts]
+        try:
+            embeddings = self.encode_fn(texts)
+        except Exception as e:
+            logger.error(f"Error encoding a batch of {len(texts)} texts: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for request_texts, future, _ in batch:
+            future.set_result(embeddings[start:start + len(request_texts)])
+            start += len(request_texts)
+
+        self._batches += 1
+        self._texts += len(texts)
+        self._requests += len(batch)
+
+    def stats(self) -> dict:
+        """Batching counters"""
+        return {
+            "batches": self._batches,
+            "requests": self._requests,
+            "texts": self._texts,
+            "average_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    def close(self) -> None:
+        """Stop the batching thread after the queued requests"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,175 @@
+"""
+Token-bounded document chunking and embedding pooling for Resume Screening AI
+"""
+
+import os
+import re
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Chunking configuration
+EMBEDDING_POOLING = os.getenv("EMBEDDING_POOLING", "none")  # none (truncate), mean, max or section
+EMBEDDING_CHUNK_TOKENS = int(os.getenv("EMBEDDING_CHUNK_TOKENS", "0"))  # 0: the model's max_seq_length
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "32"))
+EMBEDDING_MAX_CHUNKS = int(os.getenv("EMBEDDING_MAX_CHUNKS", "16"))  # Upper bound of forward passes per document
+
+POOLING_MODES = ("none", "mean", "max", "section")
+
+# Relative weight of chunks per section for "section" pooling (unlisted sections weigh 1.0)
+SECTION_WEIGHTS = {
+    "skills": 1.5,
+    "experience": 1.5,
+    "requirements": 1.5,
+    "qualifications": 1.5,
+    "responsibilities": 1.2,
+    "projects": 1.2,
+    "summary": 1.0,
+    "education": 0.8,
+    "certifications": 0.8,
+    "interests": 0.3,
+    "references": 0.3,
+}
+
+# Heading keywords mapped to the section they start
+_SECTION_KEYWORDS = {
+    "skill": "skills", "competenc": "skills", "technolog": "skills",
+    "experience": "experience", "employment": "experience", "work history": "experience",
+    "requirement": "requirements", "qualification": "qualifications", "must have": "requirements",
+    "responsibilit": "responsibilities", "what you will do": "responsibilities", "duties": "responsibilities",
+    "project": "projects",
+    "summary": "summary", "profile": "summary", "objective": "summary", "about": "summary",
+    "education": "education", "academic": "education",
+    "certification": "certifications", "license": "certifications",
+    "interest": "interests", "hobbies": "interests",
+    "reference": "references",
+}
+
+# Short lines (optionally ending with ":") are heading candidates
+_HEADING_RE = re.compile(r"^[ \t]*([A-Za-z][A-Za-z &/'-]{2,40}?)[ \t]*:?[ \t]*$", re.MULTILINE)
+_WORD_RE = re.compile(r"\S+")
+
+Span = Tuple[int, int]
+
+def word_spans(text: str) -> List[Span]:
+    """Character spans of whitespace-separated words (fallback when no tokenizer is available)"""
+    return [match.span() for match in _WORD_RE.finditer(text)]
+
+def tokenizer_spans(tokenizer) -> Optional[Callable[[str], List[Span]]]:
+    """
+    Build a function returning the character span of every token of a text
+
+    Args:
+        tokenizer: Hugging Face tokenizer of the embedding model
+
+    Returns:
+        The span function, or None if the tokenizer cannot report offsets
+    """
+    if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+        return None
+
+    def spans(text: str) -> List[Span]:
+        encoded = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                            truncation=False, verbose=False)
+        return [tuple(span) for span in encoded["offset_mapping"] if span[1] > span[0]]
+
+    return spans
+
+def split_sections(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split a document at recognized section headings
+
+    Returns:
+        (section, start, end) character ranges covering the text; text before
+        the first heading belongs to "summary"
+    """
+    starts = []
+    for match in _HEADING_RE.finditer(text):
+        heading = match.group(1).lower()
+        section = next((name for keyword, name in _SECTION_KEYWORDS.items() if keyword in heading), None)
+        if section is not None:
+            starts.append((match.start(), section))
+
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, "summary"))
+    return [(section, start, starts[i + 1][0] if i + 1 < len(starts) else len(text))
+            for i, (start, section) in enumerate(starts)]
+
+def chunk_document(text: str, max_tokens: int, overlap: int = EMBEDDING_CHUNK_OVERLAP,
+                   max_chunks: int = EMBEDDING_MAX_CHUNKS, spans_fn: Optional[Callable[[str], List[Span]]] = None,
+                   by_section: bool = False) -> List[Tuple[str, float]]:
+    """
+    Split a document into overlapping windows of at most ``max_tokens`` tokens
+
+    The text is tokenized once; windows are cut from the original text at
+    token boundaries. With ``by_section`` windows never cross a section
+    heading and carry the section weight. At most ``max_chunks`` windows are
+    returned, so the cost per document stays bounded.
+
+    Args:
+        text: Document text
+        max_tokens: Tokens per window
+        overlap: Tokens shared by consecutive windows
+        max_chunks: Maximum number of windows
+        spans_fn: Returns token character spans (whitespace words if None)
+        by_section: Chunk each section separately and weight it
+
+    Returns:
+        (chunk text, weight) pairs in document order
+    """
+    if not text or not text.strip():
+        return []
+    spans = (spans_fn or word_spans)(text)
+    if not spans:
+        return []
+
+    max_tokens = max(1, max_tokens)
+    step = max(1, max_tokens - max(0, min(overlap, max_tokens - 1)))
+    sections = split_sections(text) if by_section else [("summary", 0, len(text))]
+
+    chunks: List[Tuple[str, float]] = []
+    token = 0
+    for section, start, end in sections:
+        # Tokens of this section
+        first = token
+        while token < len(spans) and spans[token][0] < end:
+            token += 1
+        section_spans = [span for span in spans[first:token] if span[0] >= start]
+        weight = SECTION_WEIGHTS.get(section, 1.0) if by_section else 1.0
+
+        for window_start in range(0, len(section_spans), step):
+            window = section_spans[window_start:window_start + max_tokens]
+            chunks.append((text[window[0][0]:window[-1][1]], weight))
+            if len(chunks) >= max_chunks:
+                logger.debug(f"Document truncated to {max_chunks} chunks of {max_tokens} tokens")
+                return chunks
+            if window_start + max_tokens >= len(section_spans):
+                break
+
+    return chunks
+
+def pool_embeddings(vectors: np.ndarray, weights: Optional[List[float]] = None, mode: str = "mean") -> np.ndarray:
+    """
+    Pool chunk embeddings into one L2-normalized document embedding
+
+    Args:
+        vectors: Chunk embeddings, one row per chunk
+        weights: Chunk weights (used by "section" pooling)
+        mode: "mean", "max" or "section" (weighted mean)
+
+    Returns:
+        Document embedding
+    """
+    if mode == "max":
+        pooled = vectors.max(axis=0)
+    elif mode == "section" and weights is not None:
+        pooled = np.average(vectors, axis=0, weights=np.asarray(weights, dtype=np.float32))
+    else:
+        pooled = vectors.mean(axis=0)
+
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm > 0 else pooled).astype(np.float32)
@@ -0,0 +1,65 @@
+"""
+Compression of stored document text for Resume Screening AI
+"""
+
+import os
+import zlib
+import logging
+from typing import Tuple
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Compression configuration
+TEXT_COMPRESSION = os.getenv("TEXT_COMPRESSION", "zstd")  # zstd (needs the zstandard package) or zlib
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "9"))
+ZLIB_LEVEL = int(os.getenv("ZLIB_LEVEL", "6"))
+
+CODECS = ("zstd", "zlib")
+
+if TEXT_COMPRESSION not in CODECS:
+    raise ValueError(f"TEXT_COMPRESSION must be one of {', '.join(CODECS)}, got {TEXT_COMPRESSION!r}")
+if TEXT_COMPRESSION == "zstd" and not ZSTANDARD_AVAILABLE:
+    logger.info("zstandard not available, document text is compressed with zlib")
+    TEXT_COMPRESSION = "zlib"
+
+def compress_text(text: str, codec: str = TEXT_COMPRESSION) -> Tuple[str, bytes]:
+    """
+    Compress a document text
+
+    Args:
+        text: Text to compress
+        codec: "zstd" or "zlib"
+
+    Returns:
+        Tuple of (codec used, compressed UTF-8 bytes)
+    """
+    data = (text or "").encode("utf-8")
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return "zlib", zlib.compress(data, ZLIB_LEVEL)
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """
+    Decompress a text stored by ``compress_text``
+
+    Args:
+        codec: Codec the text was compressed with
+        data: Compressed bytes
+
+    Returns:
+        The original text
+    """
+    if codec == "zstd":
+        if not ZSTANDARD_AVAILABLE:
+            raise ImportError("zstandard is required to read zstd-compressed document text")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown text codec: {codec}")
@@ -5,21 +5,30 @@ Database configuration and models for Resume Screening AI
 import os
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, LargeBinary, Index, text as sql_text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, deferred
 from sqlalchemy.pool import StaticPool
+from .compression import compress_text, decompress_text
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resume_screening.db")
 
 # Create engine
-if DATABASE_URL.startswith("sqlite"):
+if DATABASE_URL.startswith("sqlite") and (":memory:" in DATABASE_URL or DATABASE_URL in ("sqlite://", "sqlite:///")):
+    # In-memory databases only exist on one connection, so it has to be shared
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+elif DATABASE_URL.startswith("sqlite"):
+    # One connection per session: request handlers and background jobs run in
+    # different threads and must not share a transaction
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
 else:
     engine = create_engine(DATABASE_URL)
 
@@ -47,57 +56,173 @@ class User(Base):
     job_descriptions = relationship("JobDescription", back_populates="user")
     matches = relationship("Match", back_populates="user")
 
-class Resume(Base):
+class DocumentText(Base):
+    """Compressed text of a document, kept out of the document tables so their scans stay small"""
+    __tablename__ = "document_texts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    codec = Column(String, nullable=False)  # "zstd" or "zlib"
+    length = Column(Integer, nullable=False)  # Characters of the uncompressed text
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def from_text(cls, text: str) -> "DocumentText":
+        """Compress a text into a new (unsaved) row"""
+        codec, data = compress_text(text)
+        return cls(codec=codec, length=len(text or ""), data=data)
+    
+    @property
+    def text(self) -> str:
+        """Decompressed text (decompressed once per loaded row)"""
+        if "_text" not in self.__dict__:
+            self.__dict__["_text"] = decompress_text(self.codec, self.data)
+        return self.__dict__["_text"]
+
+class StoredTextMixin:
+    """``text`` access for document rows whose text lives in ``document_texts``"""
+    
+    @property
+    def text(self) -> str:
+        """Document text, loaded and decompressed on first access"""
+        if self.document_text is not None:
+            return self.document_text.text
+        # Deduplicated rows without their own text read it from their canonical row
+        if self.duplicate_of_id is not None and self.canonical is not None:
+            return self.canonical.text
+        return self.raw_text  # Rows stored before text compression
+    
+    @text.setter
+    def text(self, value: str) -> None:
+        self.document_text = DocumentText.from_text(value)
+
+class Resume(StoredTextMixin, Base):
     """Resume model for storing processed resume data"""
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Keyset pagination of a user's resumes by each sort key
+        Index("ix_resumes_user_created", "user_id", "created_at", "id"),
+        Index("ix_resumes_user_experience", "user_id", "experience", "id"),
+        Index("ix_resumes_user_filename", "user_id", "filename", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    duplicate_of_id = Column(Integer, ForeignKey("resumes.id"), index=True)  # Canonical row with the same content
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    raw_text = Column(Text, nullable=False)
+    raw_text = deferred(Column(Text, nullable=False, default=""))  # Legacy inline text, empty since text_id
+    text_id = Column(Integer, ForeignKey("document_texts.id"))  # Compressed text (shared by duplicates)
     email = Column(String)
     phone = Column(String)
     skills = Column(Text)  # JSON string of skills
     skills_by_category = Column(Text)  # JSON string of categorized skills
     experience = Column(Float, default=0.0)
     education = Column(Text)
+    embedding = Column(LargeBinary)  # float32 embedding blob
+    embedding_model = Column(String)  # Model that produced the embedding
+    embedding_dim = Column(Integer)
+    content_hash = Column(String, index=True)  # SHA-256 of the source file
+    ontology_version = Column(String)  # Skills ontology the document was processed with
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="resumes")
     matches = relationship("Match", back_populates="resume")
+    canonical = relationship("Resume", remote_side=[id])
+    document_text = relationship("DocumentText")
+    skill_links = relationship("ResumeSkill", cascade="all, delete-orphan")
 
-class JobDescription(Base):
+class JobDescription(StoredTextMixin, Base):
     """Job Description model for storing processed JD data"""
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        Index("ix_job_descriptions_user_created", "user_id", "created_at", "id"),
+        Index("ix_job_descriptions_user_filename", "user_id", "filename", "id"),
+        # Titles sort with NULL as '', so the index is on the same expression
+        Index("ix_job_descriptions_user_title", "user_id", sql_text("coalesce(title, '')"), "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    duplicate_of_id = Column(Integer, ForeignKey("job_descriptions.id"), index=True)  # Canonical row with the same content
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    raw_text = Column(Text, nullable=False)
+    raw_text = deferred(Column(Text, nullable=False, default=""))  # Legacy inline text, empty since text_id
+    text_id = Column(Integer, ForeignKey("document_texts.id"))  # Compressed text (shared by duplicates)
     required_skills = Column(Text)  # JSON string of required skills
     preferred_skills = Column(Text)  # JSON string of preferred skills
     skills_by_category = Column(Text)  # JSON string of categorized skills
     title = Column(String)
     company = Column(String)
+    embedding = Column(LargeBinary)  # float32 embedding blob
+    embedding_model = Column(String)  # Model that produced the embedding
+    embedding_dim = Column(Integer)
+    content_hash = Column(String, index=True)  # SHA-256 of the source file
+    ontology_version = Column(String)  # Skills ontology the document was processed with
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="job_descriptions")
     matches = relationship("Match", back_populates="job_description")
+    canonical = relationship("JobDescription", remote_side=[id])
+    document_text = relationship("DocumentText")
+    skill_links = relationship("JDSkill", cascade="all, delete-orphan")
+
+class SkillCategory(Base):
+    """Skill category of the ontology"""
+    __tablename__ = "skill_categories"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+class Skill(Base):
+    """Skill dictionary: one row per distinct (lowercase) skill name"""
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+class ResumeSkill(Base):
+    """Skill found in a resume (normalized copy of Resume.skills for SQL-side skill queries)"""
+    __tablename__ = "resume_skills"
+    __table_args__ = (
+        # Posting list of a skill: the resumes that have it
+        Index("ix_resume_skills_skill", "skill_id", "resume_id"),
+    )
+    
+    resume_id = Column(Integer, ForeignKey("resumes.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("skill_categories.id"))
+
+class JDSkill(Base):
+    """Skill asked for by a job description (normalized copy of its required and preferred skills)"""
+    __tablename__ = "jd_skills"
+    __table_args__ = (
+        Index("ix_jd_skills_skill", "skill_id", "job_description_id"),
+    )
+    
+    job_description_id = Column(Integer, ForeignKey("job_descriptions.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("skill_categories.id"))
+    required = Column(Boolean, nullable=False, default=True)
 
 class Match(Base):
     """Match model for storing matching results"""
     __tablename__ = "matches"
+    __table_args__ = (
+        Index("ix_matches_user_created", "user_id", "created_at", "id"),
+        Index("ix_matches_user_similarity", "user_id", "similarity_score", "id"),
+        Index("ix_matches_user_coverage", "user_id", "skill_coverage", "id"),
+        Index("ix_matches_user_density", "user_id", "skill_density", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
-    job_description_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, index=True)
+    job_description_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False, index=True)
     similarity_score = Column(Float, nullable=False)
     skill_coverage = Column(Float, nullable=False)
     skill_density = Column(Float, nullable=False)
@@ -111,6 +236,55 @@ class Match(Base):
     resume = relationship("Resume", back_populates="matches")
     job_description = relationship("JobDescription", back_populates="matches")
 
+class BatchJob(Base):
+    """Background batch job with persisted progress"""
+    __tablename__ = "batch_jobs"
+    
+    id = Column(String, primary_key=True, index=True)  # UUID
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)  # "batch_process" or "batch_match"
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed, cancelled
+    request = Column(Text)  # JSON string of the submitted request
+    total_items = Column(Integer, default=0)
+    processed_items = Column(Integer, default=0)
+    failed_items = Column(Integer, default=0)
+    cancel_requested = Column(Boolean, default=False)
+    owner = Column(String)  # "hostname:pid:token" of the server process running the job
+    heartbeat_at = Column(DateTime)  # Refreshed by the owner while the job is active
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    items = relationship("BatchJobItem", back_populates="job", cascade="all, delete-orphan")
+
+class BatchJobItem(Base):
+    """Outcome of one item of a batch job (partial results are readable while the job runs)"""
+    __tablename__ = "batch_job_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String, ForeignKey("batch_jobs.id"), nullable=False, index=True)
+    item = Column(String, nullable=False)  # File path or "resume <id> / jd <id>"
+    kind = Column(String, nullable=False)  # "resume", "jd" or "match"
+    status = Column(String, nullable=False)  # "succeeded" or "failed"
+    record_id = Column(Integer)  # ID of the created resume, job description or match
+    result = Column(Text)  # JSON string with a short result summary
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    job = relationship("BatchJob", back_populates="items")
+
+class OntologyVersion(Base):
+    """Snapshot of a skills ontology, kept so later versions can be diffed against it"""
+    __tablename__ = "ontology_versions"
+    
+    version = Column(String, primary_key=True)  # Content hash from skills.ontology_version
+    content = Column(Text, nullable=False)  # JSON string of the ontology
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class ProcessingStats(Base):
     """Model for storing processing statistics"""
     __tablename__ = "processing_stats"
@@ -0,0 +1,340 @@
+"""
+Embedding cache and storage helpers for Resume Screening AI
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_DISK_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_DISK_CACHE_MAX_ROWS", "500000"))  # 0: unbounded
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_for_embedding(text: str) -> str:
+    """
+    Normalize text before hashing it for the cache.
+    Only whitespace is collapsed: the tokenizer splits on it anyway, so texts
+    that differ in whitespace alone produce the same embedding.
+    """
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Content-addressed cache key for a (model name, normalized text) pair"""
+    payload = f"{model_name}\x00{normalize_for_embedding(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk embedding tier, safe to share between processes.
+
+    Vectors are appended as float32 rows to a single file that is read through
+    a memory map; a companion text file maps each key to its row number.
+    Writers hold an exclusive ``flock`` on a lock file across the vector
+    append and the key line, so the row is taken from the file size under the
+    lock; readers pick up other processes' keys under a shared lock. Once the
+    store exceeds ``max_rows`` it is compacted to its newest half.
+    """
+
+    def __init__(self, directory: str, dimension: int, max_rows: int = EMBEDDING_DISK_CACHE_MAX_ROWS):
+        """
+        Open (or create) the store
+
+        Args:
+            directory: Directory holding the store files
+            dimension: Embedding dimension of the stored vectors
+            max_rows: Rows kept on disk before the oldest half is evicted (0: unbounded)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.max_rows = max_rows
+        self._row_bytes = dimension * np.dtype(np.float32).itemsize
+        self.vectors_path = self.directory / f"vectors_{dimension}.f32"
+        self.keys_path = self.directory / f"keys_{dimension}.txt"
+        self.lock_path = self.directory / f"lock_{dimension}"
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._file_id: Optional[tuple] = None  # Identity of the vectors file self._rows refers to
+        self._keys_offset = 0
+        with self._locked(shared=True):
+            self._refresh()
+        logger.info(f"Loaded {len(self._rows)} cached embeddings from {self.directory}")
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold the store's file lock (a no-op where ``fcntl`` is unavailable)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # Closing the descriptor releases the lock
+
+    def _refresh(self) -> None:
+        """
+        Catch up with the files under the lock: read key lines appended since the
+        last refresh (all of them if the files were compacted) and remap the vectors
+        """
+        try:
+            with open(self.vectors_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                file_id = (stat.st_dev, stat.st_ino)
+                available_rows = stat.st_size // self._row_bytes
+                self._mmap = np.memmap(f, dtype=np.float32, mode="r", shape=(available_rows, self.dimension)) \
+                    if available_rows else None
+        except FileNotFoundError:
+            file_id, available_rows, self._mmap = None, 0, None
+
+        if file_id != self._file_id:
+            self._rows, self._keys_offset, self._file_id = {}, 0, file_id
+        if not self.keys_path.exists():
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # Only complete lines; rows whose vector was never fully written are ignored
+        data = data[:data.rfind(b"\n") + 1]
+        self._keys_offset += len(data)
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit() and int(parts[1]) < available_rows:
+                self._rows[parts[0]] = int(parts[1])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a copy of the stored vector, or None if the key is unknown"""
+        row = self._rows.get(key)
+        if row is None or self._mmap is None or row >= self._mmap.shape[0]:
+            # Possibly written (or the files compacted) by another process since the last refresh
+            with self._locked(shared=True):
+                self._refresh()
+            row = self._rows.get(key)
+            if row is None:
+                return None
+        return np.array(self._mmap[row])
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Append a vector to the store"""
+        data = np.asarray(vector, dtype=np.float32).reshape(self.dimension).tobytes()
+        with self._locked():
+            self._refresh()
+            if key in self._rows:
+                return
+            fd = os.open(self.vectors_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # No other writer can append while the lock is held, so the size is our offset
+                size = os.fstat(fd).st_size
+                if size % self._row_bytes:
+                    # Drop a torn row left by a writer that died mid-append
+                    os.ftruncate(fd, size - size % self._row_bytes)
+                    size -= size % self._row_bytes
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            row = size // self._row_bytes
+            with open(self.keys_path, "a", encoding="utf-8") as f:
+                f.write(f"{key} {row}\n")
+            self._rows[key] = row
+            if self.max_rows and row + 1 > self.max_rows:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Keep the newest ``max_rows // 2`` vectors (call with the exclusive lock held)"""
+        self._refresh()
+        keep = sorted(self._rows.items(), key=lambda item: item[1])[-max(1, self.max_rows // 2):]
+        vectors_tmp = self.vectors_path.with_suffix(".tmp")
+        keys_tmp = self.keys_path.with_suffix(".tmp")
+        with open(vectors_tmp, "wb") as f:
+            for _, row in keep:
+                f.write(np.asarray(self._mmap[row], dtype=np.float32).tobytes())
+        with open(keys_tmp, "w", encoding="utf-8") as f:
+            for new_row, (key, _) in enumerate(keep):
+                f.write(f"{key} {new_row}\n")
+        # Readers only look at the pair under the lock, so the two renames appear atomic
+        os.replace(keys_tmp, self.keys_path)
+        os.replace(vectors_tmp, self.vectors_path)
+        self._refresh()
+        logger.info(f"Compacted the on-disk embedding cache to {len(self._rows)} vectors")
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by a hash of (model name, normalized text):
+    a bounded in-memory LRU in front of an optional persistent DiskEmbeddingStore.
+    """
+
+    def __init__(self, model_name: str, dimension: int, max_items: int = EMBEDDING_CACHE_SIZE,
+                 cache_dir: Optional[str] = EMBEDDING_CACHE_DIR):
+        """
+        Initialize the cache
+
+        Args:
+            model_name: Name of the model producing the embeddings
+            dimension: Embedding dimension
+            max_items: Maximum number of vectors kept in memory
+            cache_dir: Root directory of the on-disk tier (None disables it)
+        """
+        self.model_name = model_name
+        self.max_items = max_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._disk: Optional[DiskEmbeddingStore] = None
+        if cache_dir:
+            try:
+                model_dir = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+                self._disk = DiskEmbeddingStore(os.path.join(cache_dir, model_dir), dimension)
+            except OSError as e:
+                logger.warning(f"On-disk embedding cache disabled: {e}")
+
+    def key(self, text: str) -> str:
+        """Cache key of a text for this cache's model"""
+        return embedding_key(self.model_name, text)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a vector, promoting disk hits into the memory tier
+
+        Args:
+            key: Key from ``key()``
+
+        Returns:
+            Cached vector or None
+        """
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+
+            if self._disk is not None:
+                vector = self._disk.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector in both tiers"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is not None:
+                try:
+                    self._disk.put(key, vector)
+                except OSError as e:
+                    logger.error(f"Error writing embedding to disk cache: {e}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss counters and tier sizes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "memory_capacity": self.max_items,
+                "disk_items": len(self._disk) if self._disk is not None else 0
+            }
+
+def serialize_embedding(vector: np.ndarray, dtype=np.float32) -> bytes:
+    """
+    Pack an embedding into a compact binary blob for database storage
+
+    Args:
+        vector: Embedding vector
+        dtype: Storage precision (float32 or float16)
+
+    Returns:
+        Raw little-endian bytes of the vector
+    """
+    return np.asarray(vector, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+def deserialize_embedding(blob: bytes, dimension: int) -> np.ndarray:
+    """
+    Unpack an embedding blob; the storage precision is inferred from its size
+
+    Args:
+        blob: Bytes produced by ``serialize_embedding``
+        dimension: Embedding dimension
+
+    Returns:
+        float32 vector of length ``dimension``
+    """
+    itemsize = len(blob) // dimension if dimension else 0
+    if itemsize not in (2, 4) or itemsize * dimension != len(blob):
+        raise ValueError(f"Embedding blob of {len(blob)} bytes does not match dimension {dimension}")
+    dtype = np.dtype("<f2") if itemsize == 2 else np.dtype("<f4")
+    return np.frombuffer(blob, dtype=dtype).astype(np.float32)
+
+def store_embedding(record, vector: np.ndarray, model_name: str) -> None:
+    """Attach an embedding to a database record with embedding columns"""
+    vector = np.asarray(vector, dtype=np.float32)
+    record.embedding = serialize_embedding(vector)
+    record.embedding_model = model_name
+    record.embedding_dim = int(vector.shape[0])
+
+def load_embedding(record, model_name: str) -> Optional[np.ndarray]:
+    """
+    Read the stored embedding of a database record
+
+    Args:
+        record: Database record with embedding columns
+        model_name: Model (embedding signature, when documents are chunked) the caller scores with
+
+    Returns:
+        The vector, or None if it is missing or was produced by another model or chunking
+    """
+    if record.embedding is None or record.embedding_model != model_name or not record.embedding_dim:
+        return None
+    try:
+        return deserialize_embedding(record.embedding, record.embedding_dim)
+    except ValueError as e:
+        logger.warning(f"Ignoring stored embedding: {e}")
+        return None
@@ -0,0 +1,321 @@
+"""
+Background batch jobs with persisted progress for Resume Screening AI
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from .database import SessionLocal, BatchJob, BatchJobItem
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Job configuration
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "1.0"))  # Seconds between progress commits
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "256"))  # Resumes scored per similarity matrix in match jobs
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))  # Seconds between owner heartbeats
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "60"))  # Seconds without a heartbeat before a job is orphaned
+
+ACTIVE_STATUSES = ("pending", "running")
+
+class JobCancelled(Exception):
+    """Raised inside a job runner once cancellation was requested"""
+
+class JobLost(Exception):
+    """Raised inside a job runner once another process declared the job failed"""
+
+class JobContext:
+    """
+    Handle given to a job runner.
+
+    It records item outcomes and commits them (with the progress counters) at
+    most every ``JOB_PROGRESS_INTERVAL`` seconds, and tells the runner when the
+    job was cancelled.
+    """
+
+    def __init__(self, db, job: BatchJob, progress_interval: float = JOB_PROGRESS_INTERVAL):
+        self.db = db
+        self.job = job
+        self.user_id = job.user_id
+        self.progress_interval = progress_interval
+        self._last_commit = time.monotonic()
+
+    def add_total(self, count: int) -> None:
+        """Announce more items (jobs may discover work as they go)"""
+        self.job.total_items = (self.job.total_items or 0) + count
+
+    def succeeded(self, item: str, kind: str, record_id: Optional[int] = None, result: Optional[Dict] = None) -> None:
+        """Record a finished item"""
+        self.db.add(BatchJobItem(
+            job_id=self.job.id, item=item, kind=kind, status="succeeded",
+            record_id=record_id, result=json.dumps(result) if result is not None else None
+        ))
+        self.job.processed_items = (self.job.processed_items or 0) + 1
+
+    def failed(self, item: str, kind: str, error: str) -> None:
+        """Record a failed item"""
+        self.db.add(BatchJobItem(job_id=self.job.id, item=item, kind=kind, status="failed", error=error))
+        self.job.processed_items = (self.job.processed_items or 0) + 1
+        self.job.failed_items = (self.job.failed_items or 0) + 1
+
+    def progress(self, processed: int, failed: int = 0) -> None:
+        """Count finished items without recording them individually (for very large jobs)"""
+        self.job.processed_items = (self.job.processed_items or 0) + processed
+        self.job.failed_items = (self.job.failed_items or 0) + failed
+
+    def checkpoint(self, force: bool = False) -> None:
+        """
+        Commit pending work and progress if the progress interval elapsed
+
+        Raises:
+            JobCancelled: If cancellation was requested
+            JobLost: If the job was recovered as failed by another process
+        """
+        if not force and time.monotonic() - self._last_commit < self.progress_interval:
+            return
+        self.db.commit()
+        self._last_commit = time.monotonic()
+        # Cancellation and recovery happen in other sessions; read the committed state
+        self.db.refresh(self.job, attribute_names=["cancel_requested", "status"])
+        if self.job.status != "running":
+            raise JobLost()
+        if self.job.cancel_requested:
+            raise JobCancelled()
+
+class JobManager:
+    """
+    Runs batch jobs on a small thread pool.
+
+    Runners are registered per job kind and called as ``runner(ctx, request)``
+    with a JobContext and the decoded request; everything they commit through
+    ``ctx.db`` is visible to ``/jobs/{id}`` while the job runs.
+
+    Every job records the server process that owns it, and the owner keeps
+    refreshing the job's heartbeat. Several server processes (e.g. gunicorn
+    workers) can share the database: recovery only fails jobs whose owner
+    has exited or stopped sending heartbeats.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, session_factory: Callable = SessionLocal,
+                 heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL, stale_after: float = JOB_STALE_AFTER):
+        """
+        Initialize the manager
+
+        Args:
+            max_workers: Number of jobs running at the same time
+            session_factory: Callable returning a new database session
+            heartbeat_interval: Seconds between heartbeats of the owned jobs
+            stale_after: Seconds without a heartbeat after which a job counts as orphaned
+        """
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._runners: Dict[str, Callable] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._owner: Optional[str] = None
+        self._owner_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @property
+    def owner(self) -> str:
+        """
+        Identity of this server process, as "hostname:pid:token"
+
+        Computed per process, since the manager may be created before gunicorn
+        forks its workers; the random token tells a restarted process apart
+        from an earlier one that had the same PID.
+        """
+        if self._owner_pid != os.getpid():
+            self._owner_pid = os.getpid()
+            self._owner = f"{socket.gethostname()}:{self._owner_pid}:{uuid.uuid4().hex[:8]}"
+        return self._owner
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The job thread pool, created lazily"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-job")
+        return self._executor
+
+    def register(self, kind: str, runner: Callable) -> None:
+        """Register the runner for a job kind"""
+        self._runners[kind] = runner
+
+    def submit(self, db, user_id: int, kind: str, request: Dict) -> BatchJob:
+        """
+        Persist a new job and queue it
+
+        Args:
+            db: Database session of the caller
+            user_id: Owner of the job
+            kind: Registered job kind
+            request: JSON-serializable job request
+
+        Returns:
+            The pending job row
+        """
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = BatchJob(
+            id=str(uuid.uuid4()), user_id=user_id, kind=kind, status="pending", request=json.dumps(request),
+            owner=self.owner, heartbeat_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self.executor.submit(self._run, job.id)
+        logger.info(f"Queued {kind} job {job.id} for user {user_id}")
+        return job
+
+    def cancel(self, db, job: BatchJob) -> BatchJob:
+        """Request cancellation; pending jobs are cancelled immediately"""
+        if job.status in ACTIVE_STATUSES:
+            job.cancel_requested = True
+            if job.status == "pending":
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            db.commit()
+            db.refresh(job)
+        return job
+
+    def start(self) -> None:
+        """Fail orphaned jobs and start refreshing the heartbeats of this process's jobs"""
+        self.recover()
+        if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+            self._stop.clear()
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="batch-job-heartbeat", daemon=True)
+            self._heartbeat_thread.start()
+
+    def heartbeat(self) -> int:
+        """
+        Refresh the heartbeat of the active jobs owned by this process
+
+        Returns:
+            Number of refreshed jobs
+        """
+        db = self.session_factory()
+        try:
+            refreshed = db.query(BatchJob).filter(
+                BatchJob.owner == self.owner, BatchJob.status.in_(ACTIVE_STATUSES)
+            ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            return refreshed
+        finally:
+            db.close()
+
+    def _owner_gone(self, job: BatchJob, now: datetime) -> bool:
+        """Whether the process owning an active job has exited or stopped sending heartbeats"""
+        if job.owner == self.owner:
+            return False
+        if job.owner is None or job.heartbeat_at is None:
+            return True
+        if job.heartbeat_at < now - timedelta(seconds=self.stale_after):
+            return True
+
+        host, _, rest = job.owner.partition(":")
+        pid = rest.partition(":")[0]
+        if host != socket.gethostname() or not pid.isdigit():
+            return False
+        if int(pid) == os.getpid():
+            return True  # An earlier process with this PID
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def recover(self) -> int:
+        """
+        Mark jobs whose owning server process is gone as failed
+
+        Jobs of other live processes sharing the database are left alone.
+
+        Returns:
+            Number of interrupted jobs
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            active = db.query(BatchJob).filter(BatchJob.status.in_(ACTIVE_STATUSES)).all()
+            interrupted = [job for job in active if self._owner_gone(job, now)]
+            for job in interrupted:
+                job.status = "failed"
+                job.error = "Interrupted by a server restart"
+                job.finished_at = now
+            db.commit()
+            if interrupted:
+                logger.warning(f"Marked {len(interrupted)} interrupted batch jobs as failed")
+            return len(interrupted)
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self) -> None:
+        """Refresh heartbeats and fail jobs orphaned by exited processes until shutdown"""
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+                self.recover()
+            except Exception as e:
+                logger.error(f"Batch job heartbeat failed: {e}")
+
+    def _run(self, job_id: str) -> None:
+        """Execute one job in a worker thread with its own session"""
+        db = self.session_factory()
+        try:
+            # Claim the job atomically so a concurrent cancel of a pending job wins
+            claimed = db.query(BatchJob).filter(BatchJob.id == job_id, BatchJob.status == "pending").update(
+                {"status": "running", "started_at": datetime.utcnow(), "owner": self.owner,
+                 "heartbeat_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+            if not claimed:
+                return
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).one()
+
+            ctx = JobContext(db, job)
+            try:
+                self._runners[job.kind](ctx, json.loads(job.request or "{}"))
+                job.status = "completed"
+            except JobCancelled:
+                job.status = "cancelled"
+                logger.info(f"Job {job_id} cancelled after {job.processed_items} items")
+            except JobLost:
+                # Another process already reported the job failed; leave its row alone
+                logger.warning(f"Job {job_id} was recovered as failed by another process, stopping it")
+                db.rollback()
+                return
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                db.rollback()
+                job.status = "failed"
+                job.error = str(e)
+
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error running job {job_id}: {e}")
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones"""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,9 +1,14 @@
 import numpy as np
 import logging
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
 from typing import List, Tuple, Optional
 from .models import Resume, JobDescription, MatchResult
+from .embeddings import EmbeddingCache, EMBEDDING_CACHE_DIR
+from .batching import EmbeddingBatcher
+from .chunking import (
+    chunk_document, pool_embeddings, tokenizer_spans, POOLING_MODES,
+    EMBEDDING_CHUNK_OVERLAP, EMBEDDING_MAX_CHUNKS
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,20 +18,110 @@ class ResumeMatcher:
     Advanced resume-job description matching system
     """
     
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 64,
+                 cache_dir: Optional[str] = EMBEDDING_CACHE_DIR, lazy: bool = False, batch_wait_ms: float = 0.0,
+                 pooling: str = "none", chunk_tokens: int = 0, chunk_overlap: int = EMBEDDING_CHUNK_OVERLAP,
+                 max_chunks: int = EMBEDDING_MAX_CHUNKS):
         """
         Initialize the resume matcher
         
         Args:
             model_name: Name of the sentence transformer model to use
+            batch_size: Number of texts encoded per forward pass when embedding in bulk
+            cache_dir: Directory of the persistent embedding cache (None keeps it in memory only)
+            lazy: Defer loading the model until it is first used (or ``load()`` is called)
+            batch_wait_ms: When positive, small encode calls from concurrent threads are
+                collected for up to this long and run as one forward pass of up to ``batch_size`` texts
+            pooling: "none" encodes whole texts (the model truncates them at ``max_seq_length``);
+                "mean", "max" or "section" (section-weighted mean) pool the embeddings of token windows
+            chunk_tokens: Tokens per window (0 uses the model's ``max_seq_length``)
+            chunk_overlap: Tokens shared by consecutive windows
+            max_chunks: Maximum windows per document
         """
-        try:
-            logger.info(f"Initializing ResumeMatcher with model: {model_name}")
-            self.model = SentenceTransformer(model_name)
-            logger.info("ResumeMatcher initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize ResumeMatcher: {e}")
-            raise
+        if pooling not in POOLING_MODES:
+            raise ValueError(f"Unknown pooling mode: {pooling} (expected one of {', '.join(POOLING_MODES)})")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.pooling = pooling
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.max_chunks = max_chunks
+        self.load_error: Optional[str] = None
+        self._model = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._load_lock = threading.Lock()
+        self.batcher = EmbeddingBatcher(self._encode_now, batch_size, batch_wait_ms) if batch_wait_ms > 0 else None
+        if not lazy:
+            self.load()
+    
+    def load(self) -> "ResumeMatcher":
+        """
+        Load the sentence transformer model and embedding cache, once
+        
+        Safe to call from several threads; callers arriving while the model
+        loads wait for it. A failed load is retried on the next call.
+        
+        Returns:
+            The matcher itself
+        """
+        if self._model is not None:
+            return self
+        with self._load_lock:
+            if self._model is None:
+                try:
+                    logger.info(f"Initializing ResumeMatcher with model: {self.model_name}")
+                    # Imported here: sentence-transformers pulls in torch, which takes seconds
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(self.model_name)
+                    self._embedding_cache = EmbeddingCache(
+                        self.model_name, model.get_sentence_embedding_dimension(), cache_dir=self.cache_dir
+                    )
+                    self._model = model
+                    self.load_error = None
+                    logger.info("ResumeMatcher initialized successfully")
+                except Exception as e:
+                    self.load_error = str(e)
+                    logger.error(f"Failed to initialize ResumeMatcher: {e}")
+                    raise
+        return self
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model is loaded and ready to encode"""
+        return self._model is not None
+    
+    @property
+    def model(self):
+        """The sentence transformer model, loaded on first access"""
+        return self.load()._model
+    
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        """The embedding cache, created with the model"""
+        return self.load()._embedding_cache
+    
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension of the model"""
+        return self.model.get_sentence_embedding_dimension()
+    
+    @property
+    def embedding_signature(self) -> str:
+        """
+        Identifies how document embeddings are produced (model and chunking settings).
+        Stored embeddings with another signature are stale and get re-encoded.
+        """
+        if self.pooling == "none":
+            return self.model_name
+        tokens = self.chunk_tokens or "auto"
+        return f"{self.model_name}|{self.pooling}:{tokens}/{self.chunk_overlap}x{self.max_chunks}"
+    
+    def _window_tokens(self) -> int:
+        """Tokens per chunk, leaving room for the model's special tokens"""
+        if self.chunk_tokens:
+            return self.chunk_tokens
+        return max(16, int(getattr(self.model, "max_seq_length", 256) or 256) - 2)
     
     def _safe_get_experience(self, resume: Resume) -> float:
         """
@@ -92,15 +187,137 @@ class ResumeMatcher:
         try:
             if not text1.strip() or not text2.strip():
                 return 0.0
-                
-            embeddings = self.model.encode([text1, text2], normalize_embeddings=True)
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+            
+            # Embeddings are normalized, so cosine similarity is a dot product
+            embeddings = self.encode_texts([text1, text2])
+            similarity = np.dot(embeddings[0], embeddings[1])
             return float(similarity)
             
         except Exception as e:
             logger.error(f"Error calculating semantic similarity: {e}")
             return 0.0
     
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into L2-normalized embeddings, serving repeats from the cache
+        
+        Only texts missing from the embedding cache reach the model, and those
+        are encoded together in large batches. With chunked pooling, every text
+        is split into token windows, the windows of all texts are encoded
+        together (each window cached on its own) and pooled per text.
+        
+        Args:
+            texts: Texts to encode
+            
+        Returns:
+            float32 array of shape (len(texts), embedding_dimension)
+        """
+        if self.pooling != "none":
+            return self._encode_pooled(texts)
+        return self._encode_cached(texts)
+    
+    def _encode_pooled(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as pooled embeddings of their token windows"""
+        spans_fn = tokenizer_spans(getattr(self.model, "tokenizer", None))
+        window = self._window_tokens()
+        documents = [
+            chunk_document(text, window, self.chunk_overlap, self.max_chunks, spans_fn,
+                           by_section=self.pooling == "section")
+            for text in texts
+        ]
+        
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        chunk_texts = [chunk for chunks in documents for chunk, _ in chunks]
+        if not chunk_texts:
+            return embeddings
+        
+        chunk_embeddings = self._encode_cached(chunk_texts)
+        start = 0
+        for i, chunks in enumerate(documents):
+            if chunks:
+                embeddings[i] = pool_embeddings(
+                    chunk_embeddings[start:start + len(chunks)], [weight for _, weight in chunks], self.pooling
+                )
+            start += len(chunks)
+        return embeddings
+    
+    def _encode_cached(self, texts: List[str]) -> np.ndarray:
+        """Encode whole texts, serving repeats from the embedding cache"""
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        
+        # Group positions by cache key so duplicate texts are encoded once
+        missing = {}
+        for i, text in enumerate(texts):
+            key = self.embedding_cache.key(text)
+            cached = self.embedding_cache.get(key) if key not in missing else None
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                embeddings[i] = cached
+        
+        if missing:
+            keys = list(missing)
+            encoded = self._encode([texts[missing[key][0]] for key in keys])
+            for key, vector in zip(keys, encoded):
+                self.embedding_cache.put(key, vector)
+                embeddings[missing[key]] = vector
+        
+        return embeddings
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the model on texts, sharing forward passes with concurrent callers when micro-batching"""
+        if self.batcher is not None:
+            return self.batcher.encode(texts)
+        return self._encode_now(texts)
+    
+    def _encode_now(self, texts: List[str]) -> np.ndarray:
+        """Run the model on texts in batches of ``batch_size``"""
+        embeddings = self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def encode_document(self, text: str) -> Optional[np.ndarray]:
+        """
+        Encode a single document for storage
+        
+        Args:
+            text: Document text
+            
+        Returns:
+            Normalized embedding, or None for empty text (which never scores above 0)
+        """
+        if not text or not text.strip():
+            return None
+        return self.encode_texts([text])[0]
+    
+    def calculate_similarities(self, query_text: str, texts: List[str]) -> np.ndarray:
+        """
+        Calculate semantic similarity of one query text against many texts
+        
+        The query is encoded once, the texts are encoded in batches and all
+        scores come from a single matrix-vector product of normalized embeddings.
+        
+        Args:
+            query_text: Text to compare against (e.g. a job description)
+            texts: Texts to score (e.g. resumes)
+            
+        Returns:
+            Array of similarity scores aligned with ``texts`` (0.0 for empty texts)
+        """
+        similarities = np.zeros(len(texts), dtype=np.float32)
+        if not query_text or not query_text.strip():
+            return similarities
+        
+        non_empty = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not non_empty:
+            return similarities
+        
+        query_embedding = self.encode_texts([query_text])[0]
+        embeddings = self.encode_texts([texts[i] for i in non_empty])
+        similarities[non_empty] = embeddings @ query_embedding
+        return similarities
+    
     def calculate_skill_coverage(self, resume_skills: List[str], jd_skills: List[str]) -> float:
         """
         Calculate what percentage of JD skills are covered by resume skills
@@ -158,13 +375,22 @@ class ResumeMatcher:
             logger.error(f"Error calculating skill density: {e}")
             return 0.0
     
-    def match_resume_to_jd(self, resume: Resume, jd: JobDescription) -> MatchResult:
+    @staticmethod
+    def _safe_get_text(obj) -> str:
+        """Get the raw text of a resume or job description, or an empty string"""
+        return obj.raw_text if hasattr(obj, 'raw_text') and obj.raw_text else ""
+    
+    def match_resume_to_jd(self, resume: Resume, jd: JobDescription,
+                           resume_embedding: Optional[np.ndarray] = None,
+                           jd_embedding: Optional[np.ndarray] = None) -> MatchResult:
         """
         Match a resume to a job description and return comprehensive results
         
         Args:
             resume: Processed resume object
             jd: Processed job description object
+            resume_embedding: Optional stored embedding of the resume
+            jd_embedding: Optional stored embedding of the job description
             
         Returns:
             MatchResult with comprehensive matching analysis
@@ -172,52 +398,76 @@ class ResumeMatcher:
         try:
             logger.info("Starting resume-JD matching process")
             
-            # Safely get skills
-            resume_skills = self._safe_get_skills(resume)
-            jd_skills = self._safe_get_skills(jd)
-            
-            # Calculate semantic similarity
-            similarity_score = self.calculate_semantic_similarity(
-                resume.raw_text if hasattr(resume, 'raw_text') and resume.raw_text else "",
-                jd.raw_text if hasattr(jd, 'raw_text') and jd.raw_text else ""
-            )
-            
-            # Calculate skill coverage
-            skill_coverage = self.calculate_skill_coverage(resume_skills, jd_skills)
-            
-            # Calculate skill density
-            skill_density = self.calculate_skill_density(resume_skills, jd_skills)
-            
-            # Identify matching and missing skills
-            resume_skills_set = set(resume_skills) if resume_skills else set()
-            jd_skills_set = set(jd_skills) if jd_skills else set()
+            # Calculate semantic similarity, reusing stored embeddings when both are available
+            if resume_embedding is not None and jd_embedding is not None:
+                similarity_score = float(np.dot(resume_embedding, jd_embedding))
+            else:
+                similarity_score = self.calculate_semantic_similarity(
+                    self._safe_get_text(resume),
+                    self._safe_get_text(jd)
+                )
             
-            matching_skills = list(resume_skills_set & jd_skills_set)
-            missing_skills = list(jd_skills_set - resume_skills_set)
+            result = self._build_match_result(resume, jd, similarity_score)
             
-            # Generate explanation
-            explanation = self._generate_explanation(
-                similarity_score, skill_coverage, skill_density,
-                matching_skills, missing_skills
-            )
-            
-            logger.info(f"Matching completed. Similarity: {similarity_score:.3f}, Coverage: {skill_coverage:.3f}")
-            
-            return MatchResult(
-                resume=resume,
-                job_description=jd,
-                similarity_score=similarity_score,
-                skill_coverage=skill_coverage,
-                skill_density=skill_density,
-                matching_skills=matching_skills,
-                missing_skills=missing_skills,
-                explanation=explanation
-            )
+            logger.info(f"Matching completed. Similarity: {result.similarity_score:.3f}, Coverage: {result.skill_coverage:.3f}")
+            return result
             
         except Exception as e:
             logger.error(f"Error in resume-JD matching: {e}")
             raise
     
+    def _build_match_result(self, resume: Resume, jd: JobDescription, similarity_score: float,
+                            skill_coverage: Optional[float] = None,
+                            skill_density: Optional[float] = None) -> MatchResult:
+        """
+        Combine a precomputed semantic similarity with the skill analysis
+        
+        Args:
+            resume: Processed resume object
+            jd: Processed job description object
+            similarity_score: Semantic similarity between the two documents
+            skill_coverage: Optional precomputed skill coverage
+            skill_density: Optional precomputed skill density
+            
+        Returns:
+            MatchResult with comprehensive matching analysis
+        """
+        # Safely get skills
+        resume_skills = self._safe_get_skills(resume)
+        jd_skills = self._safe_get_skills(jd)
+        
+        # Calculate skill coverage
+        if skill_coverage is None:
+            skill_coverage = self.calculate_skill_coverage(resume_skills, jd_skills)
+        
+        # Calculate skill density
+        if skill_density is None:
+            skill_density = self.calculate_skill_density(resume_skills, jd_skills)
+        
+        # Identify matching and missing skills
+        resume_skills_set = set(resume_skills) if resume_skills else set()
+        jd_skills_set = set(jd_skills) if jd_skills else set()
+        
+        matching_skills = list(resume_skills_set & jd_skills_set)
+        missing_skills = list(jd_skills_set - resume_skills_set)
+        
+        # Generate explanation
+        explanation = self._generate_explanation(
+            similarity_score, skill_coverage, skill_density,
+            matching_skills, missing_skills
+        )
+        
+        return MatchResult(
+            resume=resume,
+            job_description=jd,
+            similarity_score=similarity_score,
+            skill_coverage=skill_coverage,
+            skill_density=skill_density,
+            matching_skills=matching_skills,
+            missing_skills=missing_skills,
+            explanation=explanation
+        )
+    
     def _generate_explanation(self, similarity: float, coverage: float, density: float,
                             matching: List[str], missing: List[str]) -> str:
         """
@@ -292,9 +542,15 @@ class ResumeMatcher:
             if not weights:
                 weights = {'skill_coverage': 0.4, 'similarity': 0.4, 'density': 0.2}
             
+            # Encode the JD once and all resumes in batches, then score with one matrix-vector product
+            similarities = self.calculate_similarities(
+                self._safe_get_text(jd),
+                [self._safe_get_text(resume) for resume in resumes]
+            )
+            
             results = []
-            for resume in resumes:
-                match_result = self.match_resume_to_jd(resume, jd)
+            for resume, similarity_score in zip(resumes, similarities):
+                match_result = self._build_match_result(resume, jd, float(similarity_score))
                 
                 # Safely get skills for density calculation
                 resume_skills = self._safe_get_skills(resume)
@@ -320,6 +576,91 @@ class ResumeMatcher:
             logger.error(f"Error ranking resumes: {e}")
             raise
     
+    def _embedding_matrix(self, documents: list, embeddings: Optional[List[Optional[np.ndarray]]]) -> np.ndarray:
+        """
+        Stack document embeddings, encoding in one batch those that were not supplied
+        
+        Documents with empty text get a zero vector so they score 0 against everything.
+        """
+        matrix = np.zeros((len(documents), self.dimension), dtype=np.float32)
+        missing = []
+        for i, document in enumerate(documents):
+            vector = embeddings[i] if embeddings is not None else None
+            if vector is not None:
+                matrix[i] = vector
+            elif self._safe_get_text(document).strip():
+                missing.append(i)
+        if missing:
+            matrix[missing] = self.encode_texts([self._safe_get_text(documents[i]) for i in missing])
+        return matrix
+    
+    def cross_match(self, resumes: List[Resume], jds: List[JobDescription],
+                    resume_embeddings: Optional[List[Optional[np.ndarray]]] = None,
+                    jd_embeddings: Optional[List[Optional[np.ndarray]]] = None,
+                    pairs: Optional[np.ndarray] = None) -> List[List[Optional[MatchResult]]]:
+        """
+        Match every resume against every job description
+        
+        Each document is embedded at most once, all similarities come from one
+        resume x JD matrix product, and skill coverage and density for all pairs
+        come from one product of binary skill-membership matrices.
+        
+        Args:
+            resumes: Processed resumes
+            jds: Processed job descriptions
+            resume_embeddings: Optional stored embeddings aligned with ``resumes`` (None entries are encoded)
+            jd_embeddings: Optional stored embeddings aligned with ``jds`` (None entries are encoded)
+            pairs: Optional boolean [resume][jd] mask of the pairs to build results for
+            
+        Returns:
+            Matrix of MatchResults indexed [resume][jd]; None where a pair could not be scored or is masked out
+        """
+        try:
+            logger.info(f"Cross-matching {len(resumes)} resumes against {len(jds)} job descriptions")
+            
+            similarities = self._embedding_matrix(resumes, resume_embeddings) @ self._embedding_matrix(jds, jd_embeddings).T
+            
+            # Binary skill membership over the union of all skills
+            resume_skill_sets = [set(self._safe_get_skills(resume)) for resume in resumes]
+            jd_skill_sets = [set(self._safe_get_skills(jd)) for jd in jds]
+            vocabulary = {skill: i for i, skill in enumerate(set().union(*resume_skill_sets, *jd_skill_sets))}
+            resume_matrix = np.zeros((len(resumes), len(vocabulary)), dtype=np.float64)
+            jd_matrix = np.zeros((len(jds), len(vocabulary)), dtype=np.float64)
+            for i, skills in enumerate(resume_skill_sets):
+                resume_matrix[i, [vocabulary[skill] for skill in skills]] = 1.0
+            for j, skills in enumerate(jd_skill_sets):
+                jd_matrix[j, [vocabulary[skill] for skill in skills]] = 1.0
+            
+            overlap = resume_matrix @ jd_matrix.T
+            resume_counts = resume_matrix.sum(axis=1, keepdims=True)
+            jd_counts = jd_matrix.sum(axis=1, keepdims=True).T
+            coverage = np.divide(overlap, jd_counts, out=np.zeros_like(overlap), where=jd_counts > 0)
+            density = np.divide(overlap, resume_counts, out=np.zeros_like(overlap), where=resume_counts > 0)
+            
+            results: List[List[Optional[MatchResult]]] = []
+            for i, resume in enumerate(resumes):
+                row = []
+                for j, jd in enumerate(jds):
+                    if pairs is not None and not pairs[i, j]:
+                        row.append(None)
+                        continue
+                    try:
+                        row.append(self._build_match_result(
+                            resume, jd, float(similarities[i, j]),
+                            skill_coverage=float(coverage[i, j]),
+                            skill_density=float(density[i, j])
+                        ))
+                    except Exception as e:
+                        logger.error(f"Error matching resume {i} to JD {j}: {e}")
+                        row.append(None)
+                results.append(row)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in cross-matching: {e}")
+            raise
+    
     def get_matching_stats(self) -> dict:
         """
         Get matching system statistics
@@ -329,6 +670,9 @@ class ResumeMatcher:
         """
         return {
             "model_name": str(self.model),
-            "embedding_dimension": self.model.get_sentence_embedding_dimension(),
-            "max_sequence_length": getattr(self.model, 'max_seq_length', 512)
+            "embedding_dimension": self.dimension,
+            "embedding_signature": self.embedding_signature,
+            "max_sequence_length": getattr(self.model, 'max_seq_length', 512),
+            "embedding_cache": self.embedding_cache.stats(),
+            "micro_batching": self.batcher.stats() if self.batcher is not None else None
         }
\ No newline at end of file
@@ -6,24 +6,26 @@ class Resume(BaseModel):
     """Structured resume data model"""
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
-    raw_text: str = Field(..., description="Raw text extracted from resume")
+    raw_text: Optional[str] = Field(None, description="Raw text extracted from resume (in API responses only with include_raw_text=true)")
     email: Optional[str] = Field(None, description="Extracted email address")
     phone: Optional[str] = Field(None, description="Extracted phone number")
     skills: List[str] = Field(default_factory=list, description="List of extracted skills")
     skills_by_category: Dict[str, List[str]] = Field(default_factory=dict, description="Skills grouped by category")
     experience: float = Field(0.0, description="Years of experience")  # Changed to float with default
     education: Optional[str] = Field(None, description="Extracted education information")
+    ontology_version: Optional[str] = Field(None, exclude=True, description="Ontology the skills were extracted with")
 
 class JobDescription(BaseModel):
     """Structured job description data model"""
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
-    raw_text: str = Field(..., description="Raw text extracted from job description")
+    raw_text: Optional[str] = Field(None, description="Raw text extracted from job description (in API responses only with include_raw_text=true)")
     required_skills: List[str] = Field(default_factory=list, description="Required skills for the position")
     preferred_skills: List[str] = Field(default_factory=list, description="Preferred skills for the position")
     skills_by_category: Dict[str, List[str]] = Field(default_factory=dict, description="Skills grouped by category")
     title: Optional[str] = Field(None, description="Job title")
     company: Optional[str] = Field(None, description="Company name")
+    ontology_version: Optional[str] = Field(None, exclude=True, description="Ontology the skills were extracted with")
     
     @property
     def skills(self) -> List[str]:
@@ -43,6 +45,24 @@ class MatchResult(BaseModel):
     missing_skills: List[str] = Field(default_factory=list, description="Skills required by JD but missing in resume")
     explanation: str = Field(default="", description="Human-readable explanation of the match results")
 
+class MatchSummary(BaseModel):
+    """Stored match without the document texts (expandable with ``expand=documents``)"""
+    id: int = Field(..., description="Match ID")
+    resume_id: int = Field(..., description="Resume ID")
+    job_description_id: int = Field(..., description="Job description ID")
+    resume_filename: Optional[str] = Field(None, description="Original resume filename")
+    jd_filename: Optional[str] = Field(None, description="Original job description filename")
+    jd_title: Optional[str] = Field(None, description="Job title")
+    similarity_score: float = Field(..., description="Semantic similarity score (0-1)")
+    skill_coverage: float = Field(..., description="Skill coverage percentage (0-1)")
+    skill_density: float = Field(..., description="Skill density score (0-1)")
+    matching_skills: List[str] = Field(default_factory=list, description="Skills that match between resume and JD")
+    missing_skills: List[str] = Field(default_factory=list, description="Skills required by JD but missing in resume")
+    explanation: str = Field(default="", description="Human-readable explanation of the match results")
+    created_at: Optional[datetime] = Field(None, description="When the match was computed")
+    resume: Optional[Resume] = Field(None, description="Resume data (only with expand=documents)")
+    job_description: Optional[JobDescription] = Field(None, description="Job description data (only with expand=documents)")
+
 # New models for Phase 1
 class UserCreate(BaseModel):
     """Model for user registration"""
@@ -77,11 +97,17 @@ class ResumeResponse(BaseModel):
     """Model for resume API response"""
     id: str = Field(..., description="Resume ID")
     data: Resume = Field(..., description="Resume data")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the uploaded file")
+    filename: Optional[str] = Field(None, description="Original filename")
+    created_at: Optional[datetime] = Field(None, description="When the resume was uploaded")
 
 class JDResponse(BaseModel):
     """Model for job description API response"""
     id: str = Field(..., description="Job description ID")
     data: JobDescription = Field(..., description="Job description data")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the uploaded file")
+    filename: Optional[str] = Field(None, description="Original filename")
+    created_at: Optional[datetime] = Field(None, description="When the job description was uploaded")
 
 class BatchProcessRequest(BaseModel):
     """Model for batch processing request"""
@@ -102,13 +128,90 @@ class BatchMatchRequest(BaseModel):
     resume_ids: List[int] = Field(..., description="List of resume IDs to match")
     jd_ids: List[int] = Field(..., description="List of job description IDs to match against")
     weights: Optional[Dict[str, float]] = Field(default=None, description="Optional weights for matching")
+    min_skill_coverage: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0,
+        description="Only score pairs whose resume has this share of the JD skills (default SKILL_PREFILTER_MIN_COVERAGE, 0 scores all)"
+    )
 
 class BatchMatchResponse(BaseModel):
     """Model for batch matching response"""
     matches: List[MatchResult] = Field(..., description="List of match results")
     total_matches: int = Field(..., description="Total number of matches performed")
+    skipped_pairs: int = Field(default=0, description="Pairs left unscored by the skill coverage prefilter")
     processing_time: float = Field(..., description="Total processing time in seconds")
 
+class ResumeSearchResult(BaseModel):
+    """Model for a single hit of a resume search"""
+    resume_id: int = Field(..., description="Resume ID")
+    filename: Optional[str] = Field(None, description="Original resume filename")
+    similarity_score: float = Field(..., ge=0.0, le=1.0, description="Semantic similarity score (0-1)")
+    skill_coverage: float = Field(..., ge=0.0, le=1.0, description="Skill coverage percentage (0-1)")
+    skill_density: float = Field(..., ge=0.0, le=1.0, description="Skill density score (0-1)")
+    matching_skills: List[str] = Field(default_factory=list, description="Skills that match between resume and JD")
+    missing_skills: List[str] = Field(default_factory=list, description="Skills required by JD but missing in resume")
+    explanation: str = Field(default="", description="Human-readable explanation of the match results")
+
+class ResumeSearchResponse(BaseModel):
+    """Model for top-k resume search response"""
+    jd_id: int = Field(..., description="Job description searched for")
+    results: List[ResumeSearchResult] = Field(..., description="Best matching resumes, best first")
+    total_candidates: int = Field(..., description="Number of indexed resumes (shortlisted ones with min_skill_coverage)")
+    approximate: bool = Field(..., description="Whether an approximate (IVF) index was used")
+    unindexed: int = Field(default=0, description="Resumes left out because they have no embedding for the current model yet")
+    search_time: float = Field(..., description="Search time in seconds")
+
+class SkillSearchHit(BaseModel):
+    """Model for a document matching a boolean skill query"""
+    id: int = Field(..., description="Resume or job description ID")
+    filename: Optional[str] = Field(None, description="Original filename")
+    title: Optional[str] = Field(None, description="Job title (job descriptions only)")
+    experience: Optional[float] = Field(None, description="Years of experience (resumes only)")
+    skills: List[str] = Field(default_factory=list, description="Skills of the resume or required skills of the job description")
+    created_at: Optional[datetime] = Field(None, description="When the document was uploaded")
+
+class SkillSearchResponse(BaseModel):
+    """Model for boolean skill query response"""
+    query: str = Field(..., description="Skill query as submitted")
+    kind: str = Field(..., description="Searched documents: resume or jd")
+    total: Optional[int] = Field(None, description="Number of matching documents (unless count=false)")
+    unknown_skills: List[str] = Field(default_factory=list, description="Query skills no document has")
+    results: List[SkillSearchHit] = Field(..., description="One page of matching documents")
+    search_time: float = Field(..., description="Search time in seconds")
+
+class FileProcessingResult(BaseModel):
+    """Model for the outcome of processing one file in a bulk import"""
+    file_path: str = Field(..., description="Processed file path")
+    resume: Optional[Resume] = Field(None, description="Processed resume, if successful")
+    error: Optional[str] = Field(None, description="Failure reason")
+    processing_time: float = Field(default=0.0, description="Processing time in seconds")
+
+class JobItemResult(BaseModel):
+    """Model for the outcome of one batch job item"""
+    item: str = Field(..., description="File path or resume/JD pair")
+    kind: str = Field(..., description="Item kind (resume, jd or match)")
+    status: str = Field(..., description="succeeded or failed")
+    record_id: Optional[int] = Field(None, description="ID of the created resume, job description or match")
+    result: Optional[Dict] = Field(None, description="Short result summary")
+    error: Optional[str] = Field(None, description="Failure reason")
+
+class JobResponse(BaseModel):
+    """Model for batch job status"""
+    job_id: str = Field(..., description="Job ID")
+    kind: str = Field(..., description="Job kind (batch_process or batch_match)")
+    status: str = Field(..., description="pending, running, completed, failed or cancelled")
+    total_items: int = Field(default=0, description="Number of items known so far")
+    processed_items: int = Field(default=0, description="Number of items finished (succeeded or failed)")
+    failed_items: int = Field(default=0, description="Number of failed items")
+    cancel_requested: bool = Field(default=False, description="Whether cancellation was requested")
+    error: Optional[str] = Field(None, description="Error that stopped the job")
+    created_at: Optional[datetime] = Field(None, description="Submission timestamp")
+    started_at: Optional[datetime] = Field(None, description="Start timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Completion timestamp")
+
+class JobStatusResponse(JobResponse):
+    """Model for batch job status with a page of item results"""
+    items: List[JobItemResult] = Field(default_factory=list, description="Item results (partial while running)")
+
 class ProcessingStats(BaseModel):
     """Model for processing statistics"""
     total_resumes_processed: int = Field(..., description="Total resumes processed")
@@ -117,6 +220,7 @@ class ProcessingStats(BaseModel):
     average_similarity_score: float = Field(..., description="Average similarity score")
     average_skill_coverage: float = Field(..., description="Average skill coverage")
     last_processed_at: Optional[datetime] = Field(None, description="Last processing timestamp")
+    ontology_version: Optional[str] = Field(None, description="Version of the loaded skills ontology")
 
 class ExportRequest(BaseModel):
     """Model for export request"""
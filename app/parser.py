@@ -1,9 +1,14 @@
 import re
+import zlib
 import logging
 import os
+import tempfile
+import threading
 from typing import Tuple, Optional
 from pathlib import Path
 
+from .uploads import hash_file
+
 try:
     from pdfminer.high_level import extract_text
     PDFMINER_AVAILABLE = True
@@ -36,6 +41,84 @@ PHONE_RE = re.compile(r"(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?){2}\d{4}")
 # Supported file types
 SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt', '.rtf'}
 
+# Bump whenever extraction output changes so cached texts are not reused
+PARSER_VERSION = "1"
+
+# Extracted-text cache for formats that are expensive to parse ("" disables it)
+PARSED_TEXT_CACHE_DIR = os.getenv("PARSED_TEXT_CACHE_DIR", "data/parsed_text_cache")
+CACHED_EXTENSIONS = {'.pdf', '.docx'}
+
+class ParsedTextCache:
+    """
+    Persistent cache of extracted document text.
+
+    Entries are zlib-compressed files keyed by the SHA-256 of the source file,
+    its extension, the DOCX backend in use and PARSER_VERSION, so reprocessing
+    a corpus (e.g. after an ontology change) skips PDF/DOCX parsing entirely.
+    Writes are atomic, so several worker processes can share the directory.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def key(self, content_hash: str, file_ext: str) -> str:
+        """Cache key of a file's content for the current parser"""
+        backend = "docx2txt" if DOCX2TXT_AVAILABLE else "python-docx"
+        return f"{content_hash}-{file_ext.lstrip('.')}-{backend}-v{PARSER_VERSION}"
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt.z"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text, or None"""
+        try:
+            with open(self._path(key), "rb") as f:
+                text = zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            text = None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring unreadable parsed-text cache entry {key}: {e}")
+            text = None
+        
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+    
+    def put(self, key: str, text: str) -> None:
+        """Store extracted text"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(text.encode("utf-8"), 6))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing parsed-text cache entry {key}: {e}")
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+parsed_text_cache = ParsedTextCache(PARSED_TEXT_CACHE_DIR) if PARSED_TEXT_CACHE_DIR else None
+
 def validate_file(file_path: str) -> None:
     """
     Validate file exists and has supported extension
@@ -47,12 +130,15 @@ def validate_file(file_path: str) -> None:
     if file_ext not in SUPPORTED_EXTENSIONS:
         raise ValueError(f"Unsupported file type: {file_ext}. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}")
 
-def text_from_file(path: str) -> str:
+def text_from_file(path: str, content_hash: Optional[str] = None) -> str:
     """
     Extract text from supported file types (PDF, DOCX, DOC, TXT, RTF)
     
+    PDF and DOCX results are cached by content hash (see ParsedTextCache).
+    
     Args:
         path: Path to the file
+        content_hash: SHA-256 of the file, if already known
         
     Returns:
         Extracted text content
@@ -65,7 +151,18 @@ def text_from_file(path: str) -> str:
     validate_file(path)
     
     file_ext = Path(path).suffix.lower()
+    if parsed_text_cache is None or file_ext not in CACHED_EXTENSIONS:
+        return _extract_text(path, file_ext)
     
+    key = parsed_text_cache.key(content_hash or hash_file(path), file_ext)
+    text = parsed_text_cache.get(key)
+    if text is None:
+        text = _extract_text(path, file_ext)
+        parsed_text_cache.put(key, text)
+    return text
+
+def _extract_text(path: str, file_ext: str) -> str:
+    """Run the extractor for a file type"""
     try:
         if file_ext == '.pdf':
             if not PDFMINER_AVAILABLE:
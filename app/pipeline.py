@@ -1,13 +1,22 @@
+import os
+import time
+import signal
+import threading
 import logging
-from typing import List, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Dict
 from pathlib import Path
-from .parser import text_from_file, extract_pii, extract_name
-from .skills import load_ontology, extract_skills, extract_skills_with_categories, get_skill_suggestions
-from .models import Resume, JobDescription
+from .parser import text_from_file, extract_pii, extract_name, parsed_text_cache
+from .skills import load_ontology, extract_skills, SkillMatcher, NormalizedDocument
+from .models import Resume, JobDescription, FileProcessingResult
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Per-file time limit for parallel ingestion (seconds, 0 disables it)
+FILE_PROCESSING_TIMEOUT = float(os.getenv("FILE_PROCESSING_TIMEOUT", "120"))
+
 class ProcessingPipeline:
     """
     Main pipeline for processing resumes and job descriptions
@@ -21,12 +30,73 @@ class ProcessingPipeline:
             ontology_path: Path to the skills ontology file
         """
         try:
-            self.ontology = load_ontology(ontology_path)
+            self.ontology_path = ontology_path
+            self._reload_lock = threading.Lock()
+            self._ontology_mtime = self._current_mtime()
+            # Compile once so every document is scanned in a single pass
+            self.skill_matcher = SkillMatcher(load_ontology(ontology_path))
             logger.info("ProcessingPipeline initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize ProcessingPipeline: {e}")
             raise
     
+    @property
+    def ontology(self) -> Dict[str, List[str]]:
+        """The currently loaded ontology"""
+        return self.skill_matcher.ontology
+    
+    @property
+    def ontology_version(self) -> str:
+        """Content hash of the currently loaded ontology"""
+        return self.skill_matcher.version
+    
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.ontology_path)
+        except OSError:
+            return None
+    
+    def reload_ontology(self) -> bool:
+        """
+        Load and compile the ontology file again, then swap it in atomically
+        
+        The new matcher is built before it replaces the old one, and documents
+        already being processed keep the matcher they started with. If the file
+        is invalid the current ontology stays in place.
+        
+        Returns:
+            True if the ontology content changed
+            
+        Raises:
+            Exception: If the ontology file cannot be loaded
+        """
+        with self._reload_lock:
+            mtime = self._current_mtime()
+            matcher = SkillMatcher(load_ontology(self.ontology_path))
+            self._ontology_mtime = mtime
+            if matcher.version == self.skill_matcher.version:
+                return False
+            previous = self.skill_matcher.version
+            self.skill_matcher = matcher
+            logger.info(f"Reloaded ontology: version {previous} -> {matcher.version}")
+            return True
+    
+    def reload_if_modified(self) -> bool:
+        """
+        Reload the ontology if its file changed on disk
+        
+        Returns:
+            True if the ontology content changed
+        """
+        if self._current_mtime() == self._ontology_mtime:
+            return False
+        try:
+            return self.reload_ontology()
+        except Exception as e:
+            logger.error(f"Keeping ontology version {self.ontology_version}, reload failed: {e}")
+            self._ontology_mtime = self._current_mtime()
+            return False
+    
     def extract_skills(self, text: str) -> List[str]:
         """
         Extract normalized skills from raw text using the loaded ontology
@@ -38,7 +108,7 @@ class ProcessingPipeline:
             List of extracted skills
         """
         try:
-            return extract_skills(text, self.ontology)
+            return extract_skills(text, self.skill_matcher)
         except Exception as e:
             logger.error(f"Error extracting skills: {e}")
             return []
@@ -87,12 +157,13 @@ class ProcessingPipeline:
             logger.error(f"Error extracting experience: {e}")
             return 0.0
     
-    def process_resume(self, file_path: str) -> Resume:
+    def process_resume(self, file_path: str, content_hash: Optional[str] = None) -> Resume:
         """
         Process a resume file and extract structured information
         
         Args:
             file_path: Path to the resume file
+            content_hash: SHA-256 of the file, if already known (keys the parsed-text cache)
             
         Returns:
             Processed Resume object
@@ -106,7 +177,7 @@ class ProcessingPipeline:
             logger.info(f"Processing resume: {file_path}")
             
             # Extract text
-            raw_text = text_from_file(file_path)
+            raw_text = text_from_file(file_path, content_hash)
             if not raw_text.strip():
                 raise ValueError("No text content found in the file")
             
@@ -116,15 +187,19 @@ class ProcessingPipeline:
             # Extract name (basic implementation)
             name = extract_name(raw_text)
             
-            # Extract skills
-            skills = extract_skills(raw_text, self.ontology)
-            skills_by_category = extract_skills_with_categories(raw_text, self.ontology)
+            # Extract skills (normalize and scan the document once for all extractors);
+            # keep one matcher for the whole document even if the ontology is reloaded meanwhile
+            skill_matcher = self.skill_matcher
+            document = NormalizedDocument(raw_text)
+            scan = skill_matcher.scan(document)
+            skills = scan.skills()
+            skills_by_category = scan.skills_by_category()
             
             # Extract experience - ADDED
             experience = self._extract_experience(raw_text)
             
             # Get skill suggestions
-            suggestions = get_skill_suggestions(raw_text, self.ontology)
+            suggestions = scan.suggestions()
             
             logger.info(f"Resume processed successfully. Found {len(skills)} skills, {experience} years experience")
             
@@ -135,7 +210,8 @@ class ProcessingPipeline:
                 skills=skills,
                 skills_by_category=skills_by_category,
                 experience=experience,
-                education=name  # Use name as education for now
+                education=name,  # Use name as education for now
+                ontology_version=skill_matcher.version
             )
             
         except Exception as e:
@@ -143,13 +219,15 @@ class ProcessingPipeline:
             raise
     
     def process_job_description(self, file_path: str, 
-                              required_skills: Optional[List[str]] = None) -> JobDescription:
+                              required_skills: Optional[List[str]] = None,
+                              content_hash: Optional[str] = None) -> JobDescription:
         """
         Process a job description file
         
         Args:
             file_path: Path to the job description file
             required_skills: Optional list of explicitly required skills
+            content_hash: SHA-256 of the file, if already known (keys the parsed-text cache)
             
         Returns:
             Processed JobDescription object
@@ -163,16 +241,18 @@ class ProcessingPipeline:
             logger.info(f"Processing job description: {file_path}")
             
             # Extract text
-            raw_text = text_from_file(file_path)
+            raw_text = text_from_file(file_path, content_hash)
             if not raw_text.strip():
                 raise ValueError("No text content found in the file")
             
             # Extract skills (treat all as required unless specified)
-            extracted_skills = extract_skills(raw_text, self.ontology)
+            skill_matcher = self.skill_matcher
+            scan = skill_matcher.scan(NormalizedDocument(raw_text))
+            extracted_skills = scan.skills()
             
             # Use provided required skills or extract from text
             final_required_skills = required_skills if required_skills else extracted_skills
-            skills_by_category = extract_skills_with_categories(raw_text, self.ontology)
+            skills_by_category = scan.skills_by_category()
             
             # Extract job title and company (basic implementation)
             title = self._extract_job_title(raw_text)
@@ -185,23 +265,33 @@ class ProcessingPipeline:
                 required_skills=final_required_skills,
                 skills_by_category=skills_by_category,
                 title=title,
-                company=company
+                company=company,
+                ontology_version=skill_matcher.version
             )
             
         except Exception as e:
             logger.error(f"Error processing job description {file_path}: {e}")
             raise
     
-    def process_multiple_resumes(self, file_paths: List[str]) -> List[Resume]:
+    def process_multiple_resumes(self, file_paths: List[str], parallel: bool = False,
+                                 max_workers: Optional[int] = None,
+                                 timeout: Optional[float] = None) -> List[Resume]:
         """
         Process multiple resume files
         
         Args:
             file_paths: List of file paths to process
+            parallel: Fan the files out across a process pool
+            max_workers: Number of worker processes (default: CPU count)
+            timeout: Per-file time limit in seconds for parallel mode
             
         Returns:
-            List of processed Resume objects
+            List of processed Resume objects, in input order
         """
+        if parallel:
+            results = self.process_resumes_parallel(file_paths, max_workers=max_workers, timeout=timeout)
+            return [result.resume for result in results if result.resume is not None]
+        
         resumes = []
         failed_files = []
         
@@ -219,6 +309,47 @@ class ProcessingPipeline:
         logger.info(f"Successfully processed {len(resumes)} out of {len(file_paths)} resumes")
         return resumes
     
+    def process_resumes_parallel(self, file_paths: List[str], max_workers: Optional[int] = None,
+                                 timeout: Optional[float] = None) -> List[FileProcessingResult]:
+        """
+        Process resume files on a process pool
+        
+        Each worker process loads the ontology once. A file that takes longer
+        than ``timeout`` seconds is abandoned by its worker, which then moves on
+        to the next file.
+        
+        Args:
+            file_paths: List of file paths to process
+            max_workers: Number of worker processes (default: CPU count)
+            timeout: Per-file time limit in seconds (default: FILE_PROCESSING_TIMEOUT)
+            
+        Returns:
+            One FileProcessingResult per input file, in input order
+        """
+        if not file_paths:
+            return []
+        
+        timeout = FILE_PROCESSING_TIMEOUT if timeout is None else timeout
+        max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        
+        results: List[FileProcessingResult] = []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_pipeline_worker,
+                                 initargs=(self.ontology_path,)) as executor:
+            futures = [executor.submit(_process_resume_in_worker, file_path, timeout) for file_path in file_paths]
+            for file_path, future in zip(file_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    results.append(FileProcessingResult(file_path=file_path, error=f"Worker failed: {e}"))
+        
+        failed = [result for result in results if result.error]
+        if failed:
+            logger.warning(f"Failed to process {len(failed)} files: {[result.file_path for result in failed]}")
+        logger.info(f"Successfully processed {len(results) - len(failed)} out of {len(file_paths)} resumes "
+                    f"with {max_workers} worker processes")
+        return results
+    
     def _extract_job_title(self, text: str) -> Optional[str]:
         """
         Basic job title extraction
@@ -258,6 +389,92 @@ class ProcessingPipeline:
         """
         return {
             "ontology_categories": len(self.ontology),
+            "ontology_version": self.ontology_version,
             "total_skills": sum(len(skills) for skills in self.ontology.values()),
-            "supported_file_types": [".pdf", ".docx", ".txt", ".rtf"]
-        }
\ No newline at end of file
+            "supported_file_types": [".pdf", ".docx", ".txt", ".rtf"],
+            "parsed_text_cache": parsed_text_cache.stats() if parsed_text_cache is not None else None
+        }
+
+class FileProcessingTimeout(BaseException):
+    """
+    Raised in a worker when a file exceeds its time limit.
+    Derives from BaseException so that ``except Exception`` blocks in parsers
+    cannot swallow it and keep working on the file.
+    """
+
+@contextmanager
+def _time_limit(seconds: float):
+    """Interrupt the block with FileProcessingTimeout after ``seconds`` (main thread, POSIX only)"""
+    if not seconds or seconds <= 0 or not hasattr(signal, "setitimer"):
+        yield
+        return
+    
+    def _on_timeout(signum, frame):
+        raise FileProcessingTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+# Per-process pipeline used by process pools
+_worker_pipeline: Optional[ProcessingPipeline] = None
+
+def init_pipeline_worker(ontology_path: str = "data/skills_ontology.yml") -> None:
+    """Process pool initializer: load the ontology once per worker process"""
+    global _worker_pipeline
+    _worker_pipeline = ProcessingPipeline(ontology_path)
+
+def run_pipeline_method(method: str, *args, **kwargs):
+    """Run a ProcessingPipeline method on the worker's pipeline"""
+    if _worker_pipeline is None:
+        init_pipeline_worker()
+    else:
+        # Worker processes cannot be told about reloads, so they follow the file themselves
+        _worker_pipeline.reload_if_modified()
+    return getattr(_worker_pipeline, method)(*args, **kwargs)
+
+def _process_resume_in_worker(file_path: str, timeout: float) -> FileProcessingResult:
+    """Process one resume in a worker process; never raises"""
+    start_time = time.time()
+    try:
+        with _time_limit(timeout):
+            resume = run_pipeline_method("process_resume", file_path)
+        return FileProcessingResult(file_path=file_path, resume=resume, processing_time=time.time() - start_time)
+    except FileProcessingTimeout:
+        logger.error(f"Timed out processing {file_path} after {timeout} seconds")
+        error = f"Timed out after {timeout} seconds"
+    except Exception as e:
+        error = str(e)
+    return FileProcessingResult(file_path=file_path, error=error, processing_time=time.time() - start_time)
+
+class OntologyWatcher(threading.Thread):
+    """Daemon thread that reloads a pipeline's ontology when its file changes"""
+    
+    def __init__(self, pipeline: ProcessingPipeline, interval: float,
+                 on_reload: Optional[Callable[[ProcessingPipeline], None]] = None):
+        """
+        Args:
+            pipeline: Pipeline to keep up to date
+            interval: Seconds between file checks
+            on_reload: Called after the ontology content changed
+        """
+        super().__init__(name="ontology-watcher", daemon=True)
+        self.pipeline = pipeline
+        self.interval = interval
+        self.on_reload = on_reload
+        self._stop_event = threading.Event()
+    
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                if self.pipeline.reload_if_modified() and self.on_reload:
+                    self.on_reload(self.pipeline)
+            except Exception as e:
+                logger.error(f"Error in ontology watcher: {e}")
+    
+    def stop(self) -> None:
+        self._stop_event.set()
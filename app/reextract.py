@@ -0,0 +1,246 @@
+"""
+Incremental skill re-extraction after ontology changes
+"""
+
+import os
+import json
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session, selectinload
+
+from .database import Resume, JobDescription, OntologyVersion
+from .skill_store import replace_document_skills
+from .skills import SkillMatcher, NormalizedDocument, diff_ontologies, ontology_version
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Re-extraction configuration
+REEXTRACT_CHUNK_SIZE = int(os.getenv("REEXTRACT_CHUNK_SIZE", "500"))
+REEXTRACT_WORKERS = int(os.getenv("REEXTRACT_WORKERS", str(os.cpu_count() or 1)))
+
+def record_ontology_version(db: Session, ontology: Dict[str, List[str]]) -> str:
+    """
+    Store a snapshot of an ontology unless it is already known
+
+    Returns:
+        The ontology version
+    """
+    version = ontology_version(ontology)
+    if db.get(OntologyVersion, version) is None:
+        db.add(OntologyVersion(version=version, content=json.dumps(ontology)))
+        db.commit()
+        logger.info(f"Recorded ontology version {version}")
+    return version
+
+def _load_ontology_version(db: Session, version: Optional[str]) -> Optional[Dict[str, List[str]]]:
+    """Load an ontology snapshot, or None if it was never recorded"""
+    if not version:
+        return None
+    snapshot = db.get(OntologyVersion, version)
+    return json.loads(snapshot.content) if snapshot is not None else None
+
+# A plan per old version: (ontology of added entries, removed (category, skill) pairs),
+# or None when the old ontology is unknown and documents need a full rescan
+Plan = Optional[Tuple[Dict[str, List[str]], Set[Tuple[str, str]]]]
+
+class SkillReextractor:
+    """Recomputes stored skills for the current ontology, scanning only for what changed"""
+
+    def __init__(self, ontology: Dict[str, List[str]], plans: Dict[Optional[str], Plan]):
+        """
+        Args:
+            ontology: Current ontology
+            plans: Diff plan for each old ontology version
+        """
+        self.ontology = ontology
+        self.plans = plans
+        self._full_matcher: Optional[SkillMatcher] = None
+        self._added_matchers: Dict[Optional[str], SkillMatcher] = {}
+
+    def _matcher_for(self, version: Optional[str]) -> Tuple[SkillMatcher, Set[Tuple[str, str]], bool]:
+        """Matcher to scan with, removed entries and whether stored skills are kept"""
+        plan = self.plans.get(version)
+        if plan is None:
+            if self._full_matcher is None:
+                self._full_matcher = SkillMatcher(self.ontology)
+            return self._full_matcher, set(), False
+        if version not in self._added_matchers:
+            self._added_matchers[version] = SkillMatcher(plan[0])
+        return self._added_matchers[version], plan[1], True
+
+    def reextract(self, text: str, skills_by_category: Optional[str], version: Optional[str]) -> Dict[str, List[str]]:
+        """
+        Compute a document's skills for the current ontology
+
+        Args:
+            text: Document text
+            skills_by_category: Stored JSON of the skills found with the old ontology
+            version: Ontology version the stored skills were extracted with
+
+        Returns:
+            Skills grouped by category, in current ontology order
+        """
+        matcher, removed, keep_stored = self._matcher_for(version)
+
+        found: Dict[str, Set[str]] = {}
+        if keep_stored:
+            try:
+                for category, skills in json.loads(skills_by_category or "{}").items():
+                    found.setdefault(category, set()).update(
+                        skill for skill in skills if (category, skill) not in removed
+                    )
+            except (ValueError, AttributeError):
+                # Unreadable stored skills: fall back to a full scan
+                return self.reextract(text, None, None)
+
+        if matcher.ontology and text:
+            for category, skills in matcher.scan(NormalizedDocument(text)).skills_by_category().items():
+                found.setdefault(category, set()).update(skills)
+
+        return {category: sorted(found[category]) for category in self.ontology if found.get(category)}
+
+    def reextract_chunk(self, rows: List[Tuple[int, str, Optional[str], Optional[str]]]) -> List[Tuple[int, Dict[str, List[str]]]]:
+        """Re-extract (id, text, skills_by_category, version) rows"""
+        return [(row_id, self.reextract(text, by_category, version)) for row_id, text, by_category, version in rows]
+
+# Per-process reextractor used by the process pool
+_worker_reextractor: Optional[SkillReextractor] = None
+
+def _init_reextract_worker(ontology: Dict[str, List[str]], plans: Dict[Optional[str], Plan]) -> None:
+    """Process pool initializer: build the reextractor once per worker process"""
+    global _worker_reextractor
+    _worker_reextractor = SkillReextractor(ontology, plans)
+
+def _reextract_chunk_in_worker(rows):
+    return _worker_reextractor.reextract_chunk(rows)
+
+def _stale_filter(model, version: str):
+    return or_(model.ontology_version.is_(None), model.ontology_version != version)
+
+def count_stale_documents(db: Session, ontology: Dict[str, List[str]]) -> int:
+    """Number of resumes and job descriptions extracted with another ontology version"""
+    version = ontology_version(ontology)
+    return sum(db.query(model).filter(_stale_filter(model, version)).count() for model in (Resume, JobDescription))
+
+def reextract_skills(db: Session, ontology: Dict[str, List[str]], chunk_size: int = REEXTRACT_CHUNK_SIZE,
+                     max_workers: int = REEXTRACT_WORKERS,
+                     on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Bring stored skills of all documents up to date with an ontology
+
+    Only rows with another ontology version are touched. For each old version
+    that has a recorded snapshot, removed skills are dropped from the stored
+    lists and the text is scanned for the added skills only; rows from an
+    unknown version are rescanned in full. Rows are processed in id order in
+    chunks (on a process pool when ``max_workers > 1``) and every chunk is
+    committed with the new version, so an interrupted run resumes where it
+    stopped.
+
+    Args:
+        db: Database session
+        ontology: Current ontology
+        chunk_size: Rows per chunk
+        max_workers: Worker processes (1 runs inline)
+        on_progress: Called with (processed, failed) row counts after each committed chunk
+
+    Returns:
+        Per-table counters of processed, changed and failed rows
+    """
+    version = record_ontology_version(db, ontology)
+    summary = {}
+
+    for model in (Resume, JobDescription):
+        stale = _stale_filter(model, version)
+        old_versions = [row[0] for row in db.query(model.ontology_version).filter(stale).distinct()]
+        if not old_versions:
+            summary[model.__tablename__] = {"processed": 0, "changed": 0, "failed": 0}
+            continue
+
+        plans: Dict[Optional[str], Plan] = {}
+        for old_version in old_versions:
+            old_ontology = _load_ontology_version(db, old_version)
+            plans[old_version] = diff_ontologies(old_ontology, ontology) if old_ontology is not None else None
+        logger.info(f"Re-extracting {model.__tablename__} from versions {old_versions} "
+                    f"({sum(plan is None for plan in plans.values())} need a full rescan)")
+
+        counts = {"processed": 0, "changed": 0, "failed": 0}
+        executor = None
+        if max_workers > 1:
+            # Spawned, not forked: the API runs this from a job thread while the model,
+            # the batcher and the worker pools have threads of their own
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_reextract_worker,
+                                           initargs=(ontology, plans),
+                                           mp_context=multiprocessing.get_context("spawn"))
+        reextractor = SkillReextractor(ontology, plans)
+
+        try:
+            in_flight = deque()
+            last_id = 0
+            while True:
+                rows = db.query(model).options(selectinload(model.document_text)).filter(
+                    stale, model.id > last_id
+                ).order_by(model.id).limit(chunk_size).all()
+                if rows:
+                    last_id = rows[-1].id
+                    payload = [(row.id, row.text, row.skills_by_category, row.ontology_version) for row in rows]
+                    previous = {row.id: row.skills_by_category for row in rows}
+                    if executor is not None:
+                        in_flight.append((payload, previous, executor.submit(_reextract_chunk_in_worker, payload)))
+                    else:
+                        in_flight.append((payload, previous, None))
+
+                # Keep up to max_workers chunks in flight, applying results in order
+                if in_flight and (not rows or len(in_flight) >= max(1, max_workers)):
+                    payload, previous, future = in_flight.popleft()
+                    try:
+                        results = future.result() if future is not None else reextractor.reextract_chunk(payload)
+                    except Exception as e:
+                        logger.error(f"Error re-extracting {model.__tablename__} chunk ending at id {payload[-1][0]}: {e}")
+                        counts["failed"] += len(payload)
+                        counts["processed"] += len(payload)
+                        if on_progress:
+                            on_progress(len(payload), len(payload))
+                        continue
+
+                    _apply_results(db, model, results, previous, version, counts)
+                    db.commit()
+                    counts["processed"] += len(results)
+                    if on_progress:
+                        on_progress(len(results), 0)
+                elif not rows:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        logger.info(f"Re-extracted {model.__tablename__}: {counts}")
+        summary[model.__tablename__] = counts
+
+    return summary
+
+def _apply_results(db: Session, model, results, previous: Dict[int, Optional[str]], version: str, counts: dict) -> None:
+    """Write re-extracted skills (and the new version) with one bulk UPDATE and rewrite changed skill links"""
+    now = datetime.utcnow()
+    mappings = []
+    changed_skills = {}
+    for row_id, by_category in results:
+        flat = sorted({skill for skills in by_category.values() for skill in skills})
+        by_category_json = json.dumps(by_category)
+        mapping = {"id": row_id, "ontology_version": version, "updated_at": now}
+        if by_category_json != previous.get(row_id):
+            counts["changed"] += 1
+            mapping["skills_by_category"] = by_category_json
+            mapping["required_skills" if model is JobDescription else "skills"] = json.dumps(flat)
+            changed_skills[row_id] = (flat, [], by_category)
+        mappings.append(mapping)
+    if mappings:
+        # Rows changing different columns are grouped by the bulk UPDATE
+        db.execute(update(model), mappings)
+    replace_document_skills(db, model, changed_skills)
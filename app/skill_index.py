@@ -0,0 +1,236 @@
+"""
+In-memory inverted skill index for candidate prefiltering in Resume Screening AI
+"""
+
+import os
+import math
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Skill prefilter configuration
+SKILL_PREFILTER_MIN_COVERAGE = float(os.getenv("SKILL_PREFILTER_MIN_COVERAGE", "0"))  # 0 disables the prefilter
+SKILL_INDEX_DENSE_RATIO = float(os.getenv("SKILL_INDEX_DENSE_RATIO", "0.03125"))  # Postings above it become bitmaps
+SKILL_INDEX_CACHE_SIZE = int(os.getenv("SKILL_INDEX_CACHE_SIZE", "32"))  # Users whose index is kept in memory
+
+class SkillIndex:
+    """
+    Inverted index from skill ID to the resumes that have the skill.
+
+    Resumes are numbered by their position in the sorted ``doc_ids`` array.
+    Each posting list is stored in the smaller of two forms, like a roaring
+    bitmap container: a sorted uint32 array of positions for rare skills, or
+    a packed bitmap for skills held by more than ``dense_ratio`` of the
+    resumes (a bitmap costs 1 bit per resume, an array 32 bits per holder).
+    Skill coverage of every resume against a job description is one pass
+    over the postings of the job description's skills.
+    """
+
+    def __init__(self, doc_ids: np.ndarray, postings: Dict[int, Tuple[str, np.ndarray, int]],
+                 dense_ratio: float = SKILL_INDEX_DENSE_RATIO):
+        """
+        Initialize the index (use ``from_pairs`` to build one)
+
+        Args:
+            doc_ids: Sorted resume IDs
+            postings: Skill ID to ("array", positions, size) or ("bitmap", packed bits, bit length)
+            dense_ratio: Share of resumes above which a posting list is kept as a bitmap
+        """
+        self.doc_ids = doc_ids
+        self.postings = postings
+        self.dense_ratio = dense_ratio
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[Tuple[int, int]],
+                   dense_ratio: float = SKILL_INDEX_DENSE_RATIO) -> "SkillIndex":
+        """
+        Build an index from (resume ID, skill ID) pairs
+
+        Args:
+            pairs: Link rows, e.g. the result of a resume_skills query
+            dense_ratio: Share of resumes above which a posting list is kept as a bitmap
+
+        Returns:
+            The index
+        """
+        index = cls(np.zeros(0, dtype=np.int64), {}, dense_ratio)
+        return index.extend(pairs)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @property
+    def max_id(self) -> int:
+        """Largest indexed resume ID (0 when empty)"""
+        return int(self.doc_ids[-1]) if len(self.doc_ids) else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the document IDs and posting lists"""
+        return self.doc_ids.nbytes + sum(data.nbytes for _, data, _ in self.postings.values())
+
+    def _positions(self, skill_id: int) -> np.ndarray:
+        """Positions of the resumes having a skill, as a sorted array"""
+        kind, data, size = self.postings[skill_id]
+        if kind == "array":
+            return data
+        return np.flatnonzero(np.unpackbits(data, count=size)).astype(np.uint32)
+
+    def _compress(self, positions: np.ndarray, size: int) -> Tuple[str, np.ndarray, int]:
+        """Smaller container for a sorted position array over ``size`` resumes"""
+        if len(positions) > self.dense_ratio * size:
+            bits = np.zeros(size, dtype=bool)
+            bits[positions] = True
+            return ("bitmap", np.packbits(bits), size)
+        return ("array", positions.astype(np.uint32), len(positions))
+
+    def extend(self, pairs: Sequence[Tuple[int, int]]) -> "SkillIndex":
+        """
+        Index added resumes, returning a new index (this one stays valid for concurrent readers)
+
+        All added resume IDs must be larger than ``max_id``; only the posting
+        lists of their skills are rebuilt.
+
+        Args:
+            pairs: (resume ID, skill ID) link rows of the added resumes
+
+        Returns:
+            The extended index
+        """
+        if not len(pairs):
+            return self
+        # Flattened straight into an array: np.array() over millions of row tuples is far slower
+        flat = np.fromiter(itertools.chain.from_iterable(pairs), dtype=np.int64, count=2 * len(pairs))
+        resume_ids, skill_ids = flat[0::2], flat[1::2]
+        if resume_ids.min() <= self.max_id:
+            raise ValueError("Only resumes newer than the indexed ones can be added")
+
+        new_ids = np.unique(resume_ids)
+        doc_ids = np.concatenate([self.doc_ids, new_ids])
+        positions = (len(self.doc_ids) + np.searchsorted(new_ids, resume_ids)).astype(np.uint32)
+
+        # Group the new positions by skill, each group sorted
+        order = np.lexsort((positions, skill_ids))
+        skill_ids, positions = skill_ids[order], positions[order]
+        boundaries = np.flatnonzero(np.diff(skill_ids)) + 1
+        postings = dict(self.postings)
+        for group_skills, group_positions in zip(np.split(skill_ids, boundaries), np.split(positions, boundaries)):
+            skill_id = int(group_skills[0])
+            merged = group_positions
+            if skill_id in postings:
+                merged = np.concatenate([self._positions(skill_id), group_positions])
+            postings[skill_id] = self._compress(merged, len(doc_ids))
+        return SkillIndex(doc_ids, postings, self.dense_ratio)
+
+    def coverage_counts(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """
+        Number of the given skills each indexed resume has
+
+        Args:
+            skill_ids: Distinct skill IDs of a job description
+
+        Returns:
+            Count per resume position
+        """
+        counts = np.zeros(len(self.doc_ids), dtype=np.uint16)
+        for skill_id in set(skill_ids):
+            posting = self.postings.get(skill_id)
+            if posting is None:
+                continue
+            kind, data, size = posting
+            if kind == "array":
+                counts[data] += 1
+            else:
+                counts[:size] += np.unpackbits(data, count=size)
+        return counts
+
+    def shortlist(self, skill_ids: Iterable[int], total_skills: int, min_coverage: float,
+                  candidates: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """
+        Resumes covering at least ``min_coverage`` of a job description's skills
+
+        Args:
+            skill_ids: Distinct skill IDs of the job description found in the dictionary
+            total_skills: Number of distinct job description skills (the coverage denominator)
+            min_coverage: Minimum share of the skills a resume must have
+            candidates: Restrict the result to these resume IDs
+
+        Returns:
+            Resume ID to skill coverage for every shortlisted resume
+        """
+        if total_skills <= 0:
+            return {}
+        # Smallest overlap reaching the threshold (tolerant to float rounding)
+        needed = max(1, math.ceil(min_coverage * total_skills - 1e-9))
+        counts = self.coverage_counts(skill_ids)
+        selected = np.flatnonzero(counts >= needed)
+        if candidates is not None:
+            wanted = np.asarray(sorted(set(candidates)), dtype=np.int64)
+            selected = selected[np.isin(self.doc_ids[selected], wanted)]
+        return {int(self.doc_ids[i]): counts[i] / total_skills for i in selected}
+
+    def stats(self) -> dict:
+        """Index size counters"""
+        bitmaps = sum(kind == "bitmap" for kind, _, _ in self.postings.values())
+        return {
+            "resumes": len(self.doc_ids),
+            "skills": len(self.postings),
+            "bitmap_postings": bitmaps,
+            "array_postings": len(self.postings) - bitmaps,
+            "bytes": self.nbytes,
+        }
+
+class SkillIndexRegistry:
+    """
+    Keeps one SkillIndex per key (e.g. per user), refreshed whenever the
+    caller-supplied signature of the underlying data changes. At most
+    ``max_items`` indexes are kept; the least recently used one is evicted.
+
+    ``build`` receives the cached index and its signature (or None), so it
+    can extend the index with new resumes instead of rebuilding it.
+    """
+
+    def __init__(self, max_items: int = SKILL_INDEX_CACHE_SIZE):
+        self.max_items = max_items
+        self._indexes: "OrderedDict[Hashable, Tuple[Hashable, SkillIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, signature: Hashable,
+            build: Callable[[Optional[SkillIndex], Optional[Hashable]], SkillIndex]) -> SkillIndex:
+        """
+        Return the cached index for a key, refreshing it if the signature changed
+
+        Args:
+            key: Index identifier
+            signature: Value that changes whenever the indexed data changes
+            build: Callable producing a current index from the stale one and its signature
+
+        Returns:
+            An index consistent with the signature
+        """
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached is not None:
+                self._indexes.move_to_end(key)
+                if cached[0] == signature:
+                    return cached[1]
+
+        index = build(cached[1] if cached else None, cached[0] if cached else None)
+        with self._lock:
+            self._indexes[key] = (signature, index)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_items:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the cached index for a key"""
+        with self._lock:
+            self._indexes.pop(key, None)
@@ -0,0 +1,323 @@
+"""
+Normalized skill tables and SQL-side boolean skill queries for Resume Screening AI
+"""
+
+import os
+import re
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, not_, false, exists, func, select, insert, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .database import Resume, JobDescription, Skill, SkillCategory, ResumeSkill, JDSkill
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Skill query configuration
+SKILL_QUERY_MAX_TERMS = int(os.getenv("SKILL_QUERY_MAX_TERMS", "32"))
+SKILL_POSTING_SAMPLE = int(os.getenv("SKILL_POSTING_SAMPLE", "10000"))  # Cap of the posting counts that order AND terms
+
+# Link table and its document column per document model
+_LINKS = {
+    Resume: (ResumeSkill, ResumeSkill.resume_id),
+    JobDescription: (JDSkill, JDSkill.job_description_id),
+}
+
+_TOKEN_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = ("and", "or", "not")
+
+class SkillQueryError(ValueError):
+    """Raised for a malformed boolean skill query"""
+
+def normalize_skill(name: str) -> str:
+    """Dictionary form of a skill name (lowercase, single spaces)"""
+    return " ".join((name or "").lower().split())
+
+def parse_skill_query(query: str) -> tuple:
+    """
+    Parse a boolean skill query into a syntax tree
+
+    Skills are combined with AND, OR, NOT (case-insensitive) and parentheses;
+    NOT binds tighter than AND, which binds tighter than OR. A run of words
+    is one skill ("machine learning"), quotes keep operator words literal.
+
+    Example: ``kubernetes AND (go OR rust) AND NOT "objective-c"``
+
+    Args:
+        query: Query text
+
+    Returns:
+        Tree of ("skill", name), ("not", node), ("and", [nodes]) and ("or", [nodes])
+
+    Raises:
+        SkillQueryError: If the query is empty, malformed or has too many skills
+    """
+    tokens = _TOKEN_RE.findall(query or "")
+    position = 0
+    terms = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position] if position < len(tokens) else None
+
+    def is_operator(token: Optional[str], operator: str) -> bool:
+        return token is not None and token.lower() == operator
+
+    def parse_or() -> tuple:
+        nonlocal position
+        nodes = [parse_and()]
+        while is_operator(peek(), "or"):
+            position += 1
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and() -> tuple:
+        nonlocal position
+        nodes = [parse_unary()]
+        while is_operator(peek(), "and"):
+            position += 1
+            nodes.append(parse_unary())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary() -> tuple:
+        nonlocal position, terms
+        token = peek()
+        if token is None:
+            raise SkillQueryError("Unexpected end of skill query")
+        if is_operator(token, "not"):
+            position += 1
+            return ("not", parse_unary())
+        if token == "(":
+            position += 1
+            node = parse_or()
+            if peek() != ")":
+                raise SkillQueryError("Missing closing parenthesis in skill query")
+            position += 1
+            return node
+        if token == ")" or token.lower() in _OPERATORS:
+            raise SkillQueryError(f"Expected a skill before '{token}'")
+
+        if token.startswith('"'):
+            position += 1
+            name = token[1:-1]
+        else:
+            words = []
+            while peek() is not None and peek() not in ("(", ")") and not peek().startswith('"') \
+                    and peek().lower() not in _OPERATORS:
+                words.append(peek())
+                position += 1
+            name = " ".join(words)
+        name = normalize_skill(name)
+        if not name:
+            raise SkillQueryError("Empty skill in skill query")
+        terms += 1
+        if terms > SKILL_QUERY_MAX_TERMS:
+            raise SkillQueryError(f"Skill queries are limited to {SKILL_QUERY_MAX_TERMS} skills")
+        return ("skill", name)
+
+    tree = parse_or()
+    if peek() is not None:
+        raise SkillQueryError(f"Unexpected '{peek()}' in skill query (combine skills with AND/OR)")
+    return tree
+
+def query_skills(tree: tuple) -> List[str]:
+    """Skill names of a parsed query, in order of appearance"""
+    if tree[0] == "skill":
+        return [tree[1]]
+    if tree[0] == "not":
+        return query_skills(tree[1])
+    return [name for node in tree[1] for name in query_skills(node)]
+
+def _lookup_ids(db: Session, table, names: Iterable[str], create: bool) -> Dict[str, int]:
+    """Dictionary IDs of names in ``skills`` or ``skill_categories``, optionally inserting missing ones"""
+    names = set(names)
+    if not names:
+        return {}
+    ids = {name: table_id for table_id, name in db.execute(select(table.id, table.name).where(table.name.in_(names)))}
+    missing = names - ids.keys()
+    if not missing or not create:
+        return ids
+
+    # Added in the caller's transaction, so a rollback leaves no dangling dictionary entries
+    values = [{"name": name} for name in sorted(missing)]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        # Concurrent writers may add the same name; the unique constraint keeps one
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        db.execute(dialect_insert(table).values(values).on_conflict_do_nothing(index_elements=["name"]))
+    else:
+        db.execute(insert(table), values)
+    ids.update({name: table_id for table_id, name in
+                db.execute(select(table.id, table.name).where(table.name.in_(missing)))})
+    return ids
+
+def skill_ids(db: Session, names: Iterable[str], create: bool = False) -> Dict[str, int]:
+    """
+    Map skill names to their dictionary IDs
+
+    Args:
+        db: Database session
+        names: Skill names (normalized with ``normalize_skill``)
+        create: Add names that are not in the dictionary yet
+
+    Returns:
+        Name to ID for every known (or created) name
+    """
+    return _lookup_ids(db, Skill, names, create)
+
+def _link_rows(db: Session, model, entries: Dict[int, Tuple[Sequence[str], Sequence[str], Dict[str, List[str]]]]) -> List[dict]:
+    """Link table rows for documents given as {id: (skills, preferred skills, skills by category)}"""
+    documents = {}
+    for document_id, (skills, preferred, by_category) in entries.items():
+        category_of = {}
+        for category, names in (by_category or {}).items():
+            for name in names:
+                category_of.setdefault(normalize_skill(name), category)
+        required = {normalize_skill(name) for name in skills or []} - {""}
+        preferred = {normalize_skill(name) for name in preferred or []} - {""} - required
+        documents[document_id] = (required, preferred, category_of)
+
+    names = {name for required, preferred, _ in documents.values() for name in required | preferred}
+    categories = {category_of[name] for required, preferred, category_of in documents.values()
+                  for name in required | preferred if name in category_of}
+    ids = skill_ids(db, names, create=True)
+    category_ids = _lookup_ids(db, SkillCategory, categories, create=True)
+
+    link, document_column = _LINKS[model]
+    rows = []
+    for document_id, (required, preferred, category_of) in documents.items():
+        for name in sorted(required | preferred):
+            row = {
+                document_column.key: document_id,
+                "skill_id": ids[name],
+                "category_id": category_ids.get(category_of.get(name)),
+            }
+            if link is JDSkill:
+                row["required"] = name in required
+            rows.append(row)
+    return rows
+
+def _document_skills(record) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+    """(skills, preferred skills, skills by category) from a document row's JSON columns"""
+    by_category = json.loads(record.skills_by_category or "{}")
+    if isinstance(record, JobDescription):
+        return json.loads(record.required_skills or "[]"), json.loads(record.preferred_skills or "[]"), by_category
+    return json.loads(record.skills or "[]"), [], by_category
+
+def set_document_skills(db: Session, record) -> None:
+    """
+    Attach the skill links of a new (unsaved) resume or job description row
+
+    The links are written together with the row. IDs of skills seen for the
+    first time are added to the dictionary immediately.
+    """
+    model = type(record)
+    link, document_column = _LINKS[model]
+    rows = _link_rows(db, model, {0: _document_skills(record)})
+    for row in rows:
+        row.pop(document_column.key)
+    record.skill_links = [link(**row) for row in rows]
+
+def replace_document_skills(db: Session, model, entries: Dict[int, Tuple[Sequence[str], Sequence[str], Dict[str, List[str]]]]) -> None:
+    """
+    Rewrite the skill links of stored documents with bulk statements
+
+    Args:
+        db: Database session (the caller commits)
+        model: Resume or JobDescription
+        entries: {document id: (skills, preferred skills, skills by category)}
+    """
+    if not entries:
+        return
+    link, document_column = _LINKS[model]
+    rows = _link_rows(db, model, entries)
+    db.execute(delete(link).where(document_column.in_(list(entries))))
+    if rows:
+        db.execute(insert(link), rows)
+
+def replace_stored_skills(db: Session, records: list) -> None:
+    """Rewrite the skill links of stored resume or job description rows from their JSON columns"""
+    for model in (Resume, JobDescription):
+        replace_document_skills(db, model, {
+            record.id: _document_skills(record) for record in records if isinstance(record, model)
+        })
+
+def posting_sizes(db: Session, model, ids: Iterable[int], cap: int = SKILL_POSTING_SAMPLE) -> Dict[int, int]:
+    """
+    Number of documents having each skill, counted up to ``cap``
+
+    The counts only order the terms of a query, so a bounded index range
+    scan per skill is enough.
+    """
+    link, document_column = _LINKS[model]
+    sizes = {}
+    for skill_id in set(ids):
+        postings = select(document_column).where(link.skill_id == skill_id).limit(cap).subquery()
+        sizes[skill_id] = db.execute(select(func.count()).select_from(postings)).scalar()
+    return sizes
+
+def has_skill_condition(model, skill_id: Optional[int], probe: bool = False, required_only: bool = False):
+    """
+    Condition on a document table: the document has the skill
+
+    By default the skill's posting list (an index range of the link table) is
+    read as an ``IN`` list that can drive the query; with ``probe`` every
+    candidate document is checked with a primary key lookup instead. With
+    ``required_only`` (job descriptions only), preferred skills do not count.
+    """
+    if skill_id is None:
+        return false()
+    link, document_column = _LINKS[model]
+    criteria = [link.skill_id == skill_id]
+    if required_only:
+        criteria.append(link.required.is_(True))
+    if probe:
+        return exists().where(document_column == model.id, *criteria)
+    return model.id.in_(select(document_column).where(*criteria))
+
+def estimate_matches(tree: tuple, ids: Dict[str, int], sizes: Dict[int, int]) -> float:
+    """Estimated number of documents matching a parsed query (from capped posting sizes)"""
+    kind = tree[0]
+    if kind == "skill":
+        return sizes.get(ids[tree[1]], 0) if tree[1] in ids else 0
+    if kind == "not":
+        return float("inf")
+    estimates = [estimate_matches(node, ids, sizes) for node in tree[1]]
+    return min(estimates) if kind == "and" else sum(estimates)
+
+def skill_query_condition(model, tree: tuple, ids: Dict[str, int], sizes: Optional[Dict[int, int]] = None,
+                          probe: bool = False, required_only: bool = False):
+    """
+    Compile a parsed skill query into a WHERE condition on a document table
+
+    The rarest operand of each AND (by ``sizes``) reads its posting list and
+    drives the query; the other operands only probe the candidates it yields,
+    so the cost follows the most selective skill rather than the most common.
+
+    Args:
+        model: Resume or JobDescription
+        tree: Result of ``parse_skill_query``
+        ids: Skill IDs from ``skill_ids`` (skills missing from it match nothing)
+        sizes: Posting list sizes from ``posting_sizes`` (operands keep their order without them)
+        probe: Compile every skill as a per-document lookup
+        required_only: Only match the required skills of job descriptions
+
+    Returns:
+        SQLAlchemy condition
+    """
+    kind = tree[0]
+    if kind == "skill":
+        return has_skill_condition(model, ids.get(tree[1]), probe, required_only)
+    if kind == "not":
+        return not_(skill_query_condition(model, tree[1], ids, sizes, True, required_only))
+    if kind == "or":
+        return or_(*[skill_query_condition(model, node, ids, sizes, probe, required_only) for node in tree[1]])
+
+    nodes = sorted(tree[1], key=lambda node: estimate_matches(node, ids, sizes)) if sizes is not None else tree[1]
+    return and_(
+        skill_query_condition(model, nodes[0], ids, sizes, probe, required_only),
+        *[skill_query_condition(model, node, ids, sizes, True, required_only) for node in nodes[1:]]
+    )
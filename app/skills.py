@@ -1,8 +1,11 @@
 
 import yaml
 import re
+import json
+import hashlib
 import logging
-from typing import List, Dict, Set
+from collections import deque
+from typing import List, Dict, Set, Tuple, Union
 from pathlib import Path
 
 # Configure logging
@@ -34,6 +37,28 @@ def normalize(text: str) -> str:
     
     return text
 
+class NormalizedDocument:
+    """
+    A document's raw text together with its normalized form.
+
+    Build it once per document and hand it to every extractor so that
+    ``normalize`` only runs a single time.
+    """
+    __slots__ = ("raw_text", "text")
+    
+    def __init__(self, raw_text: str):
+        self.raw_text = raw_text or ""
+        self.text = normalize(self.raw_text)
+    
+    def __bool__(self) -> bool:
+        return bool(self.raw_text)
+
+def _as_document(text: Union[str, NormalizedDocument]) -> NormalizedDocument:
+    """Accept either raw text or an already normalized document"""
+    if isinstance(text, NormalizedDocument):
+        return text
+    return NormalizedDocument(text)
+
 def load_ontology(path: str = "data/skills_ontology.yml") -> Dict[str, List[str]]:
     """
     Load skills ontology from YAML file with error handling
@@ -76,81 +101,262 @@ def load_ontology(path: str = "data/skills_ontology.yml") -> Dict[str, List[str]
         logger.error(f"Error loading ontology from {path}: {e}")
         raise
 
-def extract_skills(text: str, ontology: Dict[str, List[str]]) -> List[str]:
+def ontology_version(ontology: Dict[str, List[str]]) -> str:
+    """
+    Short content hash of an ontology, so processed documents can record
+    which version of the skills list they were extracted with
+    """
+    payload = json.dumps(ontology, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def diff_ontologies(old: Dict[str, List[str]], new: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Set[Tuple[str, str]]]:
+    """
+    Compare two ontology versions entry by entry
+    
+    A skill that was renamed or moved to another category shows up as one
+    removed and one added entry.
+    
+    Args:
+        old: Previous ontology
+        new: Current ontology
+        
+    Returns:
+        Tuple of (ontology holding only the added entries, set of removed (category, skill) pairs)
+    """
+    old_entries = {(category, skill) for category, skills in old.items() for skill in skills}
+    new_entries = {(category, skill) for category, skills in new.items() for skill in skills}
+    
+    added: Dict[str, List[str]] = {}
+    for category, skills in new.items():
+        category_added = [skill for skill in skills if (category, skill) not in old_entries]
+        if category_added:
+            added[category] = category_added
+    return added, old_entries - new_entries
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror the definition of a word character used by the ``\\b`` regex anchor"""
+    return ch.isalnum() or ch == "_"
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Return True if ``index`` sits on a ``\\b`` word boundary in ``text``"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+class SkillMatcher:
+    """
+    Compiled skills ontology backed by an Aho-Corasick automaton.
+
+    Every skill (and the space-separated variant of hyphenated skills) is
+    inserted once, so a document is scanned in a single linear pass instead of
+    one regex search per skill. Matches are only accepted when both ends sit
+    on a word boundary, which keeps the semantics of ``\\bskill\\b``.
+    """
+    
+    def __init__(self, ontology: Dict[str, List[str]]):
+        """
+        Build the automaton for an ontology
+        
+        Args:
+            ontology: Skills ontology dictionary
+        """
+        self.ontology = ontology
+        self.version = ontology_version(ontology)
+        self._entries: List[Tuple[str, str]] = []  # (category, skill) per ontology entry
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (pattern length, entry index, is hyphen variant) per state
+        self._output: List[List[Tuple[int, int, bool]]] = [[]]
+        self._empty_entries: Set[int] = set()
+        
+        for category, skills in ontology.items():
+            for skill in skills:
+                entry = len(self._entries)
+                self._entries.append((category, skill))
+                pattern = skill.lower()
+                if not pattern:
+                    self._empty_entries.add(entry)
+                self._add_pattern(pattern, entry, False)
+                if "-" in skill:
+                    self._add_pattern(pattern.replace("-", " "), entry, True)
+        
+        self._build_failure_links()
+        logger.debug(f"Compiled skill matcher with {len(self._entries)} entries and {len(self._goto)} states")
+    
+    def _add_pattern(self, pattern: str, entry: int, variant: bool) -> None:
+        """Insert a pattern into the trie"""
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), entry, variant))
+    
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def scan(self, document: Union[str, NormalizedDocument]) -> "SkillScan":
+        """
+        Scan a document once and collect everything the extractors need
+        
+        Args:
+            document: Raw text or a NormalizedDocument
+            
+        Returns:
+            SkillScan holding word-boundary matches and plain substring hits
+        """
+        norm_text = _as_document(document).text
+        goto, fail, output = self._goto, self._fail, self._output
+        matched: Set[int] = set()
+        substrings: Set[int] = set(self._empty_entries)
+        state = 0
+        
+        for pos, ch in enumerate(norm_text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            end = pos + 1
+            for length, entry, variant in output[state]:
+                if not variant:
+                    substrings.add(entry)
+                if entry in matched:
+                    continue
+                if _at_word_boundary(norm_text, end - length) and _at_word_boundary(norm_text, end):
+                    matched.add(entry)
+        
+        return SkillScan(self, matched, substrings)
+    
+    def extract_skills(self, text: Union[str, NormalizedDocument]) -> List[str]:
+        """
+        Extract skills from a document
+        
+        Args:
+            text: Raw text or a NormalizedDocument
+            
+        Returns:
+            Sorted list of extracted skills
+        """
+        if not text or not self.ontology:
+            return []
+        return self.scan(text).skills()
+    
+    def extract_skills_with_categories(self, text: Union[str, NormalizedDocument]) -> Dict[str, List[str]]:
+        """
+        Extract skills from a document grouped by category
+        
+        Args:
+            text: Raw text or a NormalizedDocument
+            
+        Returns:
+            Dictionary mapping categories to found skills
+        """
+        if not text or not self.ontology:
+            return {}
+        return self.scan(text).skills_by_category()
+
+class SkillScan:
+    """
+    Result of a single SkillMatcher pass over one document.
+
+    Flat skills, categorized skills and suggestions are all derived from the
+    same set of hits, so none of them rescans the text.
+    """
+    
+    def __init__(self, matcher: SkillMatcher, matched: Set[int], substrings: Set[int]):
+        self._matcher = matcher
+        self._matched = matched
+        self._substrings = substrings
+    
+    def skills(self) -> List[str]:
+        """Sorted list of skills found with word boundaries"""
+        entries = self._matcher._entries
+        return sorted({entries[entry][1] for entry in self._matched})
+    
+    def skills_by_category(self) -> Dict[str, List[str]]:
+        """Skills found with word boundaries, grouped by category in ontology order"""
+        found: Dict[str, Set[str]] = {}
+        for entry in self._matched:
+            category, skill = self._matcher._entries[entry]
+            found.setdefault(category, set()).add(skill)
+        return {category: sorted(found[category]) for category in self._matcher.ontology if category in found}
+    
+    def suggestions(self, max_suggestions: int = 5) -> List[str]:
+        """First skills in ontology order that appear anywhere in the text, even inside other words"""
+        suggestions = []
+        for entry in sorted(self._substrings):
+            skill = self._matcher._entries[entry][1]
+            if skill not in suggestions:
+                suggestions.append(skill)
+                if len(suggestions) >= max_suggestions:
+                    break
+        return suggestions[:max_suggestions]
+
+def _as_matcher(ontology: Union[Dict[str, List[str]], SkillMatcher]) -> SkillMatcher:
+    """Accept either a raw ontology or an already compiled matcher"""
+    if isinstance(ontology, SkillMatcher):
+        return ontology
+    return SkillMatcher(ontology)
+
+def extract_skills(text: Union[str, NormalizedDocument], ontology: Union[Dict[str, List[str]], SkillMatcher]) -> List[str]:
     """
     Extract skills from text using the ontology
     
     Args:
-        text: Text to extract skills from
-        ontology: Skills ontology dictionary
+        text: Text (or NormalizedDocument) to extract skills from
+        ontology: Skills ontology dictionary or a compiled SkillMatcher
         
     Returns:
         List of extracted skills (normalized)
     """
     if not text or not ontology:
         return []
-        
-    norm_text = normalize(text)
-    found = set()
-    
-    for category, skills in ontology.items():
-        for skill in skills:
-            # Exact match with word boundaries
-            pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-            if re.search(pattern, norm_text):
-                found.add(skill)
-                
-            # Also check for hyphenated versions
-            if "-" in skill:
-                hyphen_pattern = r"\b" + re.escape(skill.lower().replace("-", " ")) + r"\b"
-                if re.search(hyphen_pattern, norm_text):
-                    found.add(skill)
     
-    return sorted(found)
+    return _as_matcher(ontology).extract_skills(text)
 
-def extract_skills_with_categories(text: str, ontology: Dict[str, List[str]]) -> Dict[str, List[str]]:
+def extract_skills_with_categories(text: Union[str, NormalizedDocument], ontology: Union[Dict[str, List[str]], SkillMatcher]) -> Dict[str, List[str]]:
     """
     Extract skills and group them by category
     
     Args:
-        text: Text to extract skills from
-        ontology: Skills ontology dictionary
+        text: Text (or NormalizedDocument) to extract skills from
+        ontology: Skills ontology dictionary or a compiled SkillMatcher
         
     Returns:
         Dictionary mapping categories to found skills
     """
     if not text or not ontology:
         return {}
-        
-    norm_text = normalize(text)
-    skills_by_category = {}
     
-    for category, skills in ontology.items():
-        category_skills = []
-        for skill in skills:
-            # Exact match with word boundaries
-            pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-            if re.search(pattern, norm_text):
-                category_skills.append(skill)
-                
-            # Also check for hyphenated versions
-            if "-" in skill:
-                hyphen_pattern = r"\b" + re.escape(skill.lower().replace("-", " ")) + r"\b"
-                if re.search(hyphen_pattern, norm_text):
-                    category_skills.append(skill)
-        
-        if category_skills:
-            skills_by_category[category] = sorted(list(set(category_skills)))
-    
-    return skills_by_category
+    return _as_matcher(ontology).extract_skills_with_categories(text)
 
-def get_skill_suggestions(text: str, ontology: Dict[str, List[str]], max_suggestions: int = 5) -> List[str]:
+def get_skill_suggestions(text: Union[str, NormalizedDocument], ontology: Union[Dict[str, List[str]], SkillMatcher],
+                          max_suggestions: int = 5) -> List[str]:
     """
     Get skill suggestions based on text content
     
     Args:
-        text: Text to analyze
-        ontology: Skills ontology dictionary
+        text: Text (or NormalizedDocument) to analyze
+        ontology: Skills ontology dictionary or a compiled SkillMatcher
         max_suggestions: Maximum number of suggestions to return
         
     Returns:
@@ -158,22 +364,9 @@ def get_skill_suggestions(text: str, ontology: Dict[str, List[str]], max_suggest
     """
     if not text or not ontology:
         return []
-        
-    norm_text = normalize(text)
-    suggestions = []
-    
-    # Look for partial matches
-    for category, skills in ontology.items():
-        for skill in skills:
-            skill_lower = skill.lower()
-            if skill_lower in norm_text and skill not in suggestions:
-                suggestions.append(skill)
-                if len(suggestions) >= max_suggestions:
-                    break
-        if len(suggestions) >= max_suggestions:
-            break
     
-    return suggestions[:max_suggestions]
+    # Partial matches: skills contained anywhere in the normalized text
+    return _as_matcher(ontology).scan(text).suggestions(max_suggestions)
 
 def calculate_skill_overlap(skills1: List[str], skills2: List[str]) -> float:
     """
@@ -0,0 +1,86 @@
+"""
+Streaming upload storage for Resume Screening AI
+"""
+
+import os
+import uuid
+import hashlib
+import logging
+from typing import BinaryIO, NamedTuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upload configuration
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "data/uploads")
+MAX_UPLOAD_SIZE_MB = float(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the configured maximum size"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_bytes // (1024 * 1024)} MB")
+        self.max_bytes = max_bytes
+
+class StoredUpload(NamedTuple):
+    """A file written to the upload directory"""
+    path: str
+    size: int
+    content_hash: str  # SHA-256 hex digest of the file content
+
+def save_upload(source: BinaryIO, filename: str, upload_dir: str = UPLOAD_DIR,
+                max_bytes: int = int(MAX_UPLOAD_SIZE_MB * 1024 * 1024),
+                chunk_size: int = UPLOAD_CHUNK_SIZE) -> StoredUpload:
+    """
+    Stream an uploaded file to disk in fixed-size chunks, hashing it on the way
+
+    Only one chunk is held in memory at a time, and the size limit is checked
+    after every chunk so oversized files are abandoned early.
+
+    Args:
+        source: Readable binary file object (e.g. ``UploadFile.file``)
+        filename: Original filename, used for its extension
+        upload_dir: Target directory
+        max_bytes: Maximum accepted size in bytes
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        StoredUpload with the new path, size and SHA-256
+
+    Raises:
+        UploadTooLarge: If the file is larger than ``max_bytes``
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    file_extension = os.path.splitext(filename or "")[1]
+    file_path = os.path.join(upload_dir, f"{uuid.uuid4()}{file_extension}")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, "wb") as f:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        # Never leave partial files behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    logger.debug(f"Stored upload {filename} ({size} bytes) at {file_path}")
+    return StoredUpload(path=file_path.replace(os.sep, "/"), size=size, content_hash=digest.hexdigest())
+
+def hash_file(file_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """SHA-256 hex digest of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
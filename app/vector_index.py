@@ -0,0 +1,257 @@
+"""
+In-process vector indexes for top-k retrieval over stored embeddings
+"""
+
+import os
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Indexes up to this size are searched exactly; larger ones use IVF
+EXACT_SEARCH_LIMIT = int(os.getenv("VECTOR_INDEX_EXACT_LIMIT", "20000"))
+# In-memory precision of indexed vectors: "float32", "float16" (2x smaller) or "int8" (4x smaller)
+VECTOR_INDEX_QUANTIZATION = os.getenv("VECTOR_INDEX_QUANTIZATION", "int8")
+# Quantized candidates re-ranked with full-precision vectors, as a multiple of k
+VECTOR_INDEX_RERANK_FACTOR = int(os.getenv("VECTOR_INDEX_RERANK_FACTOR", "4"))
+# Rows converted to float32 at a time while scanning a quantized matrix
+SCAN_BLOCK_SIZE = 65536
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first"""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+class QuantizedMatrix:
+    """
+    Row vectors kept in reduced precision.
+
+    float16 halves the memory of float32; int8 stores each row as int8 codes
+    with one float32 scale per row (``row ~= codes * scale``), a quarter of
+    float32 plus 4 bytes per row. Dot products are computed block by block so
+    scans never materialize a float32 copy of the whole matrix.
+    """
+
+    def __init__(self, vectors: np.ndarray, precision: str = VECTOR_INDEX_QUANTIZATION):
+        """
+        Quantize a matrix
+
+        Args:
+            vectors: float32 array with one vector per row
+            precision: "float32", "float16" or "int8"
+        """
+        if precision not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unknown vector precision: {precision}")
+        self.precision = precision
+        self.scales: Optional[np.ndarray] = None
+
+        if precision == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.zeros(0)
+            scales[scales == 0] = 1.0
+            self.codes = np.round(vectors / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+        else:
+            self.codes = np.ascontiguousarray(vectors, dtype=precision)
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the matrix"""
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def dot(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Approximate dot products of (a subset of) the rows with a query
+
+        Args:
+            query: float32 query vector
+            rows: Row positions to score (all rows if None)
+
+        Returns:
+            float32 scores aligned with ``rows``
+        """
+        count = len(self) if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCAN_BLOCK_SIZE):
+            block = slice(start, start + SCAN_BLOCK_SIZE)
+            positions = block if rows is None else rows[block]
+            scores[block] = self.codes[positions].astype(np.float32, copy=False) @ query
+            if self.scales is not None:
+                scores[block] *= self.scales[positions]
+        return scores
+
+class VectorIndex:
+    """
+    Top-k cosine search over L2-normalized vectors.
+
+    Small collections are scanned exactly with one matrix-vector product. Large
+    ones are partitioned with spherical k-means (an IVF index) and only the
+    lists closest to the query are scanned.
+
+    Vectors are held quantized (see QuantizedMatrix). Searches score the
+    quantized rows to generate candidates and, given a callable returning the
+    full-precision vectors, re-rank the best ``k * rerank_factor`` of them
+    exactly, so the ranking matches a float32 index at a fraction of its memory.
+    """
+
+    def __init__(self, ids: List[int], vectors: np.ndarray, exact_limit: int = EXACT_SEARCH_LIMIT,
+                 n_lists: Optional[int] = None, n_probe: Optional[int] = None,
+                 precision: str = VECTOR_INDEX_QUANTIZATION, rerank_factor: int = VECTOR_INDEX_RERANK_FACTOR):
+        """
+        Build the index
+
+        Args:
+            ids: Identifier of each vector
+            vectors: Array of shape (len(ids), dimension) with normalized rows
+            exact_limit: Maximum size searched by brute force
+            n_lists: Number of IVF lists (default: sqrt of the collection size)
+            n_probe: Number of IVF lists scanned per query
+            precision: In-memory precision of the vectors ("float32", "float16" or "int8")
+            rerank_factor: Candidates re-ranked with full-precision vectors, as a multiple of k
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self._id_order = np.argsort(self.ids, kind="stable")
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.approximate = len(self.ids) > exact_limit
+        self.rerank_factor = max(1, rerank_factor)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+
+        if self.approximate:
+            self.n_lists = n_lists or max(1, int(np.sqrt(len(self.ids))))
+            self.n_probe = min(self.n_lists, n_probe or max(8, self.n_lists // 10))
+            self._train(vectors)
+        # The float32 input is only needed for training; keep the compact copy
+        self.vectors = QuantizedMatrix(vectors, precision)
+        logger.info(f"Built {'IVF' if self.approximate else 'exact'} {precision} vector index over "
+                    f"{len(self.ids)} vectors ({self.vectors.nbytes / 1e6:.1f} MB)")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _train(self, vectors: np.ndarray, iterations: int = 10, sample_size: int = 100000) -> None:
+        """Partition the vectors with spherical k-means"""
+        rng = np.random.default_rng(0)
+        sample = vectors
+        if len(sample) > sample_size:
+            sample = sample[rng.choice(len(sample), sample_size, replace=False)]
+
+        centroids = sample[rng.choice(len(sample), self.n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(self.n_lists):
+                members = sample[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[c] = centroid / norm
+
+        self._centroids = centroids
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self._lists = [np.flatnonzero(assignment == c) for c in range(self.n_lists)]
+
+    def _rows(self, ids: Iterable[int]) -> np.ndarray:
+        """Sorted rows of the given ids (ids not in the index are ignored)"""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        sorted_ids = self.ids[self._id_order]
+        positions = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        return np.sort(self._id_order[positions[sorted_ids[positions] == ids]])
+
+    def search(self, query: np.ndarray, k: int,
+               full_vectors: Optional[Callable[[List[int]], np.ndarray]] = None,
+               ids: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Find the k vectors most similar to a query
+
+        Args:
+            query: Normalized query vector
+            k: Number of results
+            full_vectors: Returns the full-precision vectors of the given ids (one row
+                per id) to re-rank quantized candidates exactly; without it the
+                scores are the quantized approximations
+            ids: Only search these ids (e.g. a prefiltered shortlist); they are
+                scanned exactly, without IVF
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        if not len(self.ids) or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+
+        if ids is not None:
+            return self._rank(self._rows(ids), query, k, full_vectors)
+
+        if not self.approximate:
+            return self._rank(np.arange(len(self.ids)), query, k, full_vectors)
+
+        # Probe the closest lists, widening until there are at least k candidates
+        order = np.argsort(-(self._centroids @ query))
+        n_probe = self.n_probe
+        while True:
+            candidates = np.concatenate([self._lists[c] for c in order[:n_probe]])
+            if len(candidates) >= k or n_probe >= self.n_lists:
+                break
+            n_probe = min(self.n_lists, n_probe * 2)
+
+        return self._rank(candidates, query, k, full_vectors)
+
+    def _rank(self, candidates: np.ndarray, query: np.ndarray, k: int,
+              full_vectors: Optional[Callable[[List[int]], np.ndarray]]) -> List[Tuple[int, float]]:
+        """Score candidate rows on the quantized matrix, then re-rank the best ones exactly"""
+        scores = self.vectors.dot(query, candidates)
+        if full_vectors is None or self.vectors.precision == "float32":
+            top = _top_k(scores, k)
+            return [(int(self.ids[candidates[i]]), float(scores[i])) for i in top]
+
+        shortlist = self.ids[candidates[_top_k(scores, k * self.rerank_factor)]]
+        exact = np.asarray(full_vectors([int(i) for i in shortlist]), dtype=np.float32) @ query
+        top = _top_k(exact, k)
+        return [(int(shortlist[i]), float(exact[i])) for i in top]
+
+class VectorIndexRegistry:
+    """
+    Keeps one VectorIndex per key (e.g. per user) and rebuilds it whenever the
+    caller-supplied signature of the underlying data changes.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[Hashable, Tuple[Hashable, VectorIndex]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, signature: Hashable, build: Callable[[], VectorIndex]) -> VectorIndex:
+        """
+        Return the cached index for a key, building it if the signature changed
+
+        Args:
+            key: Index identifier
+            signature: Value that changes whenever the indexed data changes
+            build: Callable producing a fresh index
+
+        Returns:
+            An index consistent with the signature
+        """
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        index = build()
+        with self._lock:
+            self._indexes[key] = (signature, index)
+        return index
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the cached index for a key"""
+        with self._lock:
+            self._indexes.pop(key, None)
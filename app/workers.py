@@ -0,0 +1,151 @@
+"""
+Bounded worker pools for CPU-heavy work in the API
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .pipeline import init_pipeline_worker, run_pipeline_method  # Process pool worker entry points
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pool configuration
+WORKER_POOL_KIND = os.getenv("WORKER_POOL_KIND", "thread")  # "thread" or "process" (parsing only)
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", str(os.cpu_count() or 4)))
+MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "2"))
+WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", "32"))
+WORKER_RETRY_AFTER = int(os.getenv("WORKER_RETRY_AFTER", "5"))
+
+class WorkerPoolSaturated(RuntimeError):
+    """Raised when a pool already has as many running and queued tasks as it accepts"""
+
+    def __init__(self, pool_name: str, retry_after: int = WORKER_RETRY_AFTER):
+        super().__init__(f"The {pool_name} worker pool is saturated, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+class WorkerPool:
+    """
+    Thread or process pool with a bounded queue.
+
+    At most ``max_workers + max_queue`` tasks are accepted at a time; further
+    submissions fail fast with WorkerPoolSaturated instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int = WORKER_POOL_SIZE, max_queue: int = WORKER_QUEUE_SIZE,
+                 kind: str = "thread", initializer: Optional[Callable] = None, initargs: tuple = (),
+                 retry_after: int = WORKER_RETRY_AFTER):
+        """
+        Initialize the pool (the executor itself is started on first use)
+
+        Args:
+            name: Pool name used in logs and errors
+            max_workers: Number of worker threads or processes
+            max_queue: Number of tasks allowed to wait for a worker
+            kind: "thread" or "process"
+            initializer: Optional callable run once in every worker
+            initargs: Arguments for the initializer
+            retry_after: Seconds clients are asked to wait when the pool is saturated
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported worker pool kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._initializer = initializer
+        self._initargs = initargs
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        """The underlying executor, created lazily"""
+        with self._lock:
+            if self._executor is None:
+                executor_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+                self._executor = executor_class(
+                    max_workers=self.max_workers, initializer=self._initializer, initargs=self._initargs
+                )
+                logger.info(f"Started {self.name} {self.kind} pool with {self.max_workers} workers")
+            return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit a task without blocking
+
+        Raises:
+            WorkerPoolSaturated: If the pool and its queue are full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise WorkerPoolSaturated(self.name, self.retry_after)
+        return self._start(fn, *args, **kwargs)
+
+    def submit_wait(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit a task, waiting for a free slot instead of failing (for background jobs)"""
+        self._slots.acquire()
+        return self._start(fn, *args, **kwargs)
+
+    def _start(self, fn: Callable, *args, **kwargs) -> Future:
+        """Hand a task that already holds a slot to the executor"""
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_flight += 1
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run a task in the pool and wait for its result (for use from sync handlers)"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def call_wait(self, fn: Callable, *args, **kwargs):
+        """Run a task in the pool once a slot is free and wait for its result"""
+        return self.submit_wait(fn, *args, **kwargs).result()
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run a task in the pool and await its result (for use from async handlers)"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        """
+        Get pool statistics
+
+        Returns:
+            Dictionary with pool size, load and rejections
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self) -> None:
+        """Stop the executor, waiting for running tasks"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
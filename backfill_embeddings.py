@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Backfill stored embeddings for resumes and job descriptions
+"""
+
+import argparse
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
+from app.database import SessionLocal, Resume, JobDescription
+from app.matcher import ResumeMatcher
+from app.embeddings import store_embedding
+from app.chunking import EMBEDDING_POOLING, EMBEDDING_CHUNK_TOKENS
+
+def backfill_embeddings(batch_size: int = 256):
+    """Embed every stored document that has no embedding for the current model and chunking settings"""
+    matcher = ResumeMatcher(pooling=EMBEDDING_POOLING, chunk_tokens=EMBEDDING_CHUNK_TOKENS)
+    db = SessionLocal()
+    
+    try:
+        for model in (Resume, JobDescription):
+            print(f"Backfilling {model.__tablename__}...")
+            last_id = 0
+            updated = 0
+            while True:
+                rows = db.query(model).options(selectinload(model.document_text)).filter(
+                    model.id > last_id,
+                    or_(model.embedding.is_(None), model.embedding_model != matcher.embedding_signature)
+                ).order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+                
+                # Encode the whole batch in one pass; empty documents keep no embedding
+                texts = [row.text or "" for row in rows]
+                non_empty = [i for i, text in enumerate(texts) if text.strip()]
+                vectors = matcher.encode_texts([texts[i] for i in non_empty])
+                for i, vector in zip(non_empty, vectors):
+                    store_embedding(rows[i], vector, matcher.embedding_signature)
+                
+                db.commit()
+                updated += len(non_empty)
+                last_id = rows[-1].id
+                print(f"  {updated} embedded so far (last id {last_id})")
+            
+            print(f"Embedded {updated} {model.__tablename__}")
+        
+        print("Embedding backfill completed successfully!")
+        
+    except Exception as e:
+        print(f"Backfill failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill stored document embeddings")
+    parser.add_argument("--batch-size", type=int, default=256, help="Documents embedded per batch")
+    args = parser.parse_args()
+    backfill_embeddings(args.batch_size)
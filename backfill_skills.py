@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Backfill the normalized skill tables from the skill lists stored on resumes and job descriptions
+"""
+
+import argparse
+from sqlalchemy.orm import defer
+from app.database import SessionLocal, create_tables, Resume, JobDescription
+from app.skill_store import replace_stored_skills
+
+def backfill_skills(batch_size: int = 1000):
+    """Rewrite the skill links of every stored document"""
+    create_tables()
+    db = SessionLocal()
+
+    try:
+        for model in (Resume, JobDescription):
+            print(f"Backfilling {model.__tablename__} skills...")
+            last_id = 0
+            updated = 0
+            while True:
+                rows = db.query(model).options(defer(model.embedding)).filter(
+                    model.id > last_id
+                ).order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+
+                replace_stored_skills(db, rows)
+                db.commit()
+                updated += len(rows)
+                last_id = rows[-1].id
+                print(f"  {updated} linked so far (last id {last_id})")
+
+            print(f"Linked the skills of {updated} {model.__tablename__}")
+
+        print("Skill backfill completed successfully!")
+
+    except Exception as e:
+        print(f"Backfill failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the normalized skill tables")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Documents per transaction")
+    args = parser.parse_args()
+    backfill_skills(args.batch_size)
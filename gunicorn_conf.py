@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for multi-worker deployments of Resume Screening AI
+
+    gunicorn -c gunicorn_conf.py app.api:app
+
+The application and the embedding model are loaded once in the master
+process before the workers are forked, so all workers share the read-only
+weight pages copy-on-write instead of holding one model copy each. Each
+worker then limits torch to its share of the CPU cores.
+
+Workers share EMBEDDING_CACHE_DIR (the on-disk embedding store locks its
+files). Each worker holds its own copy of the skills ontology, so with more
+than one worker the ontology file watcher is required: POST
+/admin/ontology/reload only reaches the worker serving it, and the others
+pick the edited file up within ONTOLOGY_WATCH_INTERVAL seconds.
+"""
+
+import gc
+import os
+
+# Deployment configuration
+PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "true").lower() in ("1", "true", "yes")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+preload_app = True  # Import app.api in the master so its memory is inherited by the workers
+
+# Set before the app is imported in the master, so every worker starts the watcher
+ONTOLOGY_WATCH_INTERVAL = os.environ.setdefault("ONTOLOGY_WATCH_INTERVAL", "5" if workers > 1 else "0")
+if workers > 1 and float(ONTOLOGY_WATCH_INTERVAL) <= 0:
+    raise RuntimeError("ONTOLOGY_WATCH_INTERVAL must be positive with several workers, "
+                       "otherwise only the worker serving /admin/ontology/reload would use an edited ontology")
+
+# Intra-op torch threads per worker; by default the cores are split evenly between workers
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // workers))))
+
+def when_ready(server):
+    """Load the model in the master, after the app import and before the first fork"""
+    if PRELOAD_MODEL:
+        from app.api import matcher
+
+        # Only load the weights: running a forward pass here would start torch's
+        # thread pools, which do not survive fork
+        matcher.load()
+        server.log.info(f"Preloaded embedding model {matcher.model_name} for shared use by the workers")
+
+    # Move everything allocated so far out of the collector's reach, so collections
+    # in the workers do not write to (and un-share) the inherited pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    """Per-worker setup right after fork"""
+    try:
+        import torch
+        torch.set_num_threads(TORCH_THREADS)
+    except ImportError:
+        pass
+
+    # Connections opened in the master must not be reused by several processes
+    from app.database import engine
+    engine.dispose(close=False)
+
+    server.log.info(f"Worker {worker.pid} started with {TORCH_THREADS} torch threads")
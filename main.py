@@ -13,13 +13,14 @@ def main():
     parser.add_argument("--jd", help="Path to job description file")
     parser.add_argument("--api", action="store_true", help="Start FastAPI server")
     parser.add_argument("--ui", action="store_true", help="Start Streamlit UI")
+    parser.add_argument("--reload", action="store_true", help="Restart the API server on code changes (development)")
     
     args = parser.parse_args()
     
     if args.api:
         # Start FastAPI server
         import uvicorn
-        uvicorn.run("app.api:app", host="0.0.0.0", port=8000, reload=True)
+        uvicorn.run("app.api:app", host="0.0.0.0", port=8000, reload=args.reload)
     
     elif args.ui:
         # Start Streamlit UI
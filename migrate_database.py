@@ -6,6 +6,14 @@ Database migration script to fix existing data issues
 import sqlite3
 import json
 from pathlib import Path
+from app.compression import compress_text
+
+def add_column_if_missing(cursor, table: str, column: str, ddl: str):
+    """Add a column to an existing table unless it is already there"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        print(f"Adding {table}.{column}...")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
 
 def migrate_database():
     """Migrate the database to fix data type issues"""
@@ -62,8 +70,88 @@ def migrate_database():
             WHERE average_skill_coverage IS NULL
         """)
         
+        # Stored document embeddings
+        print("Adding embedding columns...")
+        for table in ("resumes", "job_descriptions"):
+            add_column_if_missing(cursor, table, "embedding", "BLOB")
+            add_column_if_missing(cursor, table, "embedding_model", "VARCHAR")
+            add_column_if_missing(cursor, table, "embedding_dim", "INTEGER")
+        
+        # Source file hashes
+        print("Adding content hash columns...")
+        for table in ("resumes", "job_descriptions"):
+            add_column_if_missing(cursor, table, "content_hash", "VARCHAR")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_content_hash ON {table} (content_hash)")
+        
+        # Content-hash deduplication
+        print("Adding deduplication columns...")
+        for table in ("resumes", "job_descriptions"):
+            add_column_if_missing(cursor, table, "duplicate_of_id", f"INTEGER REFERENCES {table}(id)")
+            add_column_if_missing(cursor, table, "ontology_version", "VARCHAR")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_duplicate_of_id ON {table} (duplicate_of_id)")
+        
+        # List endpoint pagination indexes
+        print("Adding pagination indexes...")
+        for name, table, columns in (
+            ("ix_resumes_user_created", "resumes", "user_id, created_at, id"),
+            ("ix_resumes_user_experience", "resumes", "user_id, experience, id"),
+            ("ix_resumes_user_filename", "resumes", "user_id, filename, id"),
+            ("ix_job_descriptions_user_created", "job_descriptions", "user_id, created_at, id"),
+            ("ix_job_descriptions_user_filename", "job_descriptions", "user_id, filename, id"),
+            ("ix_job_descriptions_user_title", "job_descriptions", "user_id, coalesce(title, ''), id"),
+            ("ix_matches_user_created", "matches", "user_id, created_at, id"),
+            ("ix_matches_user_similarity", "matches", "user_id, similarity_score, id"),
+            ("ix_matches_user_coverage", "matches", "user_id, skill_coverage, id"),
+            ("ix_matches_user_density", "matches", "user_id, skill_density, id"),
+            ("ix_matches_resume_id", "matches", "resume_id"),
+            ("ix_matches_job_description_id", "matches", "job_description_id"),
+        ):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        
+        # Batch job ownership, so one server process does not fail another's jobs
+        print("Adding batch job owner columns...")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'batch_jobs'")
+        if cursor.fetchone():
+            add_column_if_missing(cursor, "batch_jobs", "owner", "VARCHAR")
+            add_column_if_missing(cursor, "batch_jobs", "heartbeat_at", "DATETIME")
+        
+        # Document text moved to a compressed side table
+        print("Moving document text to document_texts...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_texts (
+                id INTEGER PRIMARY KEY,
+                codec VARCHAR NOT NULL,
+                length INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                created_at DATETIME
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_document_texts_id ON document_texts (id)")
+        for table in ("resumes", "job_descriptions"):
+            add_column_if_missing(cursor, table, "text_id", "INTEGER REFERENCES document_texts(id)")
+            rows = cursor.execute(
+                f"SELECT id, raw_text FROM {table} WHERE text_id IS NULL AND duplicate_of_id IS NULL"
+            ).fetchall()
+            for row_id, raw_text in rows:
+                codec, data = compress_text(raw_text or "")
+                cursor.execute(
+                    "INSERT INTO document_texts (codec, length, data, created_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+                    (codec, len(raw_text or ""), data)
+                )
+                cursor.execute(f"UPDATE {table} SET text_id = ?, raw_text = '' WHERE id = ?", (cursor.lastrowid, row_id))
+            # Deduplicated rows share their canonical row's text
+            cursor.execute(f"""
+                UPDATE {table} SET text_id = (SELECT c.text_id FROM {table} c WHERE c.id = {table}.duplicate_of_id),
+                                   raw_text = ''
+                WHERE text_id IS NULL AND duplicate_of_id IS NOT NULL
+            """)
+            print(f"  Compressed {len(rows)} {table} texts")
+        
         # Commit changes
         conn.commit()
+        
+        # Give the space of the moved texts back to the file system
+        cursor.execute("VACUUM")
         print("Database migration completed successfully!")
         
     except Exception as e:
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Re-extract stored skills after the skills ontology changed
+"""
+
+import argparse
+from app.database import SessionLocal, create_tables
+from app.skills import load_ontology
+from app.reextract import reextract_skills, REEXTRACT_CHUNK_SIZE, REEXTRACT_WORKERS
+
+def main(ontology_path: str, chunk_size: int, workers: int):
+    """Re-extract skills of every document processed with another ontology version"""
+    create_tables()
+    ontology = load_ontology(ontology_path)
+    db = SessionLocal()
+    
+    done = {"processed": 0, "failed": 0}
+    def on_progress(processed: int, failed: int):
+        done["processed"] += processed
+        done["failed"] += failed
+        print(f"  {done['processed']} documents re-extracted ({done['failed']} failed)")
+    
+    try:
+        summary = reextract_skills(db, ontology, chunk_size=chunk_size, max_workers=workers, on_progress=on_progress)
+        for table, counts in summary.items():
+            print(f"{table}: {counts['processed']} processed, {counts['changed']} changed, {counts['failed']} failed")
+        print("Skill re-extraction completed successfully! Run it again to retry failed chunks.")
+        
+    except Exception as e:
+        print(f"Re-extraction failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract stored skills for the current ontology")
+    parser.add_argument("--ontology", default="data/skills_ontology.yml", help="Path to the skills ontology")
+    parser.add_argument("--chunk-size", type=int, default=REEXTRACT_CHUNK_SIZE, help="Documents per chunk")
+    parser.add_argument("--workers", type=int, default=REEXTRACT_WORKERS, help="Worker processes (1 runs inline)")
+    args = parser.parse_args()
+    main(args.ontology, args.chunk_size, args.workers)
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.compression import compress_text, decompress_text, ZSTANDARD_AVAILABLE
+from app.database import Base, User, Resume
+
+def test_compression_round_trip():
+    """Test that both codecs restore the exact text"""
+    sample = "Senior Python engineer – 7 years of SQL, Docker and Kubernetes.\n" * 50
+    codecs = ["zlib"] + (["zstd"] if ZSTANDARD_AVAILABLE else [])
+    for codec in codecs:
+        used, data = compress_text(sample, codec)
+        assert used == codec
+        assert len(data) < len(sample.encode("utf-8")) / 4
+        assert decompress_text(used, data) == sample
+
+def test_resume_text_is_stored_compressed_and_shared(tmp_path):
+    """Test that resume text lives in document_texts and duplicates share the canonical copy"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'texts.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    body = "John Doe\nSkills: Python, SQL\n" * 20
+
+    db = session_factory()
+    db.add(User(id=1, email="a@b.com", username="a", hashed_password="x"))
+    canonical = Resume(user_id=1, filename="a.txt", file_path="a.txt", text=body)
+    db.add(canonical)
+    db.flush()
+    db.add(Resume(user_id=1, filename="b.txt", file_path="a.txt", duplicate_of_id=canonical.id,
+                  document_text=canonical.document_text))
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    rows = db.query(Resume).order_by(Resume.id).all()
+    assert [row.text for row in rows] == [body, body]
+    assert rows[0].text_id == rows[1].text_id
+    assert db.execute(text("SELECT raw_text FROM resumes")).scalars().all() == ["", ""]
+    db.close()
@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.embeddings import EmbeddingCache, DiskEmbeddingStore, FCNTL_AVAILABLE
+
+def test_embedding_cache_tiers(tmp_path):
+    """Test LRU eviction and that evicted vectors are served from disk"""
+    cache = EmbeddingCache("test-model", dimension=4, max_items=1, cache_dir=str(tmp_path))
+    
+    key_a = cache.key("python  developer")
+    assert key_a == cache.key("python developer")  # whitespace-insensitive keys
+    assert cache.get(key_a) is None
+    
+    cache.put(key_a, np.array([1, 0, 0, 0]))
+    cache.put(cache.key("java developer"), np.array([0, 1, 0, 0]))  # evicts key_a from memory
+    
+    assert np.array_equal(cache.get(key_a), [1, 0, 0, 0])
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["disk_hits"] == 1
+    assert stats["memory_items"] == 1
+    
+    # A new cache instance reads the persisted vectors
+    reopened = EmbeddingCache("test-model", dimension=4, max_items=1, cache_dir=str(tmp_path))
+    assert np.array_equal(reopened.get(key_a), [1, 0, 0, 0])
+
+def _put_vectors(directory, worker, count):
+    """Store ``count`` vectors whose values identify their writer and key"""
+    store = DiskEmbeddingStore(directory, dimension=8)
+    for i in range(count):
+        store.put(f"k{worker}_{i}", np.full(8, worker * 10000 + i, dtype=np.float32))
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="cross-process locking needs fcntl")
+def test_disk_store_is_shared_safely_between_processes(tmp_path):
+    """Test concurrent appends from several processes, cross-process reads and compaction"""
+    directory = str(tmp_path / "store")
+    reader = DiskEmbeddingStore(directory, dimension=8)
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_put_vectors, args=(directory, worker, 1500)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    # Keys written by other processes are found by an already open store, each with its own vector
+    for store in (reader, DiskEmbeddingStore(directory, dimension=8)):
+        for worker in range(4):
+            for i in range(1500):
+                assert store.get(f"k{worker}_{i}")[0] == worker * 10000 + i
+        assert len(store) == 6000
+
+    bounded = DiskEmbeddingStore(str(tmp_path / "bounded"), dimension=8, max_rows=100)
+    for i in range(250):
+        bounded.put(f"k{i}", np.full(8, i, dtype=np.float32))
+    assert len(bounded) <= 100
+    assert bounded.get("k0") is None
+    assert bounded.get("k249")[0] == 249
+
+def test_embedding_batcher_merges_concurrent_requests():
+    """Test that concurrent small requests share forward passes and get their own rows back"""
+    from concurrent.futures import ThreadPoolExecutor
+    from app.batching import EmbeddingBatcher
+
+    batch_sizes = []
+
+    def encode(texts):
+        batch_sizes.append(len(texts))
+        return np.array([[float(text)] for text in texts])
+
+    batcher = EmbeddingBatcher(encode, max_batch=8, max_wait_ms=50)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: batcher.encode([str(i), str(i + 100)]), range(8)))
+        for i, result in enumerate(results):
+            assert result[:, 0].tolist() == [i, i + 100]
+        assert max(batch_sizes) <= 8
+        assert len(batch_sizes) < 8  # at least some requests were merged
+
+        assert batcher.encode([str(i) for i in range(8)]).shape == (8, 1)  # full batches bypass the queue
+    finally:
+        batcher.close()
+
+def test_chunked_document_pooling():
+    """Test token-bounded windows, the chunk limit, section weights and pooling"""
+    from app.chunking import chunk_document, pool_embeddings
+
+    chunks = chunk_document(" ".join(f"w{i}" for i in range(100)), max_tokens=40, overlap=10, max_chunks=16)
+    assert [len(chunk.split()) for chunk, _ in chunks] == [40, 40, 40]  # the last window ends at the text end
+    assert chunks[1][0].startswith("w30 ")  # consecutive windows overlap
+
+    assert len(chunk_document("word " * 10000, max_tokens=40, overlap=0, max_chunks=5)) == 5
+
+    resume = "Summary\nbackend developer\nSkills:\npython sql\nReferences\navailable on request"
+    weights = [weight for _, weight in chunk_document(resume, max_tokens=40, by_section=True)]
+    assert weights[1] > weights[0] > weights[2]  # skills > summary > references
+
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0]])
+    assert np.allclose(pool_embeddings(vectors, mode="mean"), [2 ** -0.5, 2 ** -0.5])
+    assert np.allclose(pool_embeddings(vectors, mode="max"), [2 ** -0.5, 2 ** -0.5])
+    assert pool_embeddings(vectors, weights=[3.0, 1.0], mode="section")[0] > 0.9
+
+def test_quantized_vector_index_reranks_exactly():
+    """Test that int8 storage is 4x smaller and re-ranking restores the float32 ranking"""
+    from app.vector_index import VectorIndex
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(2000, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = list(range(100, 2100))
+
+    reference = VectorIndex(ids, vectors, precision="float32")
+    quantized = VectorIndex(ids, vectors, precision="int8")
+    assert quantized.vectors.nbytes * 3.5 < reference.vectors.nbytes
+
+    def full_vectors(wanted):
+        return vectors[np.asarray(wanted) - 100]
+
+    for query in vectors[:20]:
+        expected = reference.search(query, 10)
+        found = quantized.search(query, 10, full_vectors=full_vectors)
+        assert [i for i, _ in found] == [i for i, _ in expected]
+        assert np.allclose([score for _, score in found], [score for _, score in expected], atol=1e-5)
@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import socket
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database import Base, User, BatchJob, BatchJobItem
+from app.jobs import JobManager
+
+def _wait_for(session_factory, job_id, timeout=10.0):
+    """Poll a job until it leaves the active states"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        db = session_factory()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).one()
+            if job.status not in ("pending", "running"):
+                return job.status, job.processed_items, job.failed_items
+        finally:
+            db.close()
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+def test_job_manager_progress_and_failures(tmp_path):
+    """Test that item outcomes and counters are persisted and runner errors fail the job"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    db.add(User(id=1, email="a@b.com", username="a", hashed_password="x"))
+    db.commit()
+
+    def runner(ctx, request):
+        ctx.add_total(len(request["items"]))
+        for item in request["items"]:
+            if item < 0:
+                ctx.failed(str(item), "number", "negative")
+            else:
+                ctx.succeeded(str(item), "number", result={"square": item * item})
+            ctx.checkpoint()
+        if request.get("explode"):
+            raise RuntimeError("boom")
+
+    manager = JobManager(max_workers=1, session_factory=session_factory)
+    manager.register("squares", runner)
+    try:
+        job = manager.submit(db, 1, "squares", {"items": [1, -2, 3]})
+        assert _wait_for(session_factory, job.id) == ("completed", 3, 1)
+        items = db.query(BatchJobItem).filter(BatchJobItem.job_id == job.id).order_by(BatchJobItem.id).all()
+        assert [item.status for item in items] == ["succeeded", "failed", "succeeded"]
+
+        failing = manager.submit(db, 1, "squares", {"items": [1], "explode": True})
+        assert _wait_for(session_factory, failing.id)[0] == "failed"
+    finally:
+        manager.shutdown()
+        db.close()
+
+def test_recover_only_fails_jobs_of_gone_owners(tmp_path):
+    """Test that recovery leaves jobs of live sibling processes running"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    host = socket.gethostname()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    now = datetime.utcnow()
+    owners = {
+        "sibling": (f"{host}:{os.getppid()}:abcd1234", now),  # live process, fresh heartbeat
+        "exited": (f"{host}:{exited.pid}:abcd1234", now),  # process gone
+        "stale": ("elsewhere:1:abcd1234", now - timedelta(seconds=120)),  # no heartbeat for too long
+        "legacy": (None, None),  # created before jobs had owners
+    }
+    db = session_factory()
+    db.add(User(id=1, email="a@b.com", username="a", hashed_password="x"))
+    for job_id, (owner, heartbeat_at) in owners.items():
+        db.add(BatchJob(id=job_id, user_id=1, kind="squares", status="running", owner=owner, heartbeat_at=heartbeat_at))
+    db.commit()
+
+    manager = JobManager(max_workers=1, session_factory=session_factory, stale_after=60)
+    try:
+        assert manager.recover() == 3
+        statuses = {job.id: job.status for job in db.query(BatchJob).all()}
+        assert statuses == {"sibling": "running", "exited": "failed", "stale": "failed", "legacy": "failed"}
+    finally:
+        db.close()
@@ -23,6 +23,23 @@ def test_skill_extraction():
     assert "pandas" in skills
     assert "numpy" in skills
 
+def test_compiled_skill_matcher_word_boundaries():
+    """Test that the compiled matcher keeps regex word-boundary semantics"""
+    from app.skills import SkillMatcher, extract_skills
+    
+    ontology = {"Languages": ["java", "c++", "go"], "ML": ["scikit-learn", "machine learning"]}
+    matcher = SkillMatcher(ontology)
+    
+    text = "Used JavaScript, Go and scikit learn for ML pipelines. Also c++."
+    skills = extract_skills(text, matcher)
+    
+    assert skills == extract_skills(text, ontology)
+    assert "java" not in skills  # only part of "javascript"
+    assert "go" in skills
+    assert "scikit-learn" in skills  # hyphen variant
+    assert "machine learning" in skills  # expanded abbreviation
+    assert "c++" not in skills  # no word boundary after "++" followed by a space
+
 def test_resume_processing():
     """Test resume processing functionality"""
     pipeline = ProcessingPipeline()
@@ -50,6 +67,42 @@ def test_resume_processing():
     finally:
         os.remove(test_resume_path)
 
+def test_incremental_skill_reextraction():
+    """Test that diff-based re-extraction matches a full rescan with the new ontology"""
+    import json
+    from app.skills import SkillMatcher, NormalizedDocument, diff_ontologies
+    from app.reextract import SkillReextractor
+    
+    old = {"Languages": ["python", "java", "cobol"], "Data": ["sql", "pandas"]}
+    new = {"Languages": ["python", "java", "go"], "Data": ["pandas"], "Databases": ["sql", "postgresql"]}
+    text = "Python and Java developer using SQL, PostgreSQL, pandas, Go and COBOL"
+    
+    stored = SkillMatcher(old).scan(NormalizedDocument(text)).skills_by_category()
+    reextractor = SkillReextractor(new, {"v1": diff_ontologies(old, new)})
+    
+    expected = SkillMatcher(new).scan(NormalizedDocument(text)).skills_by_category()
+    assert reextractor.reextract(text, json.dumps(stored), "v1") == expected
+    assert reextractor.reextract(text, None, "unknown") == expected  # full rescan
+
+def test_parallel_resume_processing(tmp_path):
+    """Test that parallel ingestion keeps input order and reports failures per file"""
+    pipeline = ProcessingPipeline()
+    
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"resume_{i}.txt"
+        path.write_text(f"Candidate {i}\nEmail: candidate{i}@email.com\nSkills: Python, SQL")
+        paths.append(str(path))
+    paths.insert(1, str(tmp_path / "missing.txt"))
+    
+    results = pipeline.process_resumes_parallel(paths, max_workers=2)
+    
+    assert [result.file_path for result in results] == paths
+    assert results[1].resume is None and "not found" in results[1].error
+    assert [result.resume.email for result in results if result.resume] == [
+        "candidate0@email.com", "candidate1@email.com", "candidate2@email.com"
+    ]
+
 def test_matching_algorithm():
     """Test the matching algorithm"""
     matcher = ResumeMatcher()
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.skill_index import SkillIndex, SkillIndexRegistry
+
+def _brute_force(documents, wanted, min_coverage):
+    """Resume ID to coverage computed directly from the skill sets"""
+    coverage = {resume_id: len(skills & wanted) / len(wanted) for resume_id, skills in documents.items()}
+    return {resume_id: value for resume_id, value in coverage.items() if value >= min_coverage and value > 0}
+
+def test_shortlist_matches_brute_force_coverage():
+    """Test shortlists over array and bitmap postings, including an incrementally added batch"""
+    rng = np.random.default_rng(0)
+    documents = {
+        resume_id: set(rng.choice(40, size=rng.integers(1, 8), replace=False, p=np.arange(40, 0, -1) / 820).tolist())
+        for resume_id in range(1, 2001)
+    }
+    pairs = [(resume_id, skill) for resume_id, skills in documents.items() for skill in sorted(skills)]
+    old = [pair for pair in pairs if pair[0] <= 1500]
+    new = [pair for pair in pairs if pair[0] > 1500]
+
+    index = SkillIndex.from_pairs(old).extend(new)
+    kinds = {kind for kind, _, _ in index.postings.values()}
+    assert kinds == {"array", "bitmap"}
+    assert len(index) == 2000
+
+    wanted = {0, 1, 5, 17, 39}
+    for min_coverage in (0.2, 0.4, 0.6, 1.0):
+        shortlist = index.shortlist(wanted | {1000}, len(wanted) + 1, min_coverage)
+        expected = _brute_force(documents, wanted | {1000}, min_coverage)
+        assert shortlist.keys() == expected.keys()
+        assert all(shortlist[key] == pytest.approx(value) for key, value in expected.items())
+
+    candidates = [1, 2, 3, 1999, 5000]
+    assert set(index.shortlist(wanted, len(wanted), 0.2, candidates)) == \
+        {key for key in _brute_force(documents, wanted, 0.2) if key in candidates}
+
+    with pytest.raises(ValueError):
+        index.extend([(1000, 3)])
+
+def test_registry_extends_and_evicts_least_recently_used():
+    """Test that the registry hands the stale index to the builder and keeps at most max_items"""
+    registry = SkillIndexRegistry(max_items=2)
+    builds = []
+
+    def build(previous, previous_signature):
+        builds.append(previous_signature)
+        return (previous or SkillIndex.from_pairs([])).extend([(len(builds), 7)])
+
+    registry.get("a", 1, build)
+    registry.get("b", 1, build)
+    assert len(registry.get("a", 2, build)) == 2  # extended, and now most recently used
+    assert builds == [None, None, 1]
+    registry.get("c", 1, build)  # evicts "b"
+    registry.get("b", 1, build)
+    assert builds[-1] is None
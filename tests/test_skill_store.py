@@ -0,0 +1,97 @@
+import sys
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database import Base, User, Resume, ResumeSkill, JobDescription
+from app.skill_store import (
+    SkillQueryError, parse_skill_query, query_skills, skill_ids, posting_sizes,
+    set_document_skills, replace_document_skills, skill_query_condition
+)
+
+def test_parse_skill_query():
+    """Test operator precedence, multi-word skills, quoting and errors"""
+    assert parse_skill_query('Kubernetes AND (go OR rust) and not "c++"') == (
+        "and", [("skill", "kubernetes"), ("or", [("skill", "go"), ("skill", "rust")]), ("not", ("skill", "c++"))]
+    )
+    assert parse_skill_query("machine learning OR sql AND docker") == (
+        "or", [("skill", "machine learning"), ("and", [("skill", "sql"), ("skill", "docker")])]
+    )
+    assert query_skills(parse_skill_query('"and" OR python')) == ["and", "python"]
+    for query in ["", "python AND", "(python", "python)", "AND go", '"python" "go"']:
+        with pytest.raises(SkillQueryError):
+            parse_skill_query(query)
+
+def test_skill_queries_run_on_the_link_tables(tmp_path):
+    """Test that boolean queries select the right documents in both compilation modes"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'skills.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    db.add(User(id=1, email="a@b.com", username="a", hashed_password="x"))
+
+    documents = {
+        "a": ["python", "kubernetes", "go"],
+        "b": ["java", "kubernetes"],
+        "c": ["python", "sql"],
+    }
+    for name, skills in documents.items():
+        record = Resume(user_id=1, filename=name, file_path=name, text="",
+                        skills=json.dumps(skills), skills_by_category=json.dumps({"Languages": skills}))
+        set_document_skills(db, record)
+        db.add(record)
+    db.commit()
+
+    def run(query, probe=False):
+        tree = parse_skill_query(query)
+        ids = skill_ids(db, query_skills(tree))
+        sizes = posting_sizes(db, Resume, ids.values())
+        condition = skill_query_condition(Resume, tree, ids, sizes, probe=probe)
+        return sorted(row.filename for row in db.query(Resume.filename).filter(condition))
+
+    for probe in (False, True):
+        assert run("kubernetes AND go", probe) == ["a"]
+        assert run("kubernetes AND NOT go", probe) == ["b"]
+        assert run("(python AND sql) OR java", probe) == ["b", "c"]
+        assert run("NOT python", probe) == ["b"]
+        assert run("cobol OR go", probe) == ["a"]
+
+    # Re-extracted skills replace the stored links
+    resume_c = db.query(Resume).filter(Resume.filename == "c").one()
+    replace_document_skills(db, Resume, {resume_c.id: (["go"], [], {"Languages": ["go"]})})
+    db.commit()
+    assert run("go") == ["a", "c"]
+    assert run("sql") == []
+    assert db.query(ResumeSkill).filter(ResumeSkill.resume_id == resume_c.id).count() == 1
+    db.close()
+
+def test_required_only_ignores_preferred_jd_skills(tmp_path):
+    """Test that required_only matches job descriptions on their required skills alone"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'skills.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    db.add(User(id=1, email="a@b.com", username="a", hashed_password="x"))
+    record = JobDescription(user_id=1, filename="jd", file_path="jd", text="",
+                            required_skills=json.dumps(["python"]), preferred_skills=json.dumps(["docker"]),
+                            skills_by_category=json.dumps({"Languages": ["python"], "DevOps": ["docker"]}))
+    set_document_skills(db, record)
+    db.add(record)
+    db.commit()
+
+    def run(query, required_only, probe=False):
+        tree = parse_skill_query(query)
+        ids = skill_ids(db, query_skills(tree))
+        condition = skill_query_condition(JobDescription, tree, ids, probe=probe, required_only=required_only)
+        return db.query(JobDescription).filter(condition).count()
+
+    for probe in (False, True):
+        assert run("docker", required_only=False, probe=probe) == 1
+        assert run("docker", required_only=True, probe=probe) == 0
+        assert run("python AND NOT docker", required_only=True, probe=probe) == 1
+    db.close()
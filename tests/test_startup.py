@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Importing the API must stay well inside the 20 s health check window of our orchestrator
+IMPORT_TIME_BUDGET = 5.0
+
+def test_api_import_is_fast_and_defers_the_model(tmp_path):
+    """Test that importing the API neither imports torch nor loads the model"""
+    script = (
+        "import sys, time, json\n"
+        "started = time.perf_counter()\n"
+        "import app.api\n"
+        "print(json.dumps({\n"
+        "    'seconds': time.perf_counter() - started,\n"
+        "    'torch': 'torch' in sys.modules,\n"
+        "    'sentence_transformers': 'sentence_transformers' in sys.modules,\n"
+        "    'model_loaded': app.api.matcher.is_loaded,\n"
+        "}))\n"
+    )
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}", UPLOAD_DIR=str(tmp_path / "uploads"))
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=project_root, env=env,
+        capture_output=True, text=True, check=True, timeout=60
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert not result["torch"]
+    assert not result["sentence_transformers"]
+    assert not result["model_loaded"]
+    assert result["seconds"] < IMPORT_TIME_BUDGET
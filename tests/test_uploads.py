@@ -0,0 +1,26 @@
+import io
+import sys
+import hashlib
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.uploads import save_upload, UploadTooLarge
+
+def test_save_upload_streams_and_hashes(tmp_path):
+    """Test chunked upload storage, hashing and the size limit"""
+    content = b"resume " * 1000
+    stored = save_upload(io.BytesIO(content), "cv.pdf", upload_dir=str(tmp_path), chunk_size=64)
+    
+    assert stored.path.endswith(".pdf")
+    assert Path(stored.path).read_bytes() == content
+    assert stored.size == len(content)
+    assert stored.content_hash == hashlib.sha256(content).hexdigest()
+    
+    with pytest.raises(UploadTooLarge):
+        save_upload(io.BytesIO(content), "big.pdf", upload_dir=str(tmp_path), max_bytes=100, chunk_size=64)
+    assert len(list(tmp_path.iterdir())) == 1  # the partial file was removed
@@ -11,6 +11,8 @@ import time
 
 # API configuration
 API_BASE_URL = "http://localhost:8000"
+LIST_PAGE_SIZE = 100  # Items per API page
+LIST_MAX_ITEMS = 500  # Newest items kept in the session per list
 
 # Page configuration
 st.set_page_config(
@@ -70,26 +72,31 @@ def init_session_state():
     if "stats" not in st.session_state:
         st.session_state.stats = None
 
+def fetch_list(path: str, headers: dict, max_items: int = LIST_MAX_ITEMS) -> List[dict]:
+    """Fetch the newest items of a list endpoint, following its page cursors up to max_items"""
+    items = []
+    params = {"limit": min(LIST_PAGE_SIZE, max_items)}
+    while len(items) < max_items:
+        resp = requests.get(f"{API_BASE_URL}{path}", headers=headers, params=params)
+        resp.raise_for_status()
+        items.extend(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    return items[:max_items]
+
 def load_user_data():
-    """Load user's resumes, job descriptions, and matches"""
+    """Load user's resumes, job descriptions, and matches (newest first, capped at LIST_MAX_ITEMS each)"""
     if "token" in st.session_state:
         try:
             headers = {"Authorization": f"Bearer {st.session_state.token}"}
             
-            # Load resumes
-            resp = requests.get(f"{API_BASE_URL}/resumes/", headers=headers)
-            if resp.status_code == 200:
-                st.session_state.resumes = resp.json()
-            
-            # Load job descriptions
-            resp = requests.get(f"{API_BASE_URL}/jds/", headers=headers)
-            if resp.status_code == 200:
-                st.session_state.jds = resp.json()
+            st.session_state.resumes = fetch_list("/resumes/", headers)
+            st.session_state.jds = fetch_list("/jds/", headers)
             
-            # Load matches
-            resp = requests.get(f"{API_BASE_URL}/matches/", headers=headers)
-            if resp.status_code == 200:
-                st.session_state.matches = resp.json()
+            # Oldest first for the match history chart
+            st.session_state.matches = list(reversed(fetch_list("/matches/", headers)))
                 
         except Exception as e:
             st.error(f"Failed to load user data: {str(e)}")